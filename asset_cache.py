@@ -0,0 +1,96 @@
+import pygame
+
+# プロセス全体で共有する画像・フォントのキャッシュ
+# スプライトは生成のたびにファイルを読み込まず、ここから共有Surfaceを受け取る
+_surfaces = {}  # キー -> 変換・拡大縮小済みのSurface
+_failed = {}    # 読み込みに失敗したパス -> エラーメッセージ（存在しないファイルを何度も探さない）
+_fonts = {}     # (name, size, bold, sysfont) -> Font
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _convert(surface, alpha):
+    """ディスプレイが初期化済みなら描画用のピクセル形式に変換する"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def load_image(path, size=None, alpha=True):
+    """画像を一度だけ読み込み、変換・拡大縮小済みの共有Surfaceを返す
+
+    返したSurfaceは全スプライトで共有されるため、呼び出し側で直接書き換えないこと。
+    読み込めない場合は pygame.error を送出する（失敗も記録し、再読み込みはしない）。
+    """
+    size = (int(size[0]), int(size[1])) if size is not None else None
+    key = ('image', path, size, alpha)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _stats['hits'] += 1
+        return surface
+
+    if path in _failed:
+        _stats['hits'] += 1
+        raise pygame.error(_failed[path])
+
+    _stats['misses'] += 1
+    if size is None:
+        try:
+            surface = _convert(pygame.image.load(path), alpha)
+        except (pygame.error, FileNotFoundError) as e:
+            _failed[path] = str(e)
+            raise pygame.error(str(e))
+    else:
+        # 元画像もキャッシュしておき、サイズ違いの要求ではデコードを省く
+        surface = pygame.transform.scale(load_image(path, None, alpha), size)
+    _surfaces[key] = surface
+    return surface
+
+
+def get_surface(key, builder):
+    """builder() で生成したSurfaceを key ごとに一度だけ作って共有する（代替画像などに使う）"""
+    key = ('built',) + tuple(key)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        _stats['hits'] += 1
+        return surface
+    _stats['misses'] += 1
+    surface = builder()
+    _surfaces[key] = surface
+    return surface
+
+
+def get_font(size, name=None, bold=False, sysfont=False):
+    """フォントを一度だけ生成して共有する"""
+    key = (name, size, bold, sysfont)
+    font = _fonts.get(key)
+    if font is None:
+        if sysfont:
+            font = pygame.font.SysFont(name, size, bold=bold)
+        else:
+            font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+def surface_bytes(surface):
+    """Surfaceが占有するピクセルデータのバイト数"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def cache_stats():
+    """ヒット数・ミス数・保持しているSurfaceの数と合計バイト数を返す"""
+    return {
+        'hits': _stats['hits'],
+        'misses': _stats['misses'],
+        'entries': len(_surfaces),
+        'bytes': sum(surface_bytes(s) for s in _surfaces.values()),
+    }
+
+
+def clear_cache():
+    """キャッシュをすべて破棄する（ディスプレイを作り直した場合など）"""
+    _surfaces.clear()
+    _failed.clear()
+    _fonts.clear()
+    _stats['hits'] = 0
+    _stats['misses'] = 0
@@ -0,0 +1,234 @@
+"""ボスの攻撃パターンとステージのウェーブごとのフレーム時間ベンチマーク
+
+    python benchmark.py --out results.json
+    python benchmark.py --baseline results.json --threshold 0.15
+    python benchmark.py --only laser --frames 1200
+    python benchmark.py --state enrage.state --only state
+    python benchmark.py --rewind --only grand_boss
+
+各シナリオ（弾幕パターン単体、GrandBossEnemy の発狂モード、ホーミング弾が多数飛ぶ場面、StageManager の各ウェーブ、
+--state で渡したスナップショット（headless.py --save-state で保存）から再開する状態）を
+固定シード・固定フレーム数で実行し、update と draw の p50/p95/p99/最大時間（ミリ秒）と
+敵弾の最大数を記録する。--rewind を付けると巻き戻し用の記録（rewind.RewindBuffer）を有効にした状態で計測する。
+基準となる結果を渡すと比較し、遅くなったシナリオがあれば終了コード 1 を返す。
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+
+import headless
+import pygame
+from setting import *
+from input_source import ScriptedInput
+from enemy import Enemy
+from boss import BossEnemy
+from bullet import HomingBullet
+from boss_subclasses import GrandBossEnemy
+from bullet_pattern import load_patterns
+from stage_timeline import load_stages
+from rewind import RewindBuffer
+
+def percentile(values, p):
+    """ソート済みのリストの p パーセンタイル（最近傍法）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+def summarize(samples):
+    """計測値（秒）のリストをミリ秒の統計値にまとめる"""
+    values = sorted(s * 1000 for s in samples)
+    return {
+        'p50': round(percentile(values, 50), 4),
+        'p95': round(percentile(values, 95), 4),
+        'p99': round(percentile(values, 99), 4),
+        'max': round(values[-1], 4) if values else 0.0,
+        'mean': round(sum(values) / len(values), 4) if values else 0.0,
+    }
+
+def new_game(seed):
+    """その場で撃ち続ける自機だけがいるゲームを作る"""
+    from game import Game
+    game = Game(input_source=ScriptedInput([(0, ['z'])]), seed=seed)
+    game.stage_manager.spawn_active = False
+    return game
+
+def spawn_boss(game, boss_class):
+    """ボスを画面上部に直接生成する"""
+    player = game.player
+    return boss_class(game.enemy_group, GAME_AREA_WIDTH // 2, 150, player.bullet_group, game.player_group, game.enemy_bullets, game.item_group)
+
+def pattern_scenario(name):
+    """弾幕パターンを1つだけ繰り返し実行するシナリオ"""
+    def setup(game):
+        boss = spawn_boss(game, BossEnemy)
+        # 撃破や発狂モードへの移行が起きないようにする
+        boss.health = boss.max_health = 10 ** 9
+        boss.pattern = name
+
+        def keep_pattern():
+            # パターンが切り替わったら（タイマーは0に戻っている）同じパターンを最初からやり直す
+            if boss.pattern != name:
+                boss.pattern = name
+        return keep_pattern
+    return setup
+
+def grand_boss_enrage(game):
+    """GrandBossEnemy の発狂モード（パターンは本来の選択ロジックに任せる）"""
+    boss = spawn_boss(game, GrandBossEnemy)
+    boss.max_health = 10 ** 9
+    boss.health = boss.max_health // 2 - 1
+    return None
+
+def homing_swarm(game):
+    """ホーミング弾が HOMING_BATCH_MIN 発以上飛び続ける場面（HomingSteering の配列処理を計測する）"""
+    player = game.player
+    for i in range(8):
+        # 動かず倒れない的を並べる
+        enemy = Enemy(game.enemy_group, 100 + i * 85, 120, player.bullet_group, game.player_group, game.enemy_bullets, game.item_group)
+        enemy.health = 10 ** 9
+        enemy.speed = 0
+
+    def fire():
+        # 自機の弾とは別に、毎フレーム画面の下端からホーミング弾を撃ち足す
+        frame = game.game_clock.frame
+        for i in range(4):
+            x = (frame * 97 + i * 211) % GAME_AREA_WIDTH
+            HomingBullet.spawn(player.bullet_group, x, screen_height - 20, game.enemy_group)
+    return fire
+
+def wave_scenario(stage, wave_index):
+    """StageManager の指定ウェーブから進行させるシナリオ"""
+    def setup(game):
+        game.stage_manager.seek(stage, wave_index)
+        return None
+    return setup
+
+def state_scenario(path):
+    """スナップショットの状態から再開するシナリオ（重い場面を直接計測する）"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    def setup(game):
+        game.restore(data)
+        return None
+    return setup
+
+def scenarios(states=()):
+    """全シナリオの (名前, setup関数) のリスト"""
+    result = [(f'state:{path}', state_scenario(path)) for path in states]
+    for name, pattern in load_patterns().patterns.items():
+        if pattern.volleys or pattern.script:
+            result.append((f'pattern:{name}', pattern_scenario(name)))
+    result.append(('grand_boss:enrage', grand_boss_enrage))
+    result.append(('homing:swarm', homing_swarm))
+    for stage, timeline in sorted(load_stages().items()):
+        for wave in timeline:
+            result.append((f'wave:{stage}-{wave.index}:{wave.type}', wave_scenario(stage, wave.index)))
+    return result
+
+def run_scenario(setup, frames, warmup, seed, rewind=False):
+    """1つのシナリオを実行して計測結果を返す"""
+    game = new_game(seed)
+    clock = pygame.time.Clock()
+    hook = setup(game)
+    if rewind:
+        game.rewind = RewindBuffer()
+    update_times = []
+    draw_times = []
+    peak_bullets = 0
+    for frame in range(warmup + frames):
+        # 自機が倒れると弾幕が変わるので、体力を保つ
+        game.player.health = max(game.player.health, 3)
+        start = time.perf_counter()
+        game.update()
+        middle = time.perf_counter()
+        game.draw(clock)
+        end = time.perf_counter()
+        pygame.event.pump()
+        if hook:
+            hook()
+        if frame >= warmup:
+            update_times.append(middle - start)
+            draw_times.append(end - middle)
+            peak_bullets = max(peak_bullets, len(game.enemy_bullets))
+    frame_times = [u + d for u, d in zip(update_times, draw_times)]
+    return {
+        'update_ms': summarize(update_times),
+        'draw_ms': summarize(draw_times),
+        'frame_ms': summarize(frame_times),
+        'peak_bullets': peak_bullets,
+    }
+
+def compare(results, baseline, threshold, metric='p95', floor_ms=0.1):
+    """基準と比べて metric が threshold 以上悪化したシナリオを返す"""
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        for key in ('update_ms', 'draw_ms', 'frame_ms'):
+            old = base[key][metric]
+            new = result[key][metric]
+            # ごく短い時間の揺らぎは無視する
+            if new > old * (1 + threshold) and new - old > floor_ms:
+                regressions.append({'scenario': name, 'metric': f'{key}.{metric}', 'baseline': old, 'current': new,
+                                    'change': round(new / old - 1, 3) if old > 0 else None})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Frame-time benchmark over boss patterns and stage waves.')
+    parser.add_argument('--frames', type=int, default=600, help='measured frames per scenario')
+    parser.add_argument('--warmup', type=int, default=30, help='unmeasured frames before measuring')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--only', help='run only scenarios whose name contains this text')
+    parser.add_argument('--state', action='append', default=[], help='also run from this saved game state (repeatable)')
+    parser.add_argument('--rewind', action='store_true', help='record every frame for rewinding while measuring')
+    parser.add_argument('--out', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previous results JSON')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown ratio before flagging (default 0.15)')
+    args = parser.parse_args(argv)
+
+    headless.setup_display()
+    results = {
+        'meta': {
+            'seed': args.seed,
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'bullet_engine': BULLET_ENGINE,
+            'rewind': args.rewind,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        },
+        'scenarios': {},
+    }
+    for name, setup in scenarios(args.state):
+        if args.only and args.only not in name:
+            continue
+        result = run_scenario(setup, args.frames, args.warmup, args.seed, args.rewind)
+        results['scenarios'][name] = result
+        print(f"{name:40s} update p95 {result['update_ms']['p95']:7.3f}ms  draw p95 {result['draw_ms']['p95']:7.3f}ms  "
+              f"max {result['frame_ms']['max']:7.3f}ms  bullets {result['peak_bullets']}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['scenario']} {r['metric']}: {r['baseline']}ms -> {r['current']}ms")
+        if regressions:
+            status = 1
+        else:
+            print('no regressions')
+    pygame.quit()
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
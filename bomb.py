@@ -1,5 +1,6 @@
 import pygame
 from setting import *
+import asset_cache
 
 class MasterSpark(pygame.sprite.Sprite):
     """プレイヤーのボム（マスタースパーク）を表現するクラス"""
@@ -18,17 +19,15 @@ class MasterSpark(pygame.sprite.Sprite):
 
         # レーザーの画像読み込み
         try:
-            self.laser_image_base = pygame.image.load('assets/img/bomb/master_spark.png').convert_alpha()
+            self.laser_image_base = asset_cache.load_image('assets/img/bomb/master_spark.png')
         except pygame.error:
             self.laser_image_base = None # 画像がない場合はNone
 
-        # レーザー全体の描画領域と当たり判定用のRect
+        # レーザー全体の描画領域
         # 幅は画像の最大幅に合わせる
-        self.image = pygame.Surface((412, screen_height), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(midbottom=self.player.rect.midtop)
-
-        # 当たり判定用のマスク
-        self.mask = pygame.mask.from_surface(self.image)
+        self.rect = pygame.Rect(0, 0, BOMB_BEAM_WIDTH, screen_height)
+        self.rect.midbottom = self.player.rect.midtop
+        self.image = self.beam_frame(0)
 
     def update(self):
         self.timer -= 1
@@ -39,22 +38,37 @@ class MasterSpark(pygame.sprite.Sprite):
         # プレイヤーに追従
         self.rect.midbottom = self.player.rect.midtop
 
-        # レーザーの描画
-        self.draw_laser()
+        # レーザーの描画（幅の段階ごとに作り置きした画像を選ぶだけ）
+        self.image = self.beam_frame(self.width_step())
 
-        # 敵との当たり判定
-        self.check_collision()
+    def width_step(self):
+        """レーザーの幅の段階（0〜BOMB_BEAM_STEPS）をタイマーから求める（発射時と収束時に変化させる）"""
+        if self.timer > self.duration - BOMB_BEAM_STEPS: # 開始時
+            return self.duration - self.timer
+        elif self.timer < BOMB_BEAM_STEPS: # 終了時
+            return self.timer
+        return BOMB_BEAM_STEPS
+
+    def beam_width(self):
+        """現在のレーザーの幅（当たり判定に使う）"""
+        current_width_ratio = self.width_step() / BOMB_BEAM_STEPS
+        if self.laser_image_base:
+            return int(self.laser_image_base.get_width() * current_width_ratio)
+        return self.rect.width * current_width_ratio
 
-    def draw_laser(self):
-        # 描画前にクリア
-        self.image.fill((0, 0, 0, 0))
+    def beam_rect(self):
+        """当たり判定用の帯（レーザーの幅を持つ縦長の矩形）"""
+        width = self.beam_width()
+        return pygame.Rect(self.rect.centerx - width / 2, self.rect.top, width, self.rect.height)
 
-        # レーザーの幅をタイマーに応じて変化させる（発射時と収束時）
-        current_width_ratio = 1.0
-        if self.timer > self.duration - 20: # 開始時
-            current_width_ratio = (self.duration - self.timer) / 20.0
-        elif self.timer < 20: # 終了時
-            current_width_ratio = self.timer / 20.0
+    def beam_frame(self, step):
+        """幅の段階ごとのレーザー画像（ボム画像ごとに一度だけ生成して共有する）"""
+        return asset_cache.get_surface(('master_spark', self.laser_image_base, step), lambda: self.draw_laser(step))
+
+    def draw_laser(self, step):
+        """指定した幅の段階のレーザー画像を生成する"""
+        image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        current_width_ratio = step / BOMB_BEAM_STEPS
 
         # 画像がある場合
         if self.laser_image_base:
@@ -65,23 +79,13 @@ class MasterSpark(pygame.sprite.Sprite):
                 scaled_laser = pygame.transform.scale(self.laser_image_base, (new_width, self.rect.height))
                 # 中央に配置
                 x_pos = (self.rect.width - new_width) // 2
-                self.image.blit(scaled_laser, (x_pos, 0))
+                image.blit(scaled_laser, (x_pos, 0))
         # 画像がない場合（フォールバック）
         else:
             outer_width = self.rect.width * current_width_ratio
             inner_width = outer_width * 0.5
             # 外側のレーザー
-            pygame.draw.rect(self.image, BOMB_LASER_OUTER_COLOR, (self.rect.width/2 - outer_width/2, 0, outer_width, self.rect.height))
+            pygame.draw.rect(image, BOMB_LASER_OUTER_COLOR, (self.rect.width/2 - outer_width/2, 0, outer_width, self.rect.height))
             # 内側のレーザー
-            pygame.draw.rect(self.image, BOMB_LASER_INNER_COLOR, (self.rect.width/2 - inner_width/2, 0, inner_width, self.rect.height))
-
-        # 毎フレームマスクを更新
-        self.mask = pygame.mask.from_surface(self.image)
-
-    def check_collision(self):
-        # レーザーと衝突した敵に継続的にダメージを与える
-        for enemy in self.enemy_group:
-            # マスクを使ったピクセルパーフェクトな衝突判定
-            if pygame.sprite.collide_mask(self, enemy) and hasattr(enemy, 'take_damage'):
-                # 敵のtake_damageメソッドを呼び出してダメージを与える
-                enemy.take_damage(self.damage)
\ No newline at end of file
+            pygame.draw.rect(image, BOMB_LASER_INNER_COLOR, (self.rect.width/2 - inner_width/2, 0, inner_width, self.rect.height))
+        return image
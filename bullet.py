@@ -1,19 +1,21 @@
 import pygame
 from setting import *
+import asset_cache
+from rotation_atlas import atlas
+from pool import PooledSprite
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, groups, x, y):
-        super().__init__(groups)
+class Bullet(PooledSprite):
+    __slots__ = ('index', 'pre_image', 'image', 'rect', 'pos', 'radius', 'speed')
+    image_list = None # 全ての弾で共有するアニメーション画像
 
-        #画像
-        self.image_list = []
-        for i in range(2):
-            image = pygame.image.load(f'assets/img/bullet/{i}.png').convert_alpha()
-            self.image_list.append(image)
+    def reset(self, x, y):
+        #画像（拡大縮小済みの共有画像をキャッシュから受け取る）
+        if Bullet.image_list is None:
+            Bullet.image_list = [asset_cache.load_image(f'assets/img/bullet/{i}.png', (24, 48)) for i in range(2)]
 
         self.index = 0
         self.pre_image = self.image_list[self.index]
-        self.image = pygame.transform.scale(self.pre_image,(24, 48))
+        self.image = self.pre_image
         self.rect = self.image.get_rect(midbottom = (x, y))
 
         # スレッドでの当たり判定で必要になる属性を追加
@@ -35,7 +37,7 @@ class Bullet(pygame.sprite.Sprite):
             self.index = 0
 
         self.pre_image = self.image_list[int(self.index)] # アニメーションの元画像
-        self.image = pygame.transform.scale(self.pre_image,(24, 48))
+        self.image = self.pre_image
 
     def move(self):
         self.rect.y -= self.speed
@@ -47,8 +49,10 @@ class Bullet(pygame.sprite.Sprite):
 
 class HomingBullet(Bullet):
     """敵を追尾する弾"""
-    def __init__(self, groups, x, y, enemy_group):
-        super().__init__(groups, x, y)
+    __slots__ = ('enemy_group', 'target', 'turn_speed', 'direction', 'has_initial_target', 'image_source', 'image_direction', 'rotated_image', 'steered')
+
+    def reset(self, x, y, enemy_group):
+        super().reset(x, y)
         self.enemy_group = enemy_group
         self.target = None
         self.speed = 6  # ホーミング弾の速度
@@ -60,21 +64,24 @@ class HomingBullet(Bullet):
         # 最初にターゲットを見つけたら、以降は再探索しない
         self.has_initial_target = False
 
+        # 現在の画像の元になったアニメーション画像と方向（どちらも変化がなければ回転画像を引き直さない）
+        self.image_source = None
+        self.image_direction = None
+        self.rotated_image = self.image
+
+        # HomingSteering がこのフレームの索敵と方向転換をまとめて済ませたかどうか
+        self.steered = False
+
     def find_target(self):
         # ターゲットがいない、またはターゲットが倒された場合、新しいターゲットを探す
         if not self.target or not self.target.alive:
-            min_dist = float('inf')
-            closest_enemy = None
-            for enemy in self.enemy_group:
-                dist = self.pos.distance_to(enemy.rect.center)
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_enemy = enemy
-            self.target = closest_enemy
+            # 空間ハッシュで最も近い敵を探す
+            self.target = self.enemy_group.nearest(self.pos)
             if self.target:
                 self.has_initial_target = True
 
-    def move(self):
+    def steer(self):
+        """ターゲットを探し、ターゲットの方向へ少しずつ向きを変える"""
         # 最初にターゲットを見つけるまで、またはターゲットが生存している間のみ追尾
         if not self.has_initial_target:
             self.find_target()
@@ -90,7 +97,13 @@ class HomingBullet(Bullet):
                     self.direction = self.direction.lerp(target_direction, self.turn_speed * 0.02)
                 else:
                     self.direction = self.direction.slerp(target_direction, self.turn_speed * 0.02)
-        
+
+    def move(self):
+        # HomingSteering で方向転換済みでなければ、1発ずつ処理する
+        if not self.steered:
+            self.steer()
+        self.steered = False
+
         self.pos += self.direction * self.speed
         self.rect.center = self.pos
 
@@ -102,11 +115,15 @@ class HomingBullet(Bullet):
         # 親クラスのアニメーションを呼び出して、self.image を更新
         self.animation()
 
-        # 進行方向ベクトルから角度を計算 (上方向が0度)
-        angle = -self.direction.angle_to(pygame.math.Vector2(0, -1))
-
-        # 毎回、画質が劣化していないアニメーション用の元画像(self.pre_image)を
-        # スケールしてから回転させることで、画質の劣化を防ぐ
-        scaled_image = pygame.transform.scale(self.pre_image, (24, 48))
-        self.image = pygame.transform.rotate(scaled_image, angle)
+        # アニメーション画像か進行方向が変わったときだけ回転画像を選び直す
+        if self.pre_image is not self.image_source or self.direction != self.image_direction:
+            # 進行方向ベクトルから角度を計算 (上方向が0度)
+            angle = -self.direction.angle_to(pygame.math.Vector2(0, -1))
+
+            # 画質が劣化していないアニメーション用の元画像(self.pre_image)の
+            # 回転済み画像をキャッシュから受け取る
+            self.rotated_image = atlas.get(self.pre_image, angle)
+            self.image_source = self.pre_image
+            self.image_direction = pygame.math.Vector2(self.direction)
+        self.image = self.rotated_image
         self.rect = self.image.get_rect(center=self.rect.center)
\ No newline at end of file
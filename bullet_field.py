@@ -0,0 +1,234 @@
+import pygame
+from setting import *
+from enemy_bullet import load_bullet_image, is_color_list
+from rotation_atlas import atlas
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければ EnemyBulletGroup を使う
+    np = None
+
+class BulletField:
+    """敵弾を NumPy の配列（位置・方向・速度・半径・凍結タイマー・種類）でまとめて管理する弾ストア
+
+    EnemyBulletGroup と同じ spawn() で弾を生成でき、移動・凍結解除・画面外の消去を
+    配列演算で一括処理する。Game.enemy_bullets として pygame.sprite.Group の代わりに使う。
+    自機との当たり判定は CollisionSystem が collide_circle() で行う。
+    """
+    available = np is not None
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.dx = np.zeros(capacity, dtype=np.float64)
+        self.dy = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.radius = np.zeros(capacity, dtype=np.float64)   # 当たり判定の半径
+        self.frozen = np.zeros(capacity, dtype=np.int32)     # 残りの凍結フレーム数
+        self.type_id = np.zeros(capacity, dtype=np.int32)    # 描画する画像の番号
+
+        # 弾の見た目（種類・大きさ・色・角度）ごとに画像を一つだけ保持する
+        self.image_ids = {}
+        self.images = []
+        self.image_styles = [] # 画像番号 → _image_id() の引数（スナップショットから画像番号を引き直すため）
+        self.image_half_w = np.zeros(0, dtype=np.int32)
+        self.image_half_h = np.zeros(0, dtype=np.int32)
+        self.image_w = np.zeros(0, dtype=np.int32)
+        self.image_h = np.zeros(0, dtype=np.int32)
+        self.image_size = np.zeros(0, dtype=np.float64)  # 回転前の画像の長辺（当たり判定の大きさ）
+        # spawn_batch() 用: (種類, 長さ, 大きさ, 色, 回転画像の番号) → 画像番号
+        self.style_ids = {}
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """配列の容量を2倍に広げる"""
+        self.capacity *= 2
+        for name in ('x', 'y', 'dx', 'dy', 'speed', 'radius', 'frozen', 'type_id'):
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _image_id(self, bullet_type, radius, color, length, frame):
+        """見た目（frame は回転画像の番号）に対応する画像番号を返す（初めての見た目なら画像を登録する）"""
+        base = load_bullet_image(bullet_type, radius, color, length)
+        # 渦巻き弾(vortex)や氷弾(ice)は円形なので回転させない
+        rotates = not bullet_type.startswith('vortex') and bullet_type != 'ice'
+        if not rotates:
+            frame = 0
+        key = (base, frame)
+        image_id = self.image_ids.get(key)
+        if image_id is None:
+            image = atlas.get_frame(base, frame) if rotates else base
+            image_id = len(self.images)
+            self.image_ids[key] = image_id
+            self.images.append(image)
+            self.image_styles.append((bullet_type, radius, color, length, frame))
+            self.image_half_w = np.append(self.image_half_w, image.get_width() // 2)
+            self.image_half_h = np.append(self.image_half_h, image.get_height() // 2)
+            self.image_w = np.append(self.image_w, image.get_width())
+            self.image_h = np.append(self.image_h, image.get_height())
+            self.image_size = np.append(self.image_size, max(base.get_width(), base.get_height()))
+        return image_id
+
+    def spawn(self, x, y, target_group, speed=1, direction=None, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
+        """敵弾を1発追加する（引数は EnemyBullet と同じ。target_group は互換性のために受け取るだけ）"""
+        if direction is None:
+            # デフォルトは下方向
+            direction = pygame.math.Vector2(0, 1)
+        else:
+            direction = pygame.math.Vector2(direction)
+        # 長さを正規化（ゼロベクトルはそのまま）
+        if direction.length_squared() != 0:
+            direction.normalize_ip()
+
+        angle = -direction.angle_to(pygame.math.Vector2(0, 1))
+        image_id = self._image_id(bullet_type, radius, color, length, atlas.angle_index(angle))
+
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.dx[i] = direction.x
+        self.dy[i] = direction.y
+        self.speed[i] = speed
+        size = self.image_size[image_id]
+        self.radius[i] = size / 2 * 0.8 # 当たり判定を少し小さめに
+        self.frozen[i] = frozen_duration
+        self.type_id[i] = image_id
+        self.count += 1
+
+    def spawn_batch(self, x, y, dx, dy, speed, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
+        """敵弾をまとめて追加する（数値の引数は全弾共通、配列の引数は弾ごとの値）
+
+        方向の正規化と回転画像の番号を配列演算で求め、各配列の末尾へ一度に書き込む。
+        """
+        dx = np.asarray(dx, dtype=np.float64)
+        dy = np.asarray(dy, dtype=np.float64)
+        radius = np.asarray(radius, dtype=np.float64)
+        per_bullet_color = is_color_list(color)
+        count = max(np.size(v) for v in (x, y, dx, dy, speed, radius, frozen_duration))
+        if per_bullet_color:
+            count = max(count, len(color))
+        if count == 0:
+            return
+
+        # 長さを正規化（ゼロベクトルはそのまま）
+        length_sq = dx * dx + dy * dy
+        norm = np.where(length_sq != 0, np.sqrt(length_sq), 1.0)
+        dx = np.broadcast_to(dx / norm, count)
+        dy = np.broadcast_to(dy / norm, count)
+        # 画像の向き（下向きを0度とする角度）を回転画像の番号にする（円形の弾は回転させない）
+        if not bullet_type.startswith('vortex') and bullet_type != 'ice':
+            angle = np.degrees(np.arctan2(dy, dx)) - 90
+            frames = (np.rint(angle / atlas.step_angle).astype(np.int64) % atlas.steps).tolist()
+        else:
+            frames = [0] * count
+
+        # 見た目（大きさ・色・向き）ごとの画像番号は、初めての組み合わせのときだけ画像を引く
+        radii = np.broadcast_to(radius, count).tolist()
+        colors = map(tuple, color) if per_bullet_color else [tuple(color)] * count
+        style_ids = self.style_ids
+        type_id = np.empty(count, dtype=np.int32)
+        for i, (r, c, frame) in enumerate(zip(radii, colors, frames)):
+            key = (bullet_type, length, r, c, frame)
+            image_id = style_ids.get(key)
+            if image_id is None:
+                image_id = style_ids[key] = self._image_id(bullet_type, r, c, length, frame)
+            type_id[i] = image_id
+
+        while self.count + count > self.capacity:
+            self._grow()
+        part = slice(self.count, self.count + count)
+        self.x[part] = x
+        self.y[part] = y
+        self.dx[part] = dx
+        self.dy[part] = dy
+        self.speed[part] = speed
+        size = self.image_size[type_id]
+        self.radius[part] = size / 2 * 0.8 # 当たり判定を少し小さめに
+        self.frozen[part] = frozen_duration
+        self.type_id[part] = type_id
+        self.count += count
+
+    def _compact(self, keep):
+        """keep が True の弾だけを配列の先頭に詰め直す"""
+        n = self.count
+        for name in ('x', 'y', 'dx', 'dy', 'speed', 'radius', 'frozen', 'type_id'):
+            array = getattr(self, name)
+            kept = array[:n][keep]
+            array[:len(kept)] = kept
+        self.count = int(np.count_nonzero(keep))
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+
+        # 凍結タイマーを進め、凍結が解けた弾だけを移動させる
+        frozen = self.frozen[:n]
+        np.subtract(frozen, 1, out=frozen, where=frozen > 0)
+        moving = frozen <= 0
+        step = self.speed[:n] * moving
+        x += self.dx[:n] * step
+        y += self.dy[:n] * step
+
+        # 画面外に出た弾を消去する（EnemyBullet と同じく、整数座標に置いた現在の画像の矩形で判定する）
+        type_id = self.type_id[:n]
+        left = x.astype(np.int32) - self.image_half_w[type_id]
+        top = y.astype(np.int32) - self.image_half_h[type_id]
+        off_screen = moving & ((top > screen_height) | (top + self.image_h[type_id] < 0) |
+                               (left + self.image_w[type_id] < 0) | (left > GAME_AREA_WIDTH))
+
+        if off_screen.any():
+            self._compact(~off_screen)
+
+    def collide_circle(self, center, radius, check_rect=None):
+        """円と重なる弾を1発だけ消去し、衝突したかどうかを返す"""
+        n = self.count
+        if n == 0:
+            return False
+        # EnemyBulletGroup と同じく、check_rect（省略時は円の周囲）に画像の矩形が掛かる弾だけを調べる
+        if check_rect is None:
+            check_rect = pygame.Rect(0, 0, radius * 2, radius * 2)
+            check_rect.center = center
+        cx, cy = center
+        # 描画位置と同じく整数座標で判定する
+        x = self.x[:n].astype(np.int32)
+        y = self.y[:n].astype(np.int32)
+        type_id = self.type_id[:n]
+        left = x - self.image_half_w[type_id]
+        top = y - self.image_half_h[type_id]
+        inside = ((left < check_rect.right) & (left + self.image_w[type_id] > check_rect.left) &
+                  (top < check_rect.bottom) & (top + self.image_h[type_id] > check_rect.top))
+        reach = self.radius[:n] + radius
+        dx = x - cx
+        dy = y - cy
+        touching = inside & (dx * dx + dy * dy < reach * reach)
+        if not touching.any():
+            return False
+        keep = np.ones(n, dtype=bool)
+        keep[np.argmax(touching)] = False
+        self._compact(keep)
+        return True
+
+    def draw(self, surface):
+        """全ての弾を一度の blits 呼び出しで描画する"""
+        n = self.count
+        if n == 0:
+            return
+        type_id = self.type_id[:n]
+        left = self.x[:n].astype(np.int32) - self.image_half_w[type_id]
+        top = self.y[:n].astype(np.int32) - self.image_half_h[type_id]
+        images = self.images
+        surface.blits([(images[t], (l, tp)) for t, l, tp in zip(type_id.tolist(), left.tolist(), top.tolist())], doreturn=False)
+
+    def empty(self):
+        """全ての弾を消去する"""
+        self.count = 0
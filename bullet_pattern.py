@@ -0,0 +1,229 @@
+"""ボスの弾幕パターンをデータ（assets/data/patterns.json）から読み込む
+
+パターンは「いつ・どの形の弾を撃つか」を宣言的に書いたもので、読み込み時に一度だけ
+  - 弾の並び（相対位置・方向・速度・大きさ・色・凍結時間）を配列として前計算し（Volley）
+  - パターンのタイマー値ごとに撃つ Volley の表（発射表）を作る（BulletPattern）。
+実行時は発射表を引いて、発射元の位置への平行移動と回転だけをして spawn_batch() でまとめて生成する。
+
+Volley の種類（type）と主なキー（角度は度、下向きが90度）:
+  single: 1発（angle）
+  ring:   count 方向に等間隔（angle: 最初の弾の角度, distance: 中心から離して置く距離）
+  fan:    angle を中心に spread の範囲へ count 発
+  row:    横一列に spacing 間隔で count 発（slant: 横方向の傾き, speed_step: 外側ほど速く）
+  line:   angle の方向へ spacing 間隔で一列に count 発（*_ramp: 先頭から末尾へ増やす量）
+  aimed:  自機狙いの1発
+  rain:   画面上端のランダムな位置から、speed の範囲のランダムな速さで1発
+共通のキー:
+  every（間隔。リストなら全てで割り切れるフレーム）/ at（撃つフレームのリスト）
+  origin（center / bottom）, offset, snap（発射位置の x を整数に切り捨てる）
+  speed, radius, color, length, bullet_type, frozen, frozen_step（弾ごとに増やす凍結時間）
+  sway（変数の sin/cos で発射位置を横に揺らす）, spin（変数の値だけ全体を回転する）
+  alternate（変数が偶数のときだけ angle 度回転する）, advance（撃った後に変数へ加える値）
+"""
+import json
+import math
+import game_random
+from setting import *
+from emitter import ring_shape, fan_shape, row_shape, line_shape, single_shape, ramp_steps
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければリストで計算する
+    np = None
+
+_WAVES = {'sin': math.sin, 'cos': math.cos}
+
+def _column(values):
+    """前計算した値の列を、実行時の計算に使う形（NumPy配列かリスト）にする"""
+    return np.array(values, dtype=np.float64) if np is not None else list(values)
+
+def _rotate(xs, ys, c, s):
+    """(xs, ys) の列を cos=c, sin=s の回転で回す"""
+    if np is not None:
+        return xs * c - ys * s, xs * s + ys * c
+    return [x * c - y * s for x, y in zip(xs, ys)], [x * s + y * c for x, y in zip(xs, ys)]
+
+def _translate(base, values):
+    if np is not None:
+        return base + values
+    return [base + v for v in values]
+
+def _intervals(every):
+    if every is None:
+        return ()
+    return tuple(every) if isinstance(every, list) else (every,)
+
+class Volley:
+    """一度に撃つ弾の並びを前計算したもの（name: エラーに出すパターンや Volley の名前）"""
+    def __init__(self, spec, name=None):
+        self.name = name
+        self.type = spec['type']
+        self.every = _intervals(spec.get('every'))
+        self.at = frozenset(spec.get('at', ()))
+        self.origin = spec.get('origin', 'center')
+        self.offset = tuple(spec.get('offset', (0, 0)))
+        self.snap = spec.get('snap', False)
+        self.sway = [(s['var'], s['amplitude'], s.get('frequency', 1), math.radians(s.get('phase', 0)), _WAVES[s.get('wave', 'sin')])
+                     for s in spec.get('sway', ())]
+        spin = spec.get('spin')
+        self.spin = (spin['var'], spin.get('scale', 1), spin.get('degrees', False)) if spin else None
+        alternate = spec.get('alternate')
+        self.alternate = (alternate['var'], math.radians(alternate['angle'])) if alternate else None
+        self.advance = dict(spec.get('advance', {}))
+        self.speed = spec.get('speed', 1.0)
+        # 速さの範囲（リスト）は発射時に速さを選ぶ rain だけが使う
+        if (self.type == 'rain') != isinstance(self.speed, list):
+            expected = 'a [min, max] list' if self.type == 'rain' else 'a number'
+            raise ValueError(f'{self.type} volley in {name!r}: speed must be {expected}, got {self.speed!r}')
+        self.style = {
+            'length': spec.get('length'),
+            'bullet_type': spec.get('bullet_type', 'normal'),
+        }
+        self.compile(spec)
+
+    def compile(self, spec):
+        """弾ごとの相対位置・方向・速度・大きさ・色・凍結時間を前計算する（形は emitter の *_shape() で作る）"""
+        kind = self.type
+        count = spec.get('count', 1)
+        speed = spec.get('speed', 1.0)
+        angle = spec.get('angle')
+        if kind == 'ring':
+            shape = ring_shape(count, speed, math.radians(angle or 0), spec.get('distance', 0))
+        elif kind == 'fan':
+            shape = fan_shape(count, math.radians(spec['spread']), math.radians(angle), speed)
+        elif kind == 'row':
+            shape = row_shape(count, spec['spacing'], speed, spec.get('slant', 0.0), spec.get('speed_step', 0.0))
+        elif kind == 'line':
+            shape = line_shape(count, spec['spacing'], speed, math.radians(angle or 0), spec.get('speed_ramp', 0.0))
+        else:
+            # single / aimed / rain（aimed と rain は発射時に方向や速さを決める）
+            shape = single_shape(count, speed, math.radians(angle) if angle is not None else None)
+        rel_x, rel_y, dx, dy, speeds = shape
+        if kind == 'rain':
+            speeds = None
+        ramp = ramp_steps(count)
+
+        radius = spec.get('radius', 8)
+        radius_ramp = spec.get('radius_ramp', 0.0)
+        color = tuple(spec.get('color', ENEMY_BULLET_COLOR))
+        color_ramp = spec.get('color_ramp')
+        frozen, frozen_step = spec.get('frozen', 0), spec.get('frozen_step', 0)
+
+        self.count = count
+        self.rel_x, self.rel_y = _column(rel_x), _column(rel_y)
+        self.dx, self.dy = _column(dx), _column(dy)
+        self.speeds = _column(speeds) if speeds is not None else None
+        self.radius = _column([radius + t * radius_ramp for t in ramp]) if radius_ramp else radius
+        self.color = [tuple(c + r * t for c, r in zip(color, color_ramp)) for t in ramp] if color_ramp else color
+        self.frozen = _column([frozen + frozen_step * i for i in range(count)]) if frozen_step else frozen
+
+    def fires_at(self, frame):
+        """タイマーが frame のときに撃つかどうか"""
+        if frame in self.at:
+            return True
+        return bool(self.every) and all(frame % e == 0 for e in self.every)
+
+    def fire(self, boss, variables, angle=0.0):
+        """boss の位置から弾を撃つ（angle: 呼び出し側が指定する追加の回転、ラジアン）"""
+        rect = boss.rect
+        ox, oy = rect.midbottom if self.origin == 'bottom' else rect.center
+        ox += self.offset[0]
+        oy += self.offset[1]
+        for var, amplitude, frequency, phase, wave in self.sway:
+            ox += amplitude * wave(variables[var] * frequency + phase)
+        if self.snap:
+            ox = int(ox)
+        style = dict(self.style, radius=self.radius, color=self.color, frozen_duration=self.frozen)
+
+        if self.type == 'aimed':
+            boss.emit_aimed(self.speed, origin=(ox, oy), **style)
+        elif self.type == 'rain':
+            x = game_random.randint(0, GAME_AREA_WIDTH)
+            boss.emit(x, 0, speed=game_random.uniform(*self.speed), **style)
+        else:
+            if self.spin:
+                var, scale, degrees = self.spin
+                angle += math.radians(variables[var]) if degrees else scale * variables[var]
+            if self.alternate and variables[self.alternate[0]] % 2 == 0:
+                angle += self.alternate[1]
+            rel_x, rel_y, dx, dy = self.rel_x, self.rel_y, self.dx, self.dy
+            if angle:
+                c, s = math.cos(angle), math.sin(angle)
+                rel_x, rel_y = _rotate(rel_x, rel_y, c, s)
+                dx, dy = _rotate(dx, dy, c, s)
+            boss.emit(_translate(ox, rel_x), _translate(oy, rel_y), dx, dy, self.speeds, **style)
+
+        for var, step in self.advance.items():
+            variables[var] += step
+
+class BulletPattern:
+    """1つの攻撃パターン: タイマー値ごとに撃つ Volley の発射表と、パターン全体の設定"""
+    def __init__(self, name, spec, frames=PATTERN_TABLE_FRAMES):
+        self.name = name
+        self.volleys = [Volley(v, name) for v in spec.get('emit', ())]
+        self.vars = dict(spec.get('vars', {}))
+        self.hold = spec.get('hold', False)     # 発射中はボスを移動させない
+        self.script = spec.get('script')        # 弾以外の演出も行うパターンは、ボスのメソッドに任せる
+        self.sweep = spec.get('sweep')          # 毎フレーム変数を往復させる（レーザーの薙ぎ払いなど）
+        # 発射表: タイマー値 → そのフレームに撃つ Volley のタプル
+        empty = ()
+        self.table = [tuple(v for v in self.volleys if v.fires_at(frame)) or empty for frame in range(frames)]
+
+    def run(self, boss, timer, variables):
+        """タイマー値 timer のフレームの弾を撃つ"""
+        for volley in self.table[timer % len(self.table)]:
+            volley.fire(boss, variables)
+        if self.sweep:
+            sweep = self.sweep
+            value = variables[sweep['var']] + sweep['step'] * variables[sweep['direction']]
+            variables[sweep['var']] = value
+            # 端で反射するように動く
+            if not (sweep['min'] < value < sweep['max']):
+                variables[sweep['direction']] *= -1
+        if self.script:
+            getattr(boss, self.script)()
+
+class BossSchedule:
+    """ボスごとのパターンの選択規則
+
+    change_time: パターンの持続フレーム数（durations でパターンごとに上書き）
+    order: 順番に繰り返す攻撃パターン / choice: ランダムに選ぶ攻撃パターン
+    rest: 攻撃の合間に挟む待機パターン / first: 最初のパターン（省略時は order の先頭）
+    enrage: HPが health の割合以下になったら change_time を変え、choice からランダムに選ぶ
+    """
+    def __init__(self, spec):
+        self.change_time = spec['change_time']
+        self.durations = dict(spec.get('durations', {}))
+        self.order = list(spec.get('order', ()))
+        self.choice = list(spec.get('choice', ()))
+        self.rest = spec.get('rest')
+        self.first = spec.get('first', self.order[0] if self.order else None)
+        self.enrage = spec.get('enrage')
+
+class PatternLibrary:
+    """パターン定義ファイル全体（パターン・名前付きの Volley・ボスごとの選択規則）"""
+    def __init__(self, data):
+        self.patterns = {name: BulletPattern(name, spec) for name, spec in data['patterns'].items()}
+        self.volleys = {name: Volley(spec, name) for name, spec in data.get('volleys', {}).items()}
+        self.schedules = {name: BossSchedule(spec) for name, spec in data.get('bosses', {}).items()}
+        # ボスが持つ変数の初期値（同じ名前の変数はパターン間で共有する）
+        self.initial_vars = {}
+        for pattern in self.patterns.values():
+            self.initial_vars.update(pattern.vars)
+
+    def schedule_for(self, boss_class):
+        """ボスのクラス（なければ親クラス）の名前で選択規則を探す"""
+        for cls in boss_class.__mro__:
+            if cls.__name__ in self.schedules:
+                return self.schedules[cls.__name__]
+        raise KeyError(f'no pattern schedule for {boss_class.__name__}')
+
+_libraries = {}
+
+def load_patterns(path=PATTERN_FILE):
+    """パターン定義ファイルを読み込み、前計算したライブラリを返す（ファイルごとに一度だけ）"""
+    library = _libraries.get(path)
+    if library is None:
+        with open(path, encoding='utf-8') as f:
+            library = _libraries[path] = PatternLibrary(json.load(f))
+    return library
@@ -0,0 +1,88 @@
+import pygame
+from collections import namedtuple
+from setting import *
+from boss import BossEnemy
+from spatial_hash import SpatialGroup
+
+# 当たり判定で発生したイベント
+# kind: 'bullet_enemy'（自機弾→敵）, 'bomb_enemy'（ボム→敵）, 'bullet_player'（敵弾→自機）,
+#       'body_player'（敵本体→自機）, 'item_player'（アイテム→自機）
+HitEvent = namedtuple('HitEvent', ['kind', 'source', 'target'])
+
+class CollisionSystem:
+    """全ての組み合わせの当たり判定を、移動がすべて終わった後に1フレーム1回だけまとめて解決するクラス"""
+    def __init__(self, player_group, enemy_group, enemy_bullets, item_group):
+        self.player_group = player_group
+        self.enemy_group = enemy_group
+        self.enemy_bullets = enemy_bullets
+        self.item_group = item_group
+
+    def rebuild_indexes(self, player):
+        """移動後の位置で空間ハッシュを作り直す"""
+        self.enemy_group.rebuild_index()
+        if isinstance(self.enemy_bullets, SpatialGroup):
+            self.enemy_bullets.rebuild_index()
+        player.bullet_group.rebuild_index()
+
+    def resolve(self, player):
+        """当たり判定を解決し、発生したイベントのリストを返す"""
+        events = []
+        if player is None:
+            return events
+        self.rebuild_indexes(player)
+
+        self.player_bullets_vs_enemies(player, events)
+        self.bomb_vs_enemies(player, events)
+        # 自機が生きている場合のみ自機側の判定を行う
+        if len(self.player_group) > 0:
+            self.enemies_vs_player(player, events)
+            self.items_vs_player(player, events)
+        return events
+
+    def player_bullets_vs_enemies(self, player, events):
+        """自機弾と敵: 敵の矩形と重なる弾だけを空間ハッシュから取り出す"""
+        bullet_group = player.bullet_group
+        for enemy in self.enemy_group:
+            if not enemy.alive:
+                continue
+            for bullet in bullet_group.query_rect(enemy.rect):
+                bullet.kill()
+                enemy.take_damage(1)
+                events.append(HitEvent('bullet_enemy', bullet, enemy))
+
+    def bomb_vs_enemies(self, player, events):
+        """ボム（マスタースパーク）と敵: 当たっている間は継続的にダメージを与える"""
+        bomb = player.bomb_group.sprite
+        if bomb is None:
+            return
+        # レーザーを縦長の帯として扱い、帯と重なる敵だけを空間ハッシュから取り出す
+        for enemy in self.enemy_group.query_rect(bomb.beam_rect()):
+            if hasattr(enemy, 'take_damage'):
+                enemy.take_damage(bomb.damage)
+                events.append(HitEvent('bomb_enemy', bomb, enemy))
+
+    def enemies_vs_player(self, player, events):
+        """敵本体・敵弾と自機: 無敵中とボム発動中は判定しない"""
+        if player.invincible or player.bomb_active:
+            return
+
+        # 敵本体との当たり判定
+        for enemy in self.enemy_group.query_rect(player.rect):
+            # ボス以外の敵と衝突した場合
+            if not isinstance(enemy, BossEnemy):
+                player.take_damage()
+                enemy.kill() # 敵を消滅させる
+                events.append(HitEvent('body_player', enemy, player))
+                return # 複数の敵と同時に当たらないようにする
+
+        # 共有の敵弾グループとの円形当たり判定（自機を中心とした250x250の範囲のみ）
+        check_rect = pygame.Rect(0, 0, 250, 250)
+        check_rect.center = player.rect.center
+        if self.enemy_bullets.collide_circle(player.pos, player.radius, check_rect):
+            player.take_damage()
+            events.append(HitEvent('bullet_player', None, player))
+
+    def items_vs_player(self, player, events):
+        """アイテムと自機: 触れたアイテムは消え、効果は Game がイベントから適用する"""
+        for item in pygame.sprite.spritecollide(player, self.item_group, True):
+            events.append(HitEvent('item_player', item, player))
@@ -0,0 +1,51 @@
+import pygame
+from setting import *
+
+def merge_rects(rects):
+    """重なっている（接している）矩形を1つにまとめる"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # まとめた結果がさらに他の矩形と重なることがあるので、重なりがなくなるまで繰り返す
+        while True:
+            index = rect.inflate(2, 2).collidelist(merged)
+            if index < 0:
+                break
+            rect.union_ip(merged.pop(index))
+        merged.append(rect)
+    return merged
+
+class DirtyRectTracker:
+    """描き換えた領域を記録し、その部分だけを画面に反映する
+
+    レイヤー（ゲームエリア・スコアパネル・オーバーレイ）ごとに add() で描き換えた矩形を渡し、
+    present() で重なりをまとめて pygame.display.update(rects) を呼ぶ。
+    描き換えた面積が画面の coverage 以上なら全体を flip する。
+    """
+    def __init__(self, size=(screen_width, screen_height), coverage=DIRTY_FLIP_COVERAGE):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.coverage = coverage
+        self.rects = []
+        self.full = True # 最初のフレームは全体を反映する
+        self.stats = {'flips': 0, 'updates': 0}
+
+    def add(self, rect):
+        self.rects.append(pygame.Rect(rect).clip(self.screen_rect))
+
+    def invalidate(self):
+        """次の present() で画面全体を反映する"""
+        self.full = True
+
+    def present(self):
+        """記録した領域を画面に反映する"""
+        rects = merge_rects(r for r in self.rects if r.width and r.height)
+        self.rects.clear()
+        area = sum(r.width * r.height for r in rects)
+        if self.full or area >= self.screen_rect.width * self.screen_rect.height * self.coverage:
+            pygame.display.flip()
+            self.full = False
+            self.stats['flips'] += 1
+        elif rects:
+            pygame.display.update(rects)
+            self.stats['updates'] += 1
+        return rects
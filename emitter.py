@@ -0,0 +1,73 @@
+import math
+from setting import *
+
+# 弾の並び（形）###################################################################################
+# 形は発射位置からの相対位置・方向・速さの列の組 (rel_x, rel_y, dx, dy, speeds) で、
+# 弾幕パターンの前計算（bullet_pattern.Volley）が使う。
+
+def _directions(angles):
+    """角度（ラジアン）の列から方向ベクトルの x, y の列を作る"""
+    return [math.cos(a) for a in angles], [math.sin(a) for a in angles]
+
+def ramp_steps(count):
+    """先頭から末尾へ 0 から (count-1)/count まで増える列（*_ramp の倍率）"""
+    return [i / count for i in range(count)]
+
+def ring_shape(count, speed, phase=0.0, distance=0.0):
+    """count 方向に等間隔の放射状（phase: 最初の弾の角度、distance: 中心から離して置く距離）"""
+    dx, dy = _directions([phase + (2 * math.pi / count) * i for i in range(count)])
+    return [x * distance for x in dx], [y * distance for y in dy], dx, dy, [speed] * count
+
+def fan_shape(count, spread, center, speed):
+    """center の方向を中心に、spread（ラジアン）の範囲へ count 発の扇状"""
+    dx, dy = _directions([center - spread / 2 + (spread / max(1, count - 1)) * i for i in range(count)])
+    return [0.0] * count, [0.0] * count, dx, dy, [speed] * count
+
+def row_shape(count, spacing, speed, slant=0.0, speed_step=0.0):
+    """横一列に spacing 間隔で並べた count 発
+
+    中心から i 番目の弾は、横方向に i * slant 傾いた方向へ、speed + |i| * speed_step の速さで進む。
+    """
+    offsets = [i - (count - 1) / 2 for i in range(count)]
+    lengths = [math.sqrt((i * slant) ** 2 + 1) for i in offsets]
+    dx = [i * slant / l for i, l in zip(offsets, lengths)]
+    dy = [1 / l for l in lengths]
+    return [i * spacing for i in offsets], [0.0] * count, dx, dy, [speed + abs(i) * speed_step for i in offsets]
+
+def line_shape(count, spacing, speed, angle, speed_ramp=0.0):
+    """angle（ラジアン）の方向へ spacing 間隔で一列に並べた count 発（先頭から i / count * speed_ramp ずつ速く）"""
+    dx, dy = _directions([angle] * count)
+    rel_x = [x * i * spacing for i, x in enumerate(dx)]
+    rel_y = [y * i * spacing for i, y in enumerate(dy)]
+    return rel_x, rel_y, dx, dy, [speed + t * speed_ramp for t in ramp_steps(count)]
+
+def single_shape(count, speed, angle=None):
+    """angle（ラジアン、省略時は真下）の方向へ count 発を同じ位置から"""
+    if angle is None:
+        dx, dy = [0.0] * count, [1.0] * count
+    else:
+        dx, dy = _directions([angle] * count)
+    return [0.0] * count, [0.0] * count, dx, dy, [speed] * count
+
+class BulletEmitter:
+    """敵・ボスが弾をまとめて発射するためのメソッド（Enemy が継承する）
+
+    弾ごとの位置・方向・速度を列としてまとめて計算し、弾ストア（EnemyBulletGroup / BulletField）の
+    spawn_batch() で一度に追加する。style には radius, color, length, bullet_type, frozen_duration を渡せる。
+    """
+    def emit(self, x, y, dx=0.0, dy=1.0, speed=1.0, **style):
+        """弾を発射する（x, y, dx, dy, speed は数値か同じ長さの列）"""
+        self.enemy_bullets.spawn_batch(x, y, dx, dy, speed, **style)
+
+    def emit_aimed(self, speed, origin=None, **style):
+        """自機を狙って1発発射する。自機がいなければ False を返す"""
+        if not self.player_group:
+            return False
+        player = self.player_group.sprite if hasattr(self.player_group, 'sprite') else list(self.player_group)[0]
+        dx = player.rect.centerx - self.rect.centerx
+        dy = player.rect.centery - self.rect.centery
+        if dx == 0 and dy == 0:
+            dx, dy = 0, 1
+        ox, oy = origin if origin is not None else self.rect.midbottom
+        self.emit(ox, oy, dx, dy, speed, **style)
+        return True
@@ -1,16 +1,79 @@
 import pygame
 from setting import *
 import math
+import asset_cache
+from rotation_atlas import atlas
+from spatial_hash import SpatialGroup
+from pool import PooledSprite, release_all
 
-class EnemyBullet(pygame.sprite.Sprite):
-    """敵の弾（direction プロパティ対応）"""
-    def __init__(self, groups, x, y, target_group, speed=1, direction=None, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
-        super().__init__(groups)
-        self.screen = pygame.display.get_surface()
+# bullet_type ごとの弾画像
+ENEMY_BULLET_IMAGES = {
+    'normal': 'assets/img/enemy_bullet/0.png',
+    'laser': 'assets/img/enemy_bullet/laser.png',
+    'vortex_rev': 'assets/img/enemy_bullet/1.png', # 反時計回り渦弾
+    'vortex': 'assets/img/enemy_bullet/0.png',
+    'homing': 'assets/img/enemy_bullet/2.png',
+    'ice': 'assets/img/enemy_bullet/4.png',
+    'freeze': 'assets/img/enemy_bullet/freeze.png',
+}
 
+def create_fallback_image(bullet_type, radius, length, color, size):
+    """画像がない場合の代替画像を生成する"""
+    if bullet_type == 'laser':
+        # レーザーの場合は細長い矩形を生成
+        image = pygame.Surface((int(radius * 2), int(length if length else radius * 15)), pygame.SRCALPHA)
+        image.fill(color)
+    elif bullet_type == 'freeze':
+        # 氷弾の代替画像（氷の結晶のような形）
+        image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(image, (180, 220, 255), (radius, radius), radius)
+        pygame.draw.circle(image, WHITE, (radius, radius), radius, 2)
+    else:
+        image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (radius, radius), radius)
+    return pygame.transform.scale(image, size)
+
+def load_bullet_image(bullet_type, radius=8, color=ENEMY_BULLET_COLOR, length=None):
+    """弾の種類と大きさに応じた共有画像を返す"""
+    # lengthが指定されていれば細長い矩形に、なければ円形にサイズ調整
+    if length:
+        width = int(radius * 2)
+        height = int(length)
+    else:
+        width = height = int(radius * 2)
+
+    try:
+        # bullet_type に応じて画像を切り替える
+        path = ENEMY_BULLET_IMAGES.get(bullet_type, ENEMY_BULLET_IMAGES['normal'])
+        return asset_cache.load_image(path, (width, height))
+    except pygame.error:
+        # 画像がない場合の代替処理（代替画像も一度だけ生成して共有する）
+        return asset_cache.get_surface(
+            ('enemy_bullet', bullet_type, width, height, tuple(color)),
+            lambda: create_fallback_image(bullet_type, radius, length, color, (width, height)))
+
+def is_color_list(color):
+    """color が弾ごとの色の列かどうか"""
+    return len(color) > 0 and isinstance(color[0], (tuple, list))
+
+def batch_columns(*values):
+    """数値と列が混ざった引数を、同じ長さのリストの組にそろえる（数値は全弾に複製する）"""
+    columns = [v.tolist() if hasattr(v, 'tolist') else v for v in values]
+    count = max((len(c) for c in columns if isinstance(c, (list, tuple))), default=1)
+    return count, [list(c) if isinstance(c, (list, tuple)) else [c] * count for c in columns]
+
+class EnemyBullet(PooledSprite):
+    """敵の弾（direction プロパティ対応）
+
+    自機との当たり判定は CollisionSystem が行うため、target_group は生成APIの互換性のために受け取るだけで保持しない。
+    """
+    __slots__ = ('bullet_type', 'style', 'direction', 'original_image', 'image', 'rect', 'pos', 'speed', 'radius',
+                 'is_frozen', 'frozen_timer', 'rotates', 'image_direction')
+
+    def reset(self, x, y, target_group=None, speed=1, direction=None, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
         self.bullet_type = bullet_type
-        # 衝突対象（プレイヤーのグループなど）
-        self.target_group = target_group
+        # 見た目の指定（スナップショットから同じ画像の弾を作り直すために保持する）
+        self.style = (bullet_type, radius, tuple(color), length)
 
         if direction is None:
             # デフォルトは下方向
@@ -24,45 +87,8 @@ class EnemyBullet(pygame.sprite.Sprite):
         if self.direction.length_squared() != 0:
             self.direction = self.direction.normalize()
 
-        # 画像の読み込み
-        try:
-            # bullet_type に応じて画像を切り替える
-            if bullet_type == 'laser':
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/laser.png').convert_alpha()
-            elif bullet_type == 'vortex_rev': # 反時計回り渦弾
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/1.png').convert_alpha()
-            elif bullet_type == 'vortex':
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/0.png').convert_alpha()
-            elif bullet_type == 'homing':
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/2.png').convert_alpha()
-            elif bullet_type == 'ice':
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/4.png').convert_alpha()
-            elif bullet_type == 'freeze':
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/freeze.png').convert_alpha()
-            else:
-                self.original_image = pygame.image.load('assets/img/enemy_bullet/0.png').convert_alpha()
-        except Exception:
-            # 画像がない場合の代替処理
-            if bullet_type == 'laser':
-                # レーザーの場合は細長い矩形を生成
-                self.original_image = pygame.Surface((int(radius * 2), int(length if length else radius * 15)), pygame.SRCALPHA)
-                self.original_image.fill(color)
-            elif bullet_type == 'freeze':
-                # 氷弾の代替画像（氷の結晶のような形）
-                self.original_image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(self.original_image, (180, 220, 255), (radius, radius), radius)
-                pygame.draw.circle(self.original_image, WHITE, (radius, radius), radius, 2)
-            else:
-                self.original_image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(self.original_image, color, (radius, radius), radius)
-
-        # lengthが指定されていれば細長い矩形に、なければ円形にサイズ調整
-        if length:
-            width = int(radius * 2)
-            height = int(length)
-        else:
-            width = height = int(radius * 2)
-        self.original_image = pygame.transform.scale(self.original_image, (width, height))
+        # 画像は共有キャッシュから受け取る（弾を生成するたびにファイルを読み込まない）
+        self.original_image = load_bullet_image(bullet_type, radius, color, length)
 
         self.image = self.original_image
         self.rect = self.image.get_rect(center=(x, y))
@@ -76,6 +102,11 @@ class EnemyBullet(pygame.sprite.Sprite):
         self.is_frozen = frozen_duration > 0
         self.frozen_timer = frozen_duration
 
+        # 渦巻き弾(vortex)や氷弾(ice)は円形なので回転させない
+        self.rotates = not bullet_type.startswith('vortex') and bullet_type != 'ice'
+        # 現在の画像が向いている方向（変化がなければ回転画像を引き直さない）
+        self.image_direction = None
+
     def move(self):
         # 凍結中は移動しない
         if self.is_frozen:
@@ -95,25 +126,6 @@ class EnemyBullet(pygame.sprite.Sprite):
         if self.rect.top > screen_height or self.rect.bottom < 0 or self.rect.right < 0 or self.rect.left > GAME_AREA_WIDTH:
             self.kill()
 
-    def collision_target(self):
-        # ターゲットグループに take_damage メソッドを持つスプライトが存在する場合のみ判定
-        if self.target_group and hasattr(self.target_group.sprite, 'take_damage'):
-            target = self.target_group.sprite
-            # 無敵状態でない場合のみ衝突判定
-            if not getattr(target, 'invincible', False):
-                # ターゲット中心取得（pos 優先）
-                if hasattr(target, 'pos'):
-                    target_center = pygame.math.Vector2(target.pos)
-                else:
-                    target_center = pygame.math.Vector2(target.rect.center)
-    
-                target_radius = getattr(target, 'radius', 20)
-    
-                # 円形当たり判定
-                if self.pos.distance_to(target_center) < (self.radius + target_radius):
-                    target.take_damage(1) # 1ダメージを与える
-                    self.kill()
-
     def update(self):
         # 凍結状態を先に更新
         self.update_frozen_state()
@@ -121,13 +133,40 @@ class EnemyBullet(pygame.sprite.Sprite):
             return # 凍結中はここで処理を中断
         self.move()
 
-        # 渦巻き弾(vortex)や氷弾(ice)は円形なので、負荷の高い回転処理をスキップする
-        if not self.bullet_type.startswith('vortex') and self.bullet_type != 'ice':
-            # 進行方向に応じて画像を回転
+        # 進行方向が変わったときだけ、回転済み画像キャッシュから最も近い角度の画像を選ぶ
+        if self.rotates and self.direction != self.image_direction:
             angle = -self.direction.angle_to(pygame.math.Vector2(0, 1))
-            # 毎フレーム回転させると画質が劣化するので、元の画像を保持し、それを回転させる
-            self.image = pygame.transform.rotate(self.original_image, angle) 
+            self.image = atlas.get(self.original_image, angle)
             self.rect = self.image.get_rect(center=self.rect.center)
+            self.image_direction = pygame.math.Vector2(self.direction)
 
         self.check_off_screen()
-        self.collision_target()
\ No newline at end of file
+
+class EnemyBulletGroup(SpatialGroup):
+    """敵弾スプライトの共有グループ（BulletField と同じ生成APIを持つ）"""
+    def spawn(self, x, y, target_group, speed=1, direction=None, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
+        """敵弾を1発生成してこのグループに追加する（使い終わった弾をプールから再利用する）"""
+        return EnemyBullet.spawn(self, x, y, target_group, speed=speed, direction=direction, radius=radius, color=color, length=length, bullet_type=bullet_type, frozen_duration=frozen_duration)
+
+    def spawn_batch(self, x, y, dx, dy, speed, radius=8, color=ENEMY_BULLET_COLOR, length=None, bullet_type='normal', frozen_duration=0):
+        """敵弾をまとめて生成する（数値の引数は全弾共通、列の引数は弾ごとの値）"""
+        count, (x, y, dx, dy, speed, radius, frozen_duration) = batch_columns(x, y, dx, dy, speed, radius, frozen_duration)
+        colors = color if is_color_list(color) else [color] * count
+        for i in range(count):
+            EnemyBullet.spawn(self, x[i], y[i], speed=speed[i], direction=(dx[i], dy[i]), radius=radius[i], color=colors[i],
+                              length=length, bullet_type=bullet_type, frozen_duration=frozen_duration[i])
+
+    def empty(self):
+        """全ての弾を消去してプールに戻す"""
+        release_all(self)
+
+    def collide_circle(self, center, radius, check_rect=None):
+        """円と重なる弾を1発だけ消去し、衝突したかどうかを返す"""
+        # 空間ハッシュで check_rect（省略時は円の周囲）に掛かる弾だけを調べる
+        bullets = self.query_radius(center, radius) if check_rect is None else self.query_rect(check_rect)
+        for bullet in bullets:
+            bullet_pos = pygame.math.Vector2(bullet.rect.center)
+            if bullet_pos.distance_to(center) < radius + getattr(bullet, 'radius', 4):
+                bullet.kill()
+                return True
+        return False
\ No newline at end of file
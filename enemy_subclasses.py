@@ -1,9 +1,10 @@
 import pygame
-import random
+import game_random
 import math
 from enemy import Enemy
-from enemy_bullet import EnemyBullet
 from setting import *
+import game_clock
+import asset_cache
 
 class FastEnemy(Enemy):
     """素早く動いて少ないHPの敵、スポーン時に停止して自機狙い弾を発射"""
@@ -14,8 +15,7 @@ class FastEnemy(Enemy):
         self.score_value = 20   # FastEnemyのスコア
         
         try:
-            pre = pygame.image.load('assets/img/enemy/fast.png')
-            self.image = pygame.transform.scale(pre, (40, 40))
+            self.image = asset_cache.load_image('assets/img/enemy/fast.png', (40, 40))
         except Exception:
             surf = pygame.Surface((40,40), pygame.SRCALPHA)
             surf.fill(FAST_ENEMY_COLOR)
@@ -27,7 +27,7 @@ class FastEnemy(Enemy):
         
          # 行動パターン用のパラメータ
         self.state = 'spawn'          # spawn -> aim -> move
-        self.spawn_time = pygame.time.get_ticks()  # スポーン時刻（ms）
+        self.spawn_time = game_clock.get_ticks()  # スポーン時刻（ms）
         self.pause_ms = 2000           # スポーン後停止時間（ms）
         self.fire_timer = 0
         self.aim_shots = 0            # 発射した弾数
@@ -35,10 +35,10 @@ class FastEnemy(Enemy):
         self.shot_interval = 300      # 弾の発射間隔（ms）
 
         # 横移動用
-        self.move_direction = random.choice([-1, 1])  # 左か右にランダム
+        self.move_direction = game_random.choice([-1, 1])  # 左か右にランダム
 
     def move(self):
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
 
         if self.state == 'spawn':
                 # スポーン直後は pause_ms 経過まで停止
@@ -50,23 +50,9 @@ class FastEnemy(Enemy):
                 # プレイヤーを狙って弾を発射（shot_interval 毎）
                 if self.player_group and len(self.player_group) > 0:
                     if now - self.last_shot_time >= self.shot_interval:
-                        player = list(self.player_group)[0]
-                        # プレイヤーへの方向ベクトルを計算
-                        dx = player.rect.centerx - self.rect.centerx
-                        dy = player.rect.centery - self.rect.centery
-                        if dx == 0 and dy == 0:
-                            direction = pygame.math.Vector2(0, 1)
-                        else:
-                            direction = pygame.math.Vector2(dx, dy).normalize()
-
                         bullet_speed = 3.0 # 弾速を遅くする
-                        # 弾を生成（direction を直接渡す）
-                        EnemyBullet(self.enemy_bullets,
-                                    self.rect.centerx,
-                                    self.rect.bottom,
-                                    self.player_group,
-                                    speed=bullet_speed,
-                                    direction=direction)
+                        # プレイヤーへの方向に弾を生成
+                        self.emit_aimed(bullet_speed)
 
                         self.aim_shots += 1
                         self.last_shot_time = now
@@ -104,8 +90,7 @@ class TankEnemy(Enemy):
         self.score_value = 30  # TankEnemyのスコア
 
         try:
-            pre = pygame.image.load('assets/img/enemy/tank.png')
-            self.image = pygame.transform.scale(pre, (60, 60))
+            self.image = asset_cache.load_image('assets/img/enemy/tank.png', (60, 60))
         except Exception:
             surf = pygame.Surface((60,60), pygame.SRCALPHA)
             surf.fill(TANK_ENEMY_COLOR)
@@ -120,10 +105,10 @@ class TankEnemy(Enemy):
         self.spawn_x = float(self.rect.centerx)
         self.osc_amplitude = 60          # 横振幅（px）
         self.osc_speed = 0.0025          # 角速度（ms 単位）
-        self.phase_offset = random.random() * math.tau
+        self.phase_offset = game_random.random() * math.tau
 
         # 突進（バースト）パラメータ
-        self.burst_cooldown = random.randint(120, 300)  # 次のバーストまでの待機フレーム
+        self.burst_cooldown = game_random.randint(120, 300)  # 次のバーストまでの待機フレーム
         self.burst_timer = 0
         self.burst_duration = 0
         self.burst_dir = 0
@@ -137,7 +122,7 @@ class TankEnemy(Enemy):
         self.pos.y += self.speed
 
         # サイン波で横方向を滑らかに移動（float 演算）
-        t = pygame.time.get_ticks()
+        t = game_clock.get_ticks()
         target_x = self.spawn_x + math.sin(t * self.osc_speed + self.phase_offset) * self.osc_amplitude
 
         # 突進中なら強制的に横移動を行う（float）
@@ -153,13 +138,13 @@ class TankEnemy(Enemy):
             if self.burst_cooldown > 0:
                 self.burst_cooldown -= 1
             else:
-                if random.random() < 0.25:
+                if game_random.random() < 0.25:
                     # バースト開始
-                    self.burst_dir = random.choice([-1, 1])
-                    self.burst_speed = random.uniform(3.0, 5.0)
-                    self.burst_duration = random.randint(18, 36)
+                    self.burst_dir = game_random.choice([-1, 1])
+                    self.burst_speed = game_random.uniform(3.0, 5.0)
+                    self.burst_duration = game_random.randint(18, 36)
                 # 次回クールダウンをリセット
-                self.burst_cooldown = random.randint(160, 360)
+                self.burst_cooldown = game_random.randint(160, 360)
 
         # pos を rect に反映（整数へ）
         self.rect.centerx = int(self.pos.x)
@@ -182,14 +167,15 @@ class TankEnemy(Enemy):
         self.fire_timer += 1
         if self.fire_timer >= 40:
             # 中～広範囲にばら撒く（3〜5発）
-            if random.random() < 0.5:
-                cnt = random.randint(3,5)
+            if game_random.random() < 0.5:
+                cnt = game_random.randint(3,5)
+                xs, ys, speeds = [], [], []
                 for i in range(cnt):
                     ox = -30 + i * (60/(max(1,cnt-1)))  # 横に広げる
-                    x = int(self.rect.centerx + ox + random.uniform(-4,4))
-                    y = self.rect.bottom + 6 + random.randint(0,6)
-                    speed = random.uniform(1.2, 2.5) # 弾速を遅くする
-                    EnemyBullet(self.enemy_bullets, x, y, self.player_group, speed=speed)
+                    xs.append(int(self.rect.centerx + ox + game_random.uniform(-4,4)))
+                    ys.append(self.rect.bottom + 6 + game_random.randint(0,6))
+                    speeds.append(game_random.uniform(1.2, 2.5)) # 弾速を遅くする
+                self.emit(xs, ys, speed=speeds)
             self.fire_timer = 0
 
     def update(self):
@@ -197,8 +183,6 @@ class TankEnemy(Enemy):
         self.create_random_fire()
         super().update(move_override=True)
         # 爆発などは親に従う
-        self.explosion_group.draw(self.screen)
-        self.explosion_group.update()
 
 class WaveEnemy(Enemy):
     """波のように上下に揺れながら横に移動する敵"""
@@ -210,8 +194,7 @@ class WaveEnemy(Enemy):
 
         try:
             # 新しい敵用の画像をロード（なければフォールバック）
-            pre = pygame.image.load('assets/img/enemy/wave.png')
-            self.image = pygame.transform.scale(pre, (45, 45))
+            self.image = asset_cache.load_image('assets/img/enemy/wave.png', (45, 45))
         except Exception:
             surf = pygame.Surface((45, 45), pygame.SRCALPHA)
             surf.fill(WAVE_ENEMY_COLOR)
@@ -247,7 +230,7 @@ class WaveEnemy(Enemy):
         if self.fire_timer > 60:
             self.fire_timer = 0
             # 真下に弾を発射
-            EnemyBullet(self.enemy_bullets, self.rect.centerx, self.rect.bottom, self.player_group, speed=2.5) # 弾速を遅くする
+            self.emit(self.rect.centerx, self.rect.bottom, speed=2.5) # 弾速を遅くする
 
     def update(self):
         self.move()
@@ -264,8 +247,7 @@ class HunterEnemy(Enemy):
         self.score_value = 40  # HunterEnemyのスコア
 
         try:
-            pre = pygame.image.load('assets/img/enemy/hunter.png') # 新しい画像
-            self.image = pygame.transform.scale(pre, (55, 55))
+            self.image = asset_cache.load_image('assets/img/enemy/hunter.png', (55, 55)) # 新しい画像
         except Exception:
             surf = pygame.Surface((55, 55), pygame.SRCALPHA)
             surf.fill(HUNTER_ENEMY_COLOR) # 紫がかった色
@@ -275,7 +257,7 @@ class HunterEnemy(Enemy):
         self.pos = pygame.math.Vector2(self.rect.center)
         
         self.fire_cooldown = 120 # 弾の発射間隔 (フレーム)
-        self.fire_timer = random.randint(0, self.fire_cooldown) # タイマーをランダムに初期化
+        self.fire_timer = game_random.randint(0, self.fire_cooldown) # タイマーをランダムに初期化
 
     def move(self):
         """プレイヤーを追尾する動き"""
@@ -297,7 +279,7 @@ class HunterEnemy(Enemy):
                 direction = player.pos - self.pos
                 if direction.length_squared() > 0:
                     direction.normalize_ip()
-                EnemyBullet(self.enemy_bullets, self.rect.centerx, self.rect.bottom, self.player_group, speed=3.0, direction=direction) # 弾速を遅くする
+                self.emit(self.rect.centerx, self.rect.bottom, direction.x, direction.y, speed=3.0) # 弾速を遅くする
 
     def update(self):
         self.move()
@@ -0,0 +1,375 @@
+"""学習・プレイテスト用の環境（Gym 形式の reset / step で Game を進める）
+
+    env = GameEnv()
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(action)
+
+    with VectorEnv(16, workers=8) as envs:   # 16個のゲームを8プロセスで並列に進める
+        obs, infos = envs.reset(seed=1)
+        obs, rewards, terminated, truncated, infos = envs.step(actions)
+
+    python env.py --envs 16 --workers 8 --steps 5000     # 並列実行のフレーム数/秒を計測する
+
+行動は input_source.pack_keys() のビット列（0〜ACTION_COUNT-1、左・右・上・下・Z・X・SHIFT）。
+リスタート用の SPACE は含めない。報酬はスコアの増分から、被弾で減った体力1につき ENV_HIT_PENALTY を引いたもの。
+ゲームオーバーかクリアで terminated、ENV_MAX_STEPS ステップで truncated になる。
+
+観測は次のどちらか:
+  'entities' … 自機・敵・敵弾・アイテムの行を並べた float32 の配列（ENTITY_COLUMNS の列）。
+               敵・敵弾・アイテムは自機に近い順に ENV_MAX_ENEMIES / ENV_MAX_BULLETS / ENV_MAX_ITEMS 個まで。
+               座標はゲームエリアの幅・高さで割った値、vx, vy は敵弾の1ステップの移動量（それ以外は 0）。
+               空いている行はすべて 0。
+  'frame'    … 描画したゲームエリアを ENV_FRAME_SIZE に縮小した uint8 の (高さ, 幅, 3) の配列
+
+VectorEnv は環境をワーカープロセスに分けて持ち、観測は共有メモリ上の1つの配列
+（envs.observations、形は (環境数, ...)）にワーカーが直接書き込む。
+エピソードが終わった環境はそのステップのうちに次のエピソードを始め、info の 'episode' に結果を入れる。
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import headless
+import pygame
+from setting import *
+from input_source import INPUT_KEYS, ActionInput
+
+# 行動のビット数（リスタート用の SPACE は除く）
+ACTION_BITS = [bit for bit, codes in enumerate(INPUT_KEYS) if pygame.K_SPACE not in codes]
+ACTION_COUNT = 1 << len(ACTION_BITS)
+_ACTION_MASK = sum(1 << bit for bit in ACTION_BITS)
+
+ENTITY_COLUMNS = ('present', 'x', 'y', 'vx', 'vy')
+# 'entities' の観測の行の範囲
+ENTITY_ROWS = {
+    'player': slice(0, 1),
+    'enemies': slice(1, 1 + ENV_MAX_ENEMIES),
+    'bullets': slice(1 + ENV_MAX_ENEMIES, 1 + ENV_MAX_ENEMIES + ENV_MAX_BULLETS),
+    'items': slice(1 + ENV_MAX_ENEMIES + ENV_MAX_BULLETS, 1 + ENV_MAX_ENEMIES + ENV_MAX_BULLETS + ENV_MAX_ITEMS),
+}
+
+def observation_spec(observation='entities'):
+    """観測の (形, dtype) を返す"""
+    if observation == 'entities':
+        return (ENTITY_ROWS['items'].stop, len(ENTITY_COLUMNS)), np.float32
+    if observation == 'frame':
+        width, height = ENV_FRAME_SIZE
+        return (height, width, 3), np.uint8
+    raise ValueError(f"unknown observation {observation!r} (expected 'entities' or 'frame')")
+
+_SCALE = np.array([GAME_AREA_WIDTH, screen_height, GAME_AREA_WIDTH, screen_height], dtype=np.float64)
+
+def _fill_nearest(rows, data, px, py):
+    """data の (x, y, vx, vy) の行を (px, py) に近い順に rows に書き込む（入りきらない分は捨てる）"""
+    if len(data) == 0:
+        return
+    count = min(len(data), len(rows))
+    distance = (data[:, 0] - px) ** 2 + (data[:, 1] - py) ** 2
+    if count < len(data):
+        order = np.argpartition(distance, count - 1)[:count]
+        order = order[np.argsort(distance[order], kind='stable')]
+    else:
+        order = np.argsort(distance, kind='stable')
+    rows[:count, 0] = 1
+    rows[:count, 1:] = data[order] / _SCALE
+
+def _bullet_data(bullets):
+    """敵弾の (x, y, vx, vy) の配列（凍結中の弾は速度 0）"""
+    n = len(bullets)
+    if n == 0:
+        return np.empty((0, 4))
+    if hasattr(bullets, 'x'):
+        # BulletField: 配列から切り出す
+        moving = bullets.frozen[:n] <= 0
+        speed = np.where(moving, bullets.speed[:n], 0)
+        return np.stack([bullets.x[:n], bullets.y[:n], bullets.dx[:n] * speed, bullets.dy[:n] * speed], axis=1)
+    return np.array([(b.pos.x, b.pos.y, 0.0, 0.0) if b.is_frozen else
+                     (b.pos.x, b.pos.y, b.direction.x * b.speed, b.direction.y * b.speed) for b in bullets])
+
+class GameEnv:
+    """1つの Game を reset(seed) / step(action) で進める環境
+
+    out に観測と同じ形の配列を渡すと、観測はその配列に書き込んで返す（VectorEnv の共有メモリ用）。
+    invincible を指定すると、体力を保ってステージの最後まで進める（報酬の減点は残る）。
+    """
+    def __init__(self, observation='entities', frame_skip=1, max_steps=ENV_MAX_STEPS, invincible=False, out=None):
+        shape, dtype = observation_spec(observation)
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.invincible = invincible
+        self.obs = out if out is not None else np.zeros(shape, dtype)
+        if pygame.display.get_surface() is None:
+            headless.setup_display()
+        self.clock = pygame.time.Clock()
+        self.input_source = ActionInput()
+        self.game = None
+        self.seeds = None # reset(seed) の後、シードを省略した reset() で使うシードの列
+        self.steps = 0
+        self.episode_return = 0.0
+        if observation == 'frame':
+            self.frame_surface = pygame.Surface(ENV_FRAME_SIZE)
+
+    def reset(self, seed=None, options=None):
+        """新しいゲームを始め、(観測, info) を返す
+
+        options には開始位置（'stage', 'wave', 'time', 'boss_health'、Game.seek と同じ）か、
+        snapshot.capture() した状態（'state'）を指定できる。
+        """
+        from game import Game
+        if seed is not None:
+            self.seeds = random.Random(seed)
+        elif self.seeds is not None:
+            seed = self.seeds.getrandbits(32)
+        self.input_source.action = 0
+        self.game = Game(input_source=self.input_source, seed=seed)
+        options = dict(options or {})
+        state = options.pop('state', None)
+        if options:
+            self.game.seek(**options)
+        if state is not None:
+            self.game.restore(state)
+        self.steps = 0
+        self.episode_return = 0.0
+        return self.observe(), self.info()
+
+    def step(self, action):
+        """action を frame_skip ステップ与え、(観測, 報酬, terminated, truncated, info) を返す"""
+        game = self.game
+        self.input_source.action = int(action) & _ACTION_MASK
+        player = game.player
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            if self.invincible:
+                player.health = max(player.health, 3)
+            score, health = game.score, player.health
+            game.update()
+            game.profiler.end_frame()
+            reward += game.score - score - ENV_HIT_PENALTY * max(health - player.health, 0)
+            if game.game_over or game.game_clear:
+                break
+        self.steps += 1
+        self.episode_return += reward
+        terminated = game.game_over or game.game_clear
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        info = self.info()
+        if terminated or truncated:
+            info['episode'] = {'return': self.episode_return, 'length': self.steps, 'frames': game.game_clock.frame}
+        return self.observe(), reward, terminated, truncated, info
+
+    def info(self):
+        game = self.game
+        player = game.player
+        return {
+            'frame': game.game_clock.frame,
+            'score': game.score,
+            'health': player.health if game.player_group else 0,
+            'bombs': player.bombs,
+            'power': player.power_level,
+            'stage': game.stage_manager.stage,
+            'wave': game.stage_manager.current_wave,
+        }
+
+    def observe(self):
+        """現在の状態の観測を self.obs に書き込んで返す"""
+        if self.observation == 'frame':
+            self._observe_frame()
+        else:
+            self._observe_entities()
+        return self.obs
+
+    def _observe_entities(self):
+        game = self.game
+        obs = self.obs
+        obs.fill(0)
+        player = game.player
+        px, py = player.pos.x, player.pos.y
+        if game.player_group:
+            obs[0, :3] = (1, px / GAME_AREA_WIDTH, py / screen_height)
+        enemies = np.array([(e.pos.x, e.pos.y, 0.0, 0.0) for e in game.enemy_group]).reshape(-1, 4)
+        items = np.array([(i.pos.x, i.pos.y, 0.0, 0.0) for i in game.item_group]).reshape(-1, 4)
+        _fill_nearest(obs[ENTITY_ROWS['enemies']], enemies, px, py)
+        _fill_nearest(obs[ENTITY_ROWS['bullets']], _bullet_data(game.enemy_bullets), px, py)
+        _fill_nearest(obs[ENTITY_ROWS['items']], items, px, py)
+
+    def _observe_frame(self):
+        game = self.game
+        game.draw(self.clock)
+        area = game.screen.subsurface((0, 0, GAME_AREA_WIDTH, screen_height))
+        pygame.transform.smoothscale(area, ENV_FRAME_SIZE, self.frame_surface)
+        # surfarray は (幅, 高さ, 3) なので入れ替える
+        self.obs[...] = pygame.surfarray.pixels3d(self.frame_surface).transpose(1, 0, 2)
+
+# 並列実行 ############################################################################################
+
+def _worker(conn, shm_name, shape, dtype, start, stop, options):
+    """start〜stop-1 番目の環境を持ち、親プロセスからの命令を実行する"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    observations = np.ndarray(shape, dtype, buffer=shm.buf)
+    try:
+        envs = [GameEnv(out=observations[i], **options) for i in range(start, stop)]
+        while True:
+            command, data = conn.recv()
+            if command == 'reset':
+                seeds, reset_options = data
+                conn.send([env.reset(seed, reset_options)[1] for env, seed in zip(envs, seeds)])
+            elif command == 'step':
+                results = []
+                for env, action in zip(envs, data):
+                    _, reward, terminated, truncated, info = env.step(action)
+                    if terminated or truncated:
+                        # 次のエピソードを始め、観測はその最初のものにする
+                        env.reset()
+                    results.append((reward, terminated, truncated, info))
+                conn.send(results)
+            elif command == 'close':
+                break
+    finally:
+        del observations
+        shm.close()
+        conn.close()
+
+class VectorEnv:
+    """num_envs 個の GameEnv を workers 個のプロセスで並列に進める
+
+    workers が 0 ならこのプロセスで順に進める。観測は self.observations（共有メモリ上の配列）に書き込まれ、
+    reset() と step() はその配列をそのまま返すので、次の step() の後も残したい場合はコピーする。
+    残りのキーワード引数は GameEnv に渡す。
+    """
+    def __init__(self, num_envs, workers=None, start_method='spawn', **options):
+        if workers is None:
+            workers = min(num_envs, os.cpu_count() or 1)
+        workers = min(workers, num_envs)
+        self.num_envs = num_envs
+        shape, dtype = observation_spec(options.get('observation', 'entities'))
+        shape = (num_envs,) + shape
+        self.shm = None
+        self.envs = []
+        self.workers = []
+        self.ranges = []
+        if workers == 0:
+            self.observations = np.zeros(shape, dtype)
+            self.envs = [GameEnv(out=self.observations[i], **options) for i in range(num_envs)]
+            return
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+        self.observations = np.ndarray(shape, dtype, buffer=self.shm.buf)
+        self.observations.fill(0)
+        context = multiprocessing.get_context(start_method)
+        for w in range(workers):
+            # 環境をプロセスにできるだけ均等に分ける
+            start, stop = num_envs * w // workers, num_envs * (w + 1) // workers
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, args=(child, self.shm.name, shape, dtype, start, stop, options), daemon=True)
+            process.start()
+            child.close()
+            self.workers.append((process, parent))
+            self.ranges.append((start, stop))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self, seed=None, options=None):
+        """すべての環境を始め直し、(観測, info のリスト) を返す（seed を指定すると i 番目の環境は seed + i）"""
+        seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        if self.envs:
+            return self.observations, [env.reset(s, options)[1] for env, s in zip(self.envs, seeds)]
+        for (_, conn), (start, stop) in zip(self.workers, self.ranges):
+            conn.send(('reset', (seeds[start:stop], options)))
+        infos = []
+        for _, conn in self.workers:
+            infos.extend(conn.recv())
+        return self.observations, infos
+
+    def step(self, actions):
+        """環境ごとの行動を与え、(観測, 報酬, terminated, truncated, info のリスト) を返す"""
+        actions = [int(a) for a in actions]
+        if self.envs:
+            results = []
+            for env, action in zip(self.envs, actions):
+                _, reward, terminated, truncated, info = env.step(action)
+                if terminated or truncated:
+                    env.reset()
+                results.append((reward, terminated, truncated, info))
+        else:
+            for (_, conn), (start, stop) in zip(self.workers, self.ranges):
+                conn.send(('step', actions[start:stop]))
+            results = []
+            for _, conn in self.workers:
+                results.extend(conn.recv())
+        rewards, terminated, truncated, infos = zip(*results)
+        return (self.observations, np.array(rewards, dtype=np.float32), np.array(terminated), np.array(truncated), list(infos))
+
+    def close(self):
+        for process, conn in self.workers:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self.workers = []
+        if self.shm is not None:
+            # 共有メモリを指す配列を先に手放す
+            self.observations = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Step many headless games in parallel with random actions and report throughput.')
+    parser.add_argument('--envs', type=int, default=8, help='number of game instances')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU, 0 = run in this process)')
+    parser.add_argument('--steps', type=int, default=2000, help='vector steps to run')
+    parser.add_argument('--observation', choices=['entities', 'frame'], default='entities')
+    parser.add_argument('--frame-skip', type=int, default=1, help='simulation steps per action')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invincible', action='store_true', help='keep the players alive')
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    with VectorEnv(args.envs, args.workers, observation=args.observation, frame_skip=args.frame_skip,
+                   invincible=args.invincible) as envs:
+        envs.reset(seed=args.seed)
+        episodes = []
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, _, _, infos = envs.step(rng.integers(0, ACTION_COUNT, args.envs))
+            episodes.extend(info['episode'] for info in infos if 'episode' in info)
+        elapsed = time.perf_counter() - start
+        frames = args.steps * args.envs * args.frame_skip
+        workers = len(envs.workers)
+
+    result = {
+        'envs': args.envs,
+        'workers': workers,
+        'observation': args.observation,
+        'frames': frames,
+        'wall_seconds': round(elapsed, 3),
+        'frames_per_second': round(frames / elapsed, 1) if elapsed > 0 else None,
+        'frames_per_hour': round(frames / elapsed * 3600) if elapsed > 0 else None,
+        'episodes': len(episodes),
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f'{key}: {value}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,19 +1,20 @@
 import pygame
 from setting import *
+import asset_cache
+from pool import PooledSprite
 
-class Explosion(pygame.sprite.Sprite):
-    def __init__(self, groups, x, y):
-        super().__init__(groups)
+class Explosion(PooledSprite):
+    __slots__ = ('index', 'pre_image', 'image', 'rect')
+    image_list = None # 全ての爆発で共有するアニメーション画像
 
+    def reset(self, x, y):
         #画像
-        self.image_list = []
-        for i in range(1):
-            image = pygame.image.load(f'assets/img/explosion/{i}.png')
-            self.image_list.append(image)
+        if Explosion.image_list is None:
+            Explosion.image_list = [asset_cache.load_image(f'assets/img/explosion/{i}.png', (50, 50)) for i in range(1)]
 
         self.index = 0
         self.pre_image = self.image_list[self.index]
-        self.image = pygame.transform.scale(self.pre_image, (50, 50))
+        self.image = self.pre_image
         self.rect = self.image.get_rect(center = (x, y))
 
     def animation(self):
@@ -21,9 +22,9 @@ class Explosion(pygame.sprite.Sprite):
 
         if self.index < len(self.image_list):
            self.pre_image = self.image_list[int(self.index)]
-           self.image = pygame.transform.scale(self.pre_image, (50, 50)) 
+           self.image = self.pre_image
         else:
             self.kill()
 
-        def update(self):
-            self.animation()
\ No newline at end of file
+    def update(self):
+        self.animation()
\ No newline at end of file
@@ -1,36 +1,67 @@
 import pygame
 from setting import *
 from player import Player
+from enemy import Enemy
 from boss import BossEnemy
 from boss_subclasses import GrandBossEnemy, Stage1Boss
 from stage_manager import StageManager
+from enemy_bullet import EnemyBulletGroup
+from bullet_field import BulletField
+from spatial_hash import SpatialGroup
+from collision import CollisionSystem
 from support import draw_text
+from score_panel import ScorePanel
+from dirty_rects import DirtyRectTracker
+from pool import release_all
+from homing import HomingSteering
+from game_clock import GameClock
+from game_random import GameRandom
+from input_source import KeyboardInput
+from profiler import FrameProfiler, ProfilerOverlay
+import game_clock
+import game_random
+import snapshot
+import asset_cache
 
 class Game:
 
-    def __init__(self):
+    def __init__(self, input_source=None, seed=None):
         self.screen = pygame.display.get_surface()
+        # 入力元（省略時はキーボード）。1ステップに1回だけ読み取る
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        # ゲーム内の時計（各サブシステムは game_clock.get_ticks() でこの時計を読む）
+        self.game_clock = GameClock()
+        # ゲームの乱数列（各サブシステムは game_random の関数でこの乱数列から引く。省略時のシードはランダム）
+        self.rng = GameRandom(seed)
+        self.seed = self.rng.seed_value
+        # 処理ごとの時間計測と、スコアパネルに表示するグラフ
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
         self.score = 0
-        # UI表示用のフォントを準備
-        self.font_ui = pygame.font.Font(None, 30)
+        # スコア表示画面
+        self.score_panel = ScorePanel()
+        # 画面に反映する領域の記録（DIRTY_RECTS が有効な場合）
+        self.dirty_rects = DirtyRectTracker()
+        self.overlay_shown = False
 
         #グループの作成
         self.create_group()
+        self.make_current()
 
         #自機
-        self.player = Player(self.player_group, 300, 500, self.enemy_group, self.enemy_bullets, self.item_group)
+        self.player = Player(self.player_group, 300, 500, self.enemy_group, self.enemy_bullets, self.item_group, self.input_source)
         
         #背景
         self.bg_images = []
         try:
             # ステージごとの背景画像をロード
-            self.bg_images.append(pygame.transform.scale(pygame.image.load('assets/img/background/bg.png'),(GAME_AREA_WIDTH,screen_height)))
+            self.bg_images.append(asset_cache.load_image('assets/img/background/bg.png', (GAME_AREA_WIDTH, screen_height), alpha=False))
             
             # ステージ2の背景はゲームエリアの幅に合わせ、縦横比を維持してリサイズ
-            pre_bg2_img = pygame.image.load('assets/img/background/bg2.jpg')
+            pre_bg2_img = asset_cache.load_image('assets/img/background/bg2.jpg', alpha=False)
             aspect_ratio = pre_bg2_img.get_height() / pre_bg2_img.get_width()
             new_height = int(GAME_AREA_WIDTH * aspect_ratio)
-            self.bg_images.append(pygame.transform.scale(pre_bg2_img, (GAME_AREA_WIDTH, new_height)))
+            self.bg_images.append(asset_cache.load_image('assets/img/background/bg2.jpg', (GAME_AREA_WIDTH, new_height), alpha=False))
 
         except pygame.error:
             # 画像がない場合のフォールバック
@@ -43,27 +74,53 @@ class Game:
         self.bg_y = 0
 
         # ステージ管理
-        self.stage_manager = StageManager(self.enemy_group, self.player_group, self.item_group)
+        self.stage_manager = StageManager(self.enemy_group, self.player_group, self.item_group, self.boss_group)
+
+        # 当たり判定（移動がすべて終わった後に1フレーム1回まとめて解決する）
+        self.collision = CollisionSystem(self.player_group, self.enemy_group, self.enemy_bullets, self.item_group)
+        self.hit_events = []
+        # ホーミング弾の索敵と方向転換をまとめて計算する
+        self.homing = HomingSteering() if VECTORIZED_HOMING and HomingSteering.available else None
 
         #ゲームオーバー
         self.game_over = False
         self.game_clear = False
         self.grand_boss_defeated = False # 大ボスを倒したかどうかのフラグ
         self.paused = False # ポーズ状態のフラグ
+        # 状態のハッシュを記録する StateHasher（リプレイの記録・検証時に設定する）
+        self.state_hasher = None
+        # 巻き戻し用に毎ステップの状態を記録する RewindBuffer（有効にするときに設定する）
+        self.rewind = None
+
+    def make_current(self):
+        """このゲームの時計・乱数列と、敵が共有する爆発・ボスのグループを各サブシステムが使うものにする
+
+        update() / seek() / スナップショットの復元の最初に呼ぶので、1プロセスで複数のゲームを交互に進めても混ざらない。
+        """
+        game_clock.install(self.game_clock)
+        game_random.install(self.rng)
+        Enemy.explosion_group = self.explosion_group
+        BossEnemy.boss_group = self.boss_group
 
     def create_group(self):
         self.player_group = pygame.sprite.GroupSingle()
-        self.enemy_group = pygame.sprite.Group()
+        self.enemy_group = SpatialGroup()
         # 共有の敵弾グループを追加（敵が消えても弾が残る）
-        self.enemy_bullets = pygame.sprite.Group()
+        # BULLET_ENGINE が 'numpy' でNumPyが使える場合は、配列でまとめて処理する弾ストアを使う
+        if BULLET_ENGINE == 'numpy' and BulletField.available:
+            self.enemy_bullets = BulletField()
+        else:
+            self.enemy_bullets = EnemyBulletGroup()
         self.item_group = pygame.sprite.Group()
+        # 敵の爆発エフェクトを全ての敵で共有するグループ
+        self.explosion_group = pygame.sprite.Group()
+        # 生きているボスを登録するグループ（ステージ進行・HPバー・撃破判定で使う）
+        self.boss_group = pygame.sprite.Group()
 
     def player_death(self):
         if len(self.player_group) == 0:
             self.game_over = True
-            draw_text(self.screen, 'game over', GAME_AREA_WIDTH // 2, screen_height //2 ,75 , RED)
             self.stage_manager.spawn_active = False # 敵の出現を停止
-            draw_text(self.screen, 'press SPACE KEY to reset', GAME_AREA_WIDTH // 2, screen_height //2 + 100 ,50 , RED)
 
     def grand_boss_death(self):
         # 大ボスを倒したらクリア
@@ -71,15 +128,15 @@ class Game:
             self.game_clear = True
 
     def reset(self):
-        key = pygame.key.get_pressed()
+        key = self.input_source.get_pressed()
         if (self.game_over or self.game_clear) and key[pygame.K_SPACE]:
+            # 前のプレイヤーの弾をプールに戻す
+            release_all(self.player.bullet_group)
             # プレイヤーを再生成（敵弾グループも渡す）
-            self.player = Player(self.player_group, 300, 500, self.enemy_group, self.enemy_bullets, self.item_group)
+            self.player = Player(self.player_group, 300, 500, self.enemy_group, self.enemy_bullets, self.item_group, self.input_source)
             
             # 既存の敵と弾をすべて削除
-            self.enemy_group.empty()
-            self.enemy_bullets.empty()
-            self.item_group.empty()
+            self.clear_stage()
             self.score = 0 # スコアをリセット
             self.game_clear = False
             self.game_over = False
@@ -91,57 +148,63 @@ class Game:
             
             self.grand_boss_defeated = False # フラグをリセット
     
+    def clear_stage(self):
+        """敵・ボス・敵弾・アイテム・爆発をすべて消去する"""
+        self.enemy_group.empty()
+        self.boss_group.empty()
+        self.enemy_bullets.empty()
+        release_all(self.item_group)
+        release_all(self.explosion_group)
+
+    def seek(self, stage, wave=None, time=None, boss_health=None):
+        """ステージの途中から始める（引数は StageManager.seek と同じ）"""
+        self.make_current()
+        self.clear_stage()
+        self.stage_manager.seek(stage, wave, time, boss_health)
+        self.bg_img = self.bg_images[stage - 1]
+
+    def snapshot(self):
+        """シミュレーションの状態をバイト列にする（snapshot.capture）"""
+        return snapshot.capture(self)
+
+    def restore(self, data):
+        """snapshot() したバイト列の状態に戻す（snapshot.restore）"""
+        snapshot.restore(self, data)
+        if self.rewind is not None:
+            self.rewind.clear()
+
+    def step_back(self, steps=1):
+        """rewind に記録した steps ステップ前の状態に戻す（戻れなければ False）"""
+        if self.rewind is None:
+            return False
+        state = self.rewind.step_back(steps)
+        if state is None:
+            return False
+        snapshot.restore(self, state)
+        return True
+
     def scroll_bg(self):
         # 全ステージで共通のシンプルなスクロール処理を使用
         bg_height = self.bg_img.get_height()
         self.bg_y = (self.bg_y + 1) % bg_height
-        self.screen.blit(self.bg_img, (0, self.bg_y - bg_height))
-        self.screen.blit(self.bg_img, (0, self.bg_y))
+
+    def draw_bg(self):
+        # 次のステップまでの進み具合で補間し、描画のタイミングがずれても滑らかにスクロールさせる
+        bg_height = self.bg_img.get_height()
+        bg_y = int(self.bg_y + self.game_clock.alpha) % bg_height
+        if bg_height < screen_height:
+            # 背景が画面より短い場合は隙間を塗りつぶす（DIRTY_RECTS では画面全体を塗りつぶさないため）
+            self.screen.fill(BLACK, (0, 0, GAME_AREA_WIDTH, screen_height))
+        self.screen.blit(self.bg_img, (0, bg_y - bg_height))
+        self.screen.blit(self.bg_img, (0, bg_y))
 
     def draw_ui(self, clock):
-        """ゲームエリア右側のスコア表示画面を描画する"""
-        # スコアパネルの背景
-        pygame.draw.rect(self.screen, BLACK, (GAME_AREA_WIDTH, 0, SCORE_PANEL_WIDTH, screen_height))
-        # ゲームエリアとの境界線
-        pygame.draw.line(self.screen, WHITE, (GAME_AREA_WIDTH, 0), (GAME_AREA_WIDTH, screen_height), 2)
-
-        # ステージ表示
-        stage_text = f"STAGE: {self.stage_manager.stage}"
-        stage_surface = self.font_ui.render(stage_text, True, WHITE)
-        self.screen.blit(stage_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - stage_surface.get_width()) // 2, 50))
-
-        # スコア表示
-        score_title_surface = self.font_ui.render("SCORE", True, WHITE)
-        self.screen.blit(score_title_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - score_title_surface.get_width()) // 2, 90))
-        score_value_surface = self.font_ui.render(f"{self.score:07d}", True, SCORE_TEXT_COLOR) # 7桁表示
-        self.screen.blit(score_value_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - score_value_surface.get_width()) // 2, 125))
-
-        # ライフ表示 (既存のものを移動)
-        if len(self.player_group) > 0:
-            lives_text = f"LIVES: {self.player.health}"
-            lives_surface = self.font_ui.render(lives_text, True, WHITE)
-            self.screen.blit(lives_surface, (GAME_AREA_WIDTH + 20, screen_height - 50))
-
-        # ボム表示
-        if len(self.player_group) > 0:
-            bomb_text = f"BOMB: {self.player.bombs}"
-            bomb_surface = self.font_ui.render(bomb_text, True, WHITE)
-            self.screen.blit(bomb_surface, (GAME_AREA_WIDTH + 20, screen_height - 80))
-
-        # パワーレベル表示
-        if len(self.player_group) > 0:
-            power_title_surface = self.font_ui.render("POWER", True, SCORE_TEXT_COLOR)
-            self.screen.blit(power_title_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - power_title_surface.get_width()) // 2, 165))
-            power_level_text = f"{self.player.power_level} / {self.player.max_power}"
-            power_level_surface = self.font_ui.render(power_level_text, True, WHITE)
-            self.screen.blit(power_level_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - power_level_surface.get_width()) // 2, 200))
-
-        # FPS表示
-        fps = clock.get_fps()
-        fps_text = f"FPS: {fps:.2f}"
-        fps_surface = self.font_ui.render(fps_text, True, WHITE)
-        # UIパネルの上部に中央揃えで表示
-        self.screen.blit(fps_surface, (GAME_AREA_WIDTH + (SCORE_PANEL_WIDTH - fps_surface.get_width()) // 2, 20))
+        """ゲームエリア右側のスコア表示画面を描画する（値が変わったときだけ描き直す）"""
+        player = self.player if len(self.player_group) > 0 else None
+        self.score_panel.bind(self.stage_manager.stage, self.score, player)
+        self.score_panel.update_fps(clock)
+        if self.score_panel.draw(self.screen):
+            self.dirty_rects.add(self.score_panel.rect)
 
     def check_score_award(self):
         """敵が倒されたかチェックし、スコアを加算する"""
@@ -186,9 +249,9 @@ class Game:
 
     def check_boss_defeat_and_convert_bullets(self):
         """ボスが倒されたかチェックし、残った敵弾をスコアに変換する"""
-        for enemy in self.enemy_group:
+        for enemy in self.boss_group:
             # BossEnemy またはそのサブクラス（GrandBossEnemy）が対象
-            if isinstance(enemy, BossEnemy) and getattr(enemy, 'just_defeated', False):
+            if enemy.just_defeated:
                 # 大ボスが倒されたことを記録
                 if isinstance(enemy, GrandBossEnemy):
                     self.grand_boss_defeated = True
@@ -200,35 +263,75 @@ class Game:
 
                 enemy.just_defeated = False # フラグをリセットして二重処理を防ぐ
 
-    def run(self, clock):
-        self.scroll_bg()
-        
-        if self.paused:
-            # ポーズ中は描画のみ行い、更新処理をスキップ
-            draw_text(self.screen, 'PAUSED', GAME_AREA_WIDTH // 2, screen_height // 2, 75, WHITE)
+    @property
+    def paused(self):
+        """ポーズ状態（ゲーム内の時計を止める）"""
+        return self.game_clock.paused
+
+    @paused.setter
+    def paused(self, value):
+        self.game_clock.paused = value
+
+    def run(self, clock, rewinding=False):
+        # 前回の描画からの実時間に応じて、シミュレーションを固定ステップで進める（巻き戻し中は同じ速さで戻す）
+        steps = self.game_clock.advance(clock.get_time())
+        if rewinding:
+            if steps:
+                self.step_back(steps)
         else:
-            # ステージ管理と敵生成
+            for _ in range(steps):
+                self.update()
+        self.draw(clock)
+        self.profiler.end_frame()
+
+    def update(self):
+        """シミュレーションを1ステップ（1/FPS秒）進める"""
+        self.make_current()
+        profile = self.profiler.section
+        with profile('input'):
+            self.game_clock.step()
+            self.input_source.poll()
+        with profile('scroll'):
+            self.scroll_bg()
+
+        # ステージ管理と敵生成
+        with profile('stage'):
             result = self.stage_manager.update(self.game_over, self.grand_boss_defeated)
             if result == "game_clear":
                 self.game_clear = True
             elif isinstance(result, int): # ステージ移行
                  self.bg_img = self.bg_images[result - 1]
-            
-            # グループの更新
+
+        # グループの更新
+        with profile('player'):
             self.player_group.update()
+        with profile('bullets'):
+            # ホーミング弾の索敵用に敵の空間ハッシュを作り直す（敵はこのフレームではまだ動いていない）
+            self.enemy_group.rebuild_index()
             if self.player:
                 self.player.bomb_group.update()
+                if self.homing:
+                    self.homing.update(self.player.bullet_group, self.enemy_group)
                 self.player.bullet_group.update()
-            self.enemy_group.update()
             self.enemy_bullets.update()
+        with profile('enemies'):
+            self.enemy_group.update()
+            self.explosion_group.update()
 
-            # アイテムの更新（プレイヤーが生きている場合、位置を渡す）
+        # アイテムの更新（プレイヤーが生きている場合、位置を渡す）
+        with profile('items'):
             if len(self.player_group) > 0:
                 self.item_group.update(self.player.pos)
-                self.check_item_collision()
             else:
                 self.item_group.update()
 
+        # 全ての当たり判定をまとめて解決し、アイテムの効果を適用する
+        with profile('collision'):
+            self.hit_events = self.collision.resolve(self.player)
+
+        with profile('rules'):
+            self.apply_item_events(self.hit_events)
+
             # スコア加算のチェック
             self.check_score_award()
 
@@ -239,53 +342,98 @@ class Game:
             if self.player and self.player.bomb_active:
                 self.enemy_bullets.empty()
 
-        # --- 以下はポーズ中も実行される描画処理 ---
+            # ゲームクリアとゲームオーバーの判定
+            self.grand_boss_death()
+            self.player_death()
+
+            # リセット処理（このステップの入力で判定するので、描画の頻度によらず同じステップで起きる）
+            self.reset()
+
+        if self.state_hasher is not None:
+            self.state_hasher.step(self)
+        if self.rewind is not None:
+            with profile('rewind'):
+                self.rewind.push(self)
+
+    def draw(self, clock):
+        """現在の状態を描画する（ポーズ中も実行される）"""
+        profile = self.profiler.section
+        with profile('draw_bg'):
+            self.draw_bg()
+        # 背景がスクロールするので、ゲームエリアは毎フレーム全体を描き換える
+        self.dirty_rects.add((0, 0, GAME_AREA_WIDTH, screen_height))
+
+        if self.paused:
+            draw_text(self.screen, 'PAUSED', GAME_AREA_WIDTH // 2, screen_height // 2, 75, WHITE)
 
         # グループの描画
-        self.player_group.draw(self.screen)
-        if self.player:
-            self.player.bomb_group.draw(self.screen)
-            self.player.bullet_group.draw(self.screen)
-        self.enemy_group.draw(self.screen)
-        self.enemy_bullets.draw(self.screen)
-        self.item_group.draw(self.screen)
+        with profile('draw_player'):
+            self.player_group.draw(self.screen)
+            if self.player:
+                self.player.bomb_group.draw(self.screen)
+        with profile('draw_bullets'):
+            if self.player:
+                self.player.bullet_group.draw(self.screen)
+        with profile('draw_enemies'):
+            self.enemy_group.draw(self.screen)
+            self.explosion_group.draw(self.screen)
+        with profile('draw_bullets'):
+            self.enemy_bullets.draw(self.screen)
+        with profile('draw_items'):
+            self.item_group.draw(self.screen)
         
-        # プレイヤーの当たり判定を描画 (デバッグ用)
-        if self.player and self.player.show_hitbox:
-            # 緑の円でヒットボックス、赤い点で中心を表示
-            pygame.draw.circle(self.screen, GREEN, (int(self.player.pos.x), int(self.player.pos.y)), self.player.radius, 1)
-            pygame.draw.circle(self.screen, RED, (int(self.player.pos.x), int(self.player.pos.y)), 2)
+        with profile('draw_hud'):
+            # プレイヤーの当たり判定を描画 (デバッグ用)
+            if self.player and self.player.show_hitbox:
+                # 緑の円でヒットボックス、赤い点で中心を表示
+                pygame.draw.circle(self.screen, GREEN, (int(self.player.pos.x), int(self.player.pos.y)), self.player.radius, 1)
+                pygame.draw.circle(self.screen, RED, (int(self.player.pos.x), int(self.player.pos.y)), 2)
 
 
-        # ボスがいればHPバーを描画
-        for enemy in self.enemy_group:
-            if isinstance(enemy, BossEnemy):
+            # ボスがいればHPバーを描画
+            for enemy in self.boss_group:
                 self.draw_boss_hp_bar(enemy)
                 break # ボスは1体しかいないはずなのでループを抜ける
 
         # UI（スコア、ライフなど）を描画
-        self.draw_ui(clock)
+        with profile('draw_ui'):
+            self.draw_ui(clock)
 
-        # ステージクリア時のメッセージ表示
-        if self.stage_manager.stage_clear_timer > 0 and not self.game_clear:
-            draw_text(self.screen, f'STAGE {self.stage_manager.stage} CLEAR', GAME_AREA_WIDTH // 2, screen_height // 2, 75, GREEN)
-        
-        # ゲームクリアの判定と描画
-        self.grand_boss_death()
-        if self.game_clear:
-            draw_text(self.screen, 'GAME CLEAR', GAME_AREA_WIDTH // 2, screen_height //2 ,75 , GREEN)
-            draw_text(self.screen, 'press SPACE KEY to reset', GAME_AREA_WIDTH // 2, screen_height //2 + 100 ,50 , RED)
-
-        # ゲームオーバーの判定と描画、およびリセット処理
-        self.player_death()
-        self.reset()
-
-    def check_item_collision(self):
-        """プレイヤーとアイテムの衝突をチェックし、効果を適用する"""
-        if self.player:
-            # spritecollideは衝突したスプライトのリストを返す。第三引数Trueでアイテムは自動で消える。
-            collided_items = pygame.sprite.spritecollide(self.player, self.item_group, True)
-            for item in collided_items:
+        with profile('draw_hud'):
+            # ステージクリア時のメッセージ表示
+            if self.stage_manager.stage_clear_timer > 0 and not self.game_clear:
+                draw_text(self.screen, f'STAGE {self.stage_manager.stage} CLEAR', GAME_AREA_WIDTH // 2, screen_height // 2, 75, GREEN)
+            
+            # ゲームクリアの描画
+            if self.game_clear:
+                draw_text(self.screen, 'GAME CLEAR', GAME_AREA_WIDTH // 2, screen_height //2 ,75 , GREEN)
+                draw_text(self.screen, 'press SPACE KEY to reset', GAME_AREA_WIDTH // 2, screen_height //2 + 100 ,50 , RED)
+
+            # ゲームオーバーの描画
+            if self.game_over:
+                draw_text(self.screen, 'game over', GAME_AREA_WIDTH // 2, screen_height //2 ,75 , RED)
+                draw_text(self.screen, 'press SPACE KEY to reset', GAME_AREA_WIDTH // 2, screen_height //2 + 100 ,50 , RED)
+
+        # 処理時間のグラフ（F3キーで表示を切り替える）
+        self.profiler_overlay.draw(self.screen, GAME_AREA_WIDTH + 10, 250)
+        # 表示中と、非表示にした直後のフレームはパネルを画面に反映する
+        if self.profiler_overlay.visible or self.overlay_shown:
+            self.dirty_rects.add(self.score_panel.rect)
+        self.overlay_shown = self.profiler_overlay.visible
+
+    def present(self):
+        """描画結果を画面に反映する（DIRTY_RECTS が有効なら描き換えた領域だけ）"""
+        if DIRTY_RECTS:
+            self.dirty_rects.present()
+        else:
+            self.dirty_rects.rects.clear()
+            pygame.display.flip()
+
+    def apply_item_events(self, events):
+        """自機が取得したアイテムの効果を適用する"""
+        for event in events:
+            if event.kind == 'item_player':
+                item = event.source
                 if item.item_type == 'power':
                     if self.player.power_level < self.player.max_power:
                         self.player.power_level += 1
@@ -0,0 +1,60 @@
+from setting import *
+
+class GameClock:
+    """ゲーム内の時間を管理する時計
+
+    シミュレーションは 1/FPS 秒の固定ステップで進め、実時間は描画のたびに advance() で渡す。
+    ポーズ中は時間が進まず、speed を変えると実時間より速く（遅く）進む。
+    各サブシステムは pygame.time.get_ticks() の代わりに get_ticks() でゲーム内の時刻を読む。
+    """
+    def __init__(self, fps=FPS, max_steps=MAX_FRAME_STEPS):
+        self.step_ms = 1000 / fps
+        self.max_steps = max_steps
+        self.frame = 0          # 進めたシミュレーションのステップ数
+        self.time_ms = 0.0      # ゲーム内の経過時間（ミリ秒）
+        self.accumulator = 0.0  # まだシミュレーションに反映していない時間
+        self.paused = False
+        self.speed = 1.0        # 速度倍率
+
+    def advance(self, real_ms):
+        """実時間の経過を受け取り、このフレームで進めるべきステップ数を返す"""
+        if self.paused:
+            return 0
+        self.accumulator += real_ms * self.speed
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # 処理が追いつかない分は切り捨てる
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+    def step(self):
+        """シミュレーションを1ステップ進める"""
+        self.frame += 1
+        self.time_ms += self.step_ms
+
+    @property
+    def alpha(self):
+        """前のステップから次のステップまでの進み具合（描画の補間用、0〜1）"""
+        return min(self.accumulator / self.step_ms, 1.0)
+
+    def get_ticks(self):
+        """ゲーム内の時刻（ミリ秒）"""
+        return int(self.time_ms)
+
+# 現在のゲームが使っている時計（Game が生成時に install() する）
+_current = GameClock()
+
+def install(clock):
+    """各サブシステムが読む時計を切り替える"""
+    global _current
+    _current = clock
+
+def current():
+    return _current
+
+def get_ticks():
+    """現在の時計のゲーム内時刻（ミリ秒）。pygame.time.get_ticks() の代わりに使う"""
+    return _current.get_ticks()
@@ -0,0 +1,38 @@
+import random as _random
+
+class GameRandom(_random.Random):
+    """ゲームが持つ乱数列
+
+    敵の弾・移動・アイテムドロップ、敵の出現位置、ボスのパターン選択など、
+    シミュレーションの乱数は全てこの乱数列から引く（グローバルの random は使わない）。
+    同じシードと同じ入力からは同じプレイが再現される（リプレイの前提）。
+    """
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = _random.getrandbits(32)
+        self.seed_value = seed
+        super().__init__(seed)
+
+# 現在のゲームが使っている乱数列（Game が生成時に install() する）
+_current = GameRandom(0)
+
+def install(rng):
+    """各サブシステムが引く乱数列を切り替える"""
+    global _current
+    _current = rng
+
+def current():
+    return _current
+
+# random モジュールと同じ名前の関数で、現在の乱数列から引く
+def random():
+    return _current.random()
+
+def randint(a, b):
+    return _current.randint(a, b)
+
+def uniform(a, b):
+    return _current.uniform(a, b)
+
+def choice(seq):
+    return _current.choice(seq)
@@ -0,0 +1,146 @@
+"""画面なしでゲームを実時間より速く実行する（ソークテスト・CIでのベンチマーク用）
+
+    python headless.py --frames 20000 --invincible
+    python headless.py --input script --script my_script.json --render
+    python headless.py --stage 2 --wave 8 --boss-health 0.5 --frames 1200 --invincible
+    python headless.py --seed 7 --frames 3000 --record run.replay
+    python headless.py --replay run.replay --render
+    python headless.py --stage 2 --wave 8 --boss-health 0.5 --frames 900 --invincible --save-state enrage.state
+    python headless.py --load-state enrage.state --frames 600 --invincible
+
+SDL のダミービデオドライバで Game を生成し、clock.tick による待機を行わずに
+StageManager のスケジュール（ステージ1 → ステージ2 → 大ボス）を CPU の許す限りの速さで進める。
+--stage / --wave / --time を指定すると、その時点の状態を直接作ってから始める。
+--record で入力をリプレイに記録し、--replay で記録したプレイを同じシード・同じ開始位置から再現する。
+--save-state で実行後の状態をスナップショットに保存し、--load-state でその状態から始める。
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+# pygame を読み込む前にダミードライバを指定する
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from setting import *
+from input_source import RandomInput, ScriptedInput, RecordingInput, ReplayInput
+from replay import Replay, ReplayError, add_replay_arguments, start_recording, save_recording
+
+def create_input(args):
+    """コマンドライン引数から入力元を作る"""
+    if args.input == 'script':
+        with open(args.script, encoding='utf-8') as f:
+            # [[開始フレーム, ["z", "left"]], ...] の形式
+            return ScriptedInput(json.load(f))
+    if args.input == 'idle':
+        # その場で撃ち続けるだけ
+        return ScriptedInput([(0, ['z'])])
+    return RandomInput(args.seed)
+
+def setup_display():
+    """ダミードライバで画面を作る（画像の convert にディスプレイが必要なため）"""
+    pygame.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("shooting game (headless)")
+    return screen
+
+def run(game, frames, render=False, invincible=False, clock=None):
+    """ゲームを最大 frames ステップ進め、結果をまとめた辞書を返す"""
+    clock = clock or pygame.time.Clock()
+    peak_bullets = 0
+    start = time.perf_counter()
+    frame = 0
+    while frame < frames:
+        if invincible and game.player:
+            game.player.health = max(game.player.health, 3)
+        game.update()
+        if render:
+            game.draw(clock)
+        game.profiler.end_frame()
+        # イベントキューが溢れないように読み捨てる
+        pygame.event.pump()
+        frame += 1
+        peak_bullets = max(peak_bullets, len(game.enemy_bullets))
+        if game.game_clear or (game.game_over and not invincible):
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frame,
+        'wall_seconds': round(elapsed, 3),
+        'sim_seconds': round(frame / FPS, 3),
+        'frames_per_second': round(frame / elapsed, 1) if elapsed > 0 else None,
+        'speedup': round(frame / FPS / elapsed, 2) if elapsed > 0 else None,
+        'stage': game.stage_manager.stage,
+        'wave': game.stage_manager.current_wave,
+        'score': game.score,
+        'peak_bullets': peak_bullets,
+        'game_clear': game.game_clear,
+        'game_over': game.game_over,
+        'phases': game.profiler.report(),
+    }
+
+def main(argv=None):
+    from stage_manager import add_seek_arguments, seek_from_args, seek_position
+    parser = argparse.ArgumentParser(description='Run the game headless, faster than real time.')
+    parser.add_argument('--frames', type=int, default=FPS * 60 * 5, help='simulation steps to run at most (default: 5 minutes)')
+    parser.add_argument('--input', choices=['random', 'script', 'idle'], default='random', help='input source driving the player')
+    parser.add_argument('--script', help='JSON input script for --input script: [[frame, ["z", "left"]], ...]')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the game random stream and the random input source')
+    parser.add_argument('--render', action='store_true', help='also draw every frame (to the dummy display)')
+    parser.add_argument('--invincible', action='store_true', help='keep the player alive so the whole schedule runs')
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    parser.add_argument('--save-state', metavar='PATH', help='save a snapshot of the game state after the run')
+    parser.add_argument('--load-state', metavar='PATH', help='start from a snapshot saved with --save-state')
+    add_seek_arguments(parser)
+    add_replay_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input == 'script' and not args.script:
+        parser.error('--input script requires --script')
+    if args.load_state and (args.replay or args.record):
+        parser.error('--load-state cannot be combined with --record or --replay')
+
+    setup_display()
+    from game import Game
+    import snapshot
+    if args.replay:
+        # 記録したシード・開始位置・入力でプレイを再現する
+        try:
+            replay = Replay.load(args.replay)
+        except (OSError, ReplayError) as e:
+            parser.error(f'cannot read replay: {e}')
+        game = Game(input_source=ReplayInput(replay.frames), seed=replay.seed)
+        if replay.seek:
+            game.seek(*replay.seek)
+        result = run(game, min(args.frames, len(replay)), render=args.render, invincible=replay.options.get('invincible', False))
+    else:
+        source = create_input(args)
+        if args.record:
+            source = RecordingInput(source)
+        game = Game(input_source=source, seed=args.seed)
+        seek_from_args(game, args, parser)
+        if args.load_state:
+            try:
+                snapshot.restore_file(game, args.load_state)
+            except (OSError, snapshot.SnapshotError) as e:
+                parser.error(f'cannot load state: {e}')
+        if args.record:
+            start_recording(game, args.hash_interval)
+        result = run(game, args.frames, render=args.render, invincible=args.invincible)
+        if args.record:
+            save_recording(game, args.record, {'seek': seek_position(args), 'invincible': args.invincible})
+    if args.save_state:
+        snapshot.save(game, args.save_state)
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f'{key}: {value}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
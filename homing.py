@@ -0,0 +1,95 @@
+import pygame
+from setting import *
+from bullet import HomingBullet
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければ各ホーミング弾が1発ずつ処理する
+    np = None
+
+# pygame.math.Vector2 の既定の epsilon
+EPSILON = 1e-6
+
+def slerp(dx, dy, tx, ty, t):
+    """pygame.math.Vector2.slerp と同じ計算を配列で行う（長さも線形に補間する）"""
+    length1 = np.hypot(dx, dy)
+    length2 = np.hypot(tx, ty)
+    cos = np.clip((dx * tx + dy * ty) / (length1 * length2), -1.0, 1.0)
+    angle = np.arccos(cos)
+    # 角度がほぼ0のときは 1/sin(angle) が発散するので lerp で近似する（pygame と同じ）
+    small = np.abs(angle) < EPSILON
+    sin_angle = np.where(small, 1.0, np.sin(angle))
+    f0 = ((length2 - length1) * t + length1) / sin_angle
+    f1 = np.sin(angle * (1 - t)) / length1
+    f2 = np.sin(angle * t) / length2
+    x = np.where(small, dx * (1 - t) + tx * t, (dx * f1 + tx * f2) * f0)
+    y = np.where(small, dy * (1 - t) + ty * t, (dy * f1 + ty * f2) * f0)
+    return x, y
+
+class HomingSteering:
+    """全てのホーミング弾の索敵と方向転換を1フレームに1回まとめて計算する
+
+    敵の位置をフレームごとに NumPy 配列に写し、ターゲットを持たない弾の最近傍探索と、
+    ターゲットへ向かう slerp/lerp をそれぞれ一度の配列演算で行う。
+    結果は各弾の direction / target に書き戻し、弾の update() では方向転換を省く。
+    """
+    available = np is not None
+
+    def __init__(self, min_batch=HOMING_BATCH_MIN):
+        self.min_batch = min_batch
+
+    def update(self, bullet_group, enemy_group):
+        bullets = [b for b in bullet_group if isinstance(b, HomingBullet)]
+        # 弾が少ないときは各弾の update() に任せる
+        if not bullets or len(bullets) < self.min_batch:
+            return
+        enemies = enemy_group.sprites()
+        if enemies:
+            centers = np.array([e.rect.center for e in enemies], dtype=np.float64)
+            self.assign_targets(bullets, enemies, centers)
+        self.steer(bullets)
+
+    def assign_targets(self, bullets, enemies, centers):
+        """まだターゲットを見つけていない弾に、最も近い敵をまとめて割り当てる"""
+        searching = [b for b in bullets if not b.has_initial_target]
+        if not searching:
+            return
+        positions = np.array([(b.pos.x, b.pos.y) for b in searching], dtype=np.float64)
+        # 弾 × 敵 の距離の2乗の表から、弾ごとに最小の敵を選ぶ
+        diff = positions[:, None, :] - centers[None, :, :]
+        nearest = np.argmin((diff * diff).sum(axis=2), axis=1)
+        for bullet, index in zip(searching, nearest.tolist()):
+            bullet.target = enemies[index]
+            bullet.has_initial_target = True
+
+    def steer(self, bullets):
+        """ターゲットが生きている弾の向きを、ターゲットの方向へまとめて補間する"""
+        chasing = [b for b in bullets if b.target is not None and b.target.alive]
+        for bullet in bullets:
+            bullet.steered = True
+        if not chasing:
+            return
+        data = np.array([(b.pos.x, b.pos.y, b.direction.x, b.direction.y, b.target.rect.centerx, b.target.rect.centery, b.turn_speed)
+                         for b in chasing], dtype=np.float64)
+        px, py, dx, dy, cx, cy, turn_speed = data.T
+        tx = cx - px
+        ty = cy - py
+        length = np.hypot(tx, ty)
+        # 弾がターゲットの中心に重なっている場合は向きを変えない
+        moving = length > 0
+        length = np.where(moving, length, 1.0)
+        tx /= length
+        ty /= length
+        t = turn_speed * 0.02
+
+        # 2つのベクトルがほぼ180度反対向きの場合、slerpは未定義になるため線形補間(lerp)を使う
+        opposite = dx * tx + dy * ty < -0.99
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sx, sy = slerp(dx, dy, np.where(opposite, 1.0, tx), np.where(opposite, 0.0, ty), t)
+        nx = np.where(opposite, dx * (1 - t) + tx * t, sx)
+        ny = np.where(opposite, dy * (1 - t) + ty * t, sy)
+        nx = np.where(moving, nx, dx)
+        ny = np.where(moving, ny, dy)
+
+        for bullet, x, y in zip(chasing, nx.tolist(), ny.tolist()):
+            bullet.direction = pygame.math.Vector2(x, y)
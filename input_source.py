@@ -0,0 +1,175 @@
+import pygame
+import random
+
+# 1ステップの入力を1バイトに詰めるときの、ビットごとのキー（いずれかが押されていればビットを立てる）
+INPUT_KEYS = (
+    (pygame.K_LEFT,),
+    (pygame.K_RIGHT,),
+    (pygame.K_UP,),
+    (pygame.K_DOWN,),
+    (pygame.K_z,),
+    (pygame.K_x,),
+    (pygame.K_LSHIFT, pygame.K_RSHIFT),
+    (pygame.K_SPACE,),
+)
+
+def pack_keys(key):
+    """get_pressed() の結果を、ゲームが使うキーだけのビット列（0〜255）にする"""
+    bits = 0
+    for bit, codes in enumerate(INPUT_KEYS):
+        if any(key[code] for code in codes):
+            bits |= 1 << bit
+    return bits
+
+def unpack_keys(bits):
+    """pack_keys() のビット列を KeyState に戻す"""
+    return KeyState(codes[0] for bit, codes in enumerate(INPUT_KEYS) if bits >> bit & 1)
+
+class KeyState:
+    """押されているキーの集合を pygame.key.get_pressed() と同じ形（key[pygame.K_z]）で引けるようにする"""
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+class KeyboardInput:
+    """キーボードから入力を読む入力元（通常のプレイ用）
+
+    入力元は Game.update() の先頭で1ステップに1回 poll() され、
+    そのステップ中は Player などが get_pressed() で同じ入力を読む。
+    """
+    def __init__(self):
+        self.state = KeyState()
+
+    def poll(self):
+        self.state = pygame.key.get_pressed()
+
+    def get_pressed(self):
+        return self.state
+
+class ScriptedInput:
+    """(開始フレーム, 押すキーのリスト) の列に従って入力を返す入力元
+
+    キーは pygame のキー定数か 'z', 'left', 'left shift' のようなキー名で指定する。
+    loop が True なら最後まで進んだ後に最初から繰り返す。
+    """
+    def __init__(self, script, loop=True):
+        self.script = sorted((start, KeyState(self.key_code(k) for k in keys)) for start, keys in script)
+        self.loop = loop
+        self.length = self.script[-1][0] + 1 if self.script else 1
+        self.frame = -1
+        self.state = KeyState()
+
+    @staticmethod
+    def key_code(key):
+        return pygame.key.key_code(key) if isinstance(key, str) else key
+
+    def poll(self):
+        self.frame += 1
+        frame = self.frame % self.length if self.loop else self.frame
+        for start, state in self.script:
+            if start > frame:
+                break
+            self.state = state
+
+    def get_pressed(self):
+        return self.state
+
+class RandomInput:
+    """ランダムに動き回りながら弾を撃ち続ける入力元（ソークテスト用）"""
+    MOVE_KEYS = [(), (pygame.K_LEFT,), (pygame.K_RIGHT,), (pygame.K_UP,), (pygame.K_DOWN,),
+                 (pygame.K_LEFT, pygame.K_UP), (pygame.K_RIGHT, pygame.K_UP),
+                 (pygame.K_LEFT, pygame.K_DOWN), (pygame.K_RIGHT, pygame.K_DOWN)]
+
+    def __init__(self, seed=0, hold_frames=(10, 40), fire_rate=0.9, bomb_rate=0.002):
+        self.rng = random.Random(seed)
+        self.hold_frames = hold_frames
+        self.fire_rate = fire_rate
+        self.bomb_rate = bomb_rate
+        self.move = ()
+        self.hold = 0
+        self.state = KeyState()
+
+    def poll(self):
+        # 一定時間ごとに移動方向を変える
+        if self.hold <= 0:
+            self.move = self.rng.choice(self.MOVE_KEYS)
+            self.hold = self.rng.randint(*self.hold_frames)
+        self.hold -= 1
+        keys = list(self.move)
+        if self.rng.random() < self.fire_rate:
+            keys.append(pygame.K_z)
+        if self.rng.random() < self.bomb_rate:
+            keys.append(pygame.K_x)
+        self.state = KeyState(keys)
+
+    def get_pressed(self):
+        return self.state
+
+class RecordingInput:
+    """別の入力元を読みながら、1ステップごとの入力をビット列として記録する入力元
+
+    ゲームには記録したビット列を戻した入力を渡すので、記録に含まれないキーの影響を受けず、
+    ReplayInput で再生したときと同じ入力になる。
+    """
+    def __init__(self, source):
+        self.source = source
+        self.frames = bytearray()
+        self.state = KeyState()
+
+    def poll(self):
+        self.source.poll()
+        bits = pack_keys(self.source.get_pressed())
+        self.frames.append(bits)
+        self.state = unpack_keys(bits)
+
+    def get_pressed(self):
+        return self.state
+
+class ReplayInput:
+    """記録した1ステップごとの入力（RecordingInput.frames）を順に返す入力元
+
+    記録の最後まで進んだ後は何も押されていない入力を返す。
+    """
+    def __init__(self, frames):
+        self.frames = bytes(frames)
+        self.frame = -1
+        self.state = KeyState()
+        # 同じビット列の KeyState は使い回す
+        self.states = {}
+
+    @property
+    def finished(self):
+        return self.frame + 1 >= len(self.frames)
+
+    def poll(self):
+        self.frame += 1
+        bits = self.frames[self.frame] if self.frame < len(self.frames) else 0
+        state = self.states.get(bits)
+        if state is None:
+            state = self.states[bits] = unpack_keys(bits)
+        self.state = state
+
+    def get_pressed(self):
+        return self.state
+
+class ActionInput:
+    """外から1ステップごとに与えた入力（pack_keys() のビット列）を返す入力元（env.GameEnv 用）
+
+    action に次のステップの入力を設定してから Game.update() を呼ぶ。
+    """
+    def __init__(self):
+        self.action = 0
+        self.state = KeyState()
+        # 同じビット列の KeyState は使い回す
+        self.states = {}
+
+    def poll(self):
+        state = self.states.get(self.action)
+        if state is None:
+            state = self.states[self.action] = unpack_keys(self.action)
+        self.state = state
+
+    def get_pressed(self):
+        return self.state
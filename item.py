@@ -1,50 +1,29 @@
 import pygame
 import random
 from setting import *
+import asset_cache
+from pool import PooledSprite
 
-class Item(pygame.sprite.Sprite):
-    def __init__(self, groups, center_pos, item_type='power'):
-        super().__init__(groups)
-        
+# アイテムの種類ごとの画像
+ITEM_IMAGES = {
+    'power': 'assets/img/item/powerup.png',
+    'score': 'assets/img/item/score.png',
+    'bomb': 'assets/img/item/bomb.png',
+}
+
+class Item(PooledSprite):
+    __slots__ = ('item_type', 'image', 'rect', 'speed', 'pos', 'value', 'is_attracted', 'attraction_speed')
+
+    def reset(self, center_pos, item_type='power'):
         self.item_type = item_type
         
-        # アイテムの種類によって画像を変える
-        if self.item_type == 'power':
-            try:
-                # 画像ファイルが存在すればロードする
-                self.image = pygame.image.load('assets/img/item/powerup.png').convert_alpha()
-            except Exception: # pygame.error だけでなく FileNotFoundError なども捕捉
-                # なければ図形で代替
-                self.image = pygame.Surface((24, 24), pygame.SRCALPHA)
-                pygame.draw.circle(self.image, ITEM_POWER_COLOR, (12, 12), 12)
-                pygame.draw.rect(self.image, WHITE, (8, 4, 8, 16)) # 'P'のような形
-        elif self.item_type == 'score':
-            try:
-                self.image = pygame.image.load('assets/img/item/score.png').convert_alpha()
-            except Exception:
-                self.image = pygame.Surface((24, 24), pygame.SRCALPHA)
-                pygame.draw.circle(self.image, ITEM_SCORE_COLOR, (12, 12), 12) # 金色
-                # ドルマーク'$'のような形を描画
-                font = pygame.font.SysFont('arial', 20, bold=True)
-                text = font.render('S', True, BLACK)
-                self.image.blit(text, (self.image.get_width() // 2 - text.get_width() // 2, self.image.get_height() // 2 - text.get_height() // 2))
-        elif self.item_type == 'bomb':
-            try:
-                self.image = pygame.image.load('assets/img/item/bomb.png').convert_alpha()
-            except Exception:
-                self.image = pygame.Surface((24, 24), pygame.SRCALPHA)
-                pygame.draw.circle(self.image, ITEM_BOMB_COLOR, (12, 12), 12) # 水色
-                # 'B'の文字を描画
-                font = pygame.font.SysFont('arial', 20, bold=True)
-                text = font.render('B', True, BLACK)
-                self.image.blit(text, (self.image.get_width() // 2 - text.get_width() // 2, self.image.get_height() // 2 - text.get_height() // 2))
-        else:
-            # 'power' 以外のアイテムタイプの場合のフォールバック
-            self.image = pygame.Surface((24, 24), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, ITEM_DEFAULT_COLOR, (12, 12), 12) # 別の色で表示
-            pygame.draw.rect(self.image, WHITE, (8, 8, 8, 8)) # 'S'のような形
-
-        self.image = pygame.transform.scale(self.image, (24, 24))
+        # アイテムの種類によって画像を変える（共有キャッシュから受け取る）
+        try:
+            # 画像ファイルが存在すればロードする
+            self.image = asset_cache.load_image(ITEM_IMAGES[self.item_type], (24, 24))
+        except (KeyError, pygame.error):
+            # なければ図形で代替（代替画像も一度だけ生成して共有する）
+            self.image = asset_cache.get_surface(('item', self.item_type), lambda: self.create_fallback_image(self.item_type))
         self.rect = self.image.get_rect(center=center_pos)
         self.speed = 2
 
@@ -55,6 +34,31 @@ class Item(pygame.sprite.Sprite):
         self.is_attracted = False
         self.attraction_speed = 12 # 吸い込み速度を8から12に増加
 
+    @staticmethod
+    def create_fallback_image(item_type):
+        """画像がない場合の代替画像を図形で生成する"""
+        image = pygame.Surface((24, 24), pygame.SRCALPHA)
+        if item_type == 'power':
+            pygame.draw.circle(image, ITEM_POWER_COLOR, (12, 12), 12)
+            pygame.draw.rect(image, WHITE, (8, 4, 8, 16)) # 'P'のような形
+        elif item_type == 'score':
+            pygame.draw.circle(image, ITEM_SCORE_COLOR, (12, 12), 12) # 金色
+            # ドルマーク'$'のような形を描画
+            font = asset_cache.get_font(20, 'arial', bold=True, sysfont=True)
+            text = font.render('S', True, BLACK)
+            image.blit(text, (image.get_width() // 2 - text.get_width() // 2, image.get_height() // 2 - text.get_height() // 2))
+        elif item_type == 'bomb':
+            pygame.draw.circle(image, ITEM_BOMB_COLOR, (12, 12), 12) # 水色
+            # 'B'の文字を描画
+            font = asset_cache.get_font(20, 'arial', bold=True, sysfont=True)
+            text = font.render('B', True, BLACK)
+            image.blit(text, (image.get_width() // 2 - text.get_width() // 2, image.get_height() // 2 - text.get_height() // 2))
+        else:
+            # 'power' 以外のアイテムタイプの場合のフォールバック
+            pygame.draw.circle(image, ITEM_DEFAULT_COLOR, (12, 12), 12) # 別の色で表示
+            pygame.draw.rect(image, WHITE, (8, 8, 8, 8)) # 'S'のような形
+        return image
+
     def update(self, player_pos=None):
         # プレイヤーに引き寄せられている場合
         if self.is_attracted and player_pos:
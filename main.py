@@ -1,6 +1,30 @@
+import argparse
 import pygame
 from setting import *
 from game import Game
+from stage_manager import add_seek_arguments, seek_from_args, seek_position
+from input_source import KeyboardInput, RecordingInput, ReplayInput
+import snapshot
+from rewind import RewindBuffer
+from replay import Replay, ReplayError, add_replay_arguments, start_recording, save_recording
+
+# --stage / --wave / --time でステージの途中から始められる（例: python main.py --stage 2 --wave 8）
+# --record でプレイをリプレイに記録し、--replay で再生する（例: python main.py --replay run.replay）
+# --load-state で headless.py --save-state で保存した状態から始める
+parser = argparse.ArgumentParser(description='Shooting game.')
+parser.add_argument('--seed', type=int, help='seed for the game random stream (default: random)')
+parser.add_argument('--load-state', metavar='PATH', help='start from a snapshot saved with headless.py --save-state')
+add_seek_arguments(parser)
+add_replay_arguments(parser)
+args = parser.parse_args()
+if args.load_state and (args.replay or args.record):
+    parser.error('--load-state cannot be combined with --record or --replay')
+replay = None
+if args.replay:
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ReplayError) as e:
+        parser.error(f'cannot read replay: {e}')
 
 pygame.init()
 
@@ -15,16 +39,38 @@ clock = pygame.time.Clock()
 font = pygame.font.Font(None, 30)
 
 #ゲーム
-game = Game()
+if replay:
+    game = Game(input_source=ReplayInput(replay.frames), seed=replay.seed)
+    if replay.seek:
+        game.seek(*replay.seek)
+else:
+    source = RecordingInput(KeyboardInput()) if args.record else KeyboardInput()
+    game = Game(input_source=source, seed=args.seed)
+    seek_from_args(game, args, parser)
+    if args.load_state:
+        try:
+            snapshot.restore_file(game, args.load_state)
+        except (OSError, snapshot.SnapshotError) as e:
+            parser.error(f'cannot load state: {e}')
+    if args.record:
+        start_recording(game, args.hash_interval)
+
+# F5キーで保存した状態（記録・再生中は入力と合わなくなるので使わない）
+quick_state = None
+quick_state_enabled = not (args.record or replay)
+# BACKSPACEキーを押している間は巻き戻す（記録・再生中は使わない）
+if quick_state_enabled:
+    game.rewind = RewindBuffer()
 
 #メインループ##########################################################################################
 run = True
 while run:
-    #背景の塗りつぶし
-    screen.fill(BLACK)
+    #背景の塗りつぶし（DIRTY_RECTS では描き換えた部分だけを反映するので塗りつぶさない）
+    if not DIRTY_RECTS:
+        screen.fill(BLACK)
 
     #ゲームの実行
-    game.run(clock)
+    game.run(clock, rewinding=game.rewind is not None and pygame.key.get_pressed()[pygame.K_BACKSPACE])
 
     #イベントの取得
     for event in pygame.event.get():
@@ -39,10 +85,21 @@ while run:
             # Hキーで当たり判定の表示を切り替える
             if event.key == pygame.K_h and game.player:
                 game.player.toggle_hitbox()
+            # F3キーで処理時間のグラフの表示を切り替える
+            if event.key == pygame.K_F3:
+                game.profiler_overlay.toggle()
+            # F5キーで現在の状態を保存し、F9キーで保存した状態に戻す
+            if event.key == pygame.K_F5 and quick_state_enabled:
+                quick_state = game.snapshot()
+            if event.key == pygame.K_F9 and quick_state is not None:
+                game.restore(quick_state)
     #画面の更新
-    pygame.display.flip()
+    game.present()
     clock.tick(FPS)
 
 ######################################################################################################
 
+if args.record and not replay:
+    save_recording(game, args.record, {'seek': seek_position(args)})
+
 pygame.quit()
@@ -0,0 +1,111 @@
+"""エンティティ1体あたりのメモリ使用量を調べる
+
+    python memory_report.py --bullets 3000
+    python memory_report.py --frames 3000 --json
+
+--bullets: 敵弾を指定数だけ生成し、tracemalloc で1発あたりの確保量を測る（3,000発の画面のコスト）
+--frames:  ゲームを headless で進めた後、生きているエンティティの種類ごとの数と1体あたりのバイト数を出す
+画像（Surface）はキャッシュで共有されているため、1体あたりの量には含めない。
+"""
+import sys
+import json
+import argparse
+import tracemalloc
+
+import headless
+import pygame
+from setting import *
+
+# 1体あたりの量に含める、エンティティが単独で所有するオブジェクトの型
+_OWNED_TYPES = (pygame.math.Vector2, pygame.Rect, list, dict, set, tuple)
+
+def entity_bytes(entity):
+    """エンティティ本体と、単独で所有する小さなオブジェクト（Vector2・Rect・所属グループの集合など）のバイト数"""
+    size = sys.getsizeof(entity)
+    values = []
+    instance_dict = getattr(entity, '__dict__', None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+        values.extend(instance_dict.values())
+    for cls in type(entity).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if hasattr(entity, name):
+                values.append(getattr(entity, name))
+    for value in values:
+        if isinstance(value, _OWNED_TYPES):
+            size += sys.getsizeof(value)
+    return size
+
+def live_entities(game):
+    """ゲーム内で生きているエンティティを種類ごとにまとめる"""
+    groups = [game.player_group, game.enemy_group, game.item_group, game.explosion_group]
+    if game.player:
+        groups += [game.player.bullet_group, game.player.bomb_group]
+    if isinstance(game.enemy_bullets, pygame.sprite.AbstractGroup):
+        groups.append(game.enemy_bullets)
+    by_type = {}
+    for group in groups:
+        for sprite in group:
+            by_type.setdefault(type(sprite).__name__, []).append(sprite)
+    return by_type
+
+def report(game):
+    """種類ごとの数・1体あたりのバイト数・合計バイト数"""
+    result = {}
+    for name, entities in sorted(live_entities(game).items()):
+        total = sum(entity_bytes(e) for e in entities)
+        result[name] = {'count': len(entities), 'bytes_per_entity': total // len(entities), 'total_bytes': total}
+    # NumPy の弾ストアは配列の大きさで数える
+    field = game.enemy_bullets
+    if not isinstance(field, pygame.sprite.AbstractGroup) and len(field) > 0:
+        arrays = ('x', 'y', 'dx', 'dy', 'speed', 'radius', 'frozen', 'type_id')
+        per_bullet = sum(getattr(field, a).itemsize for a in arrays)
+        result['BulletField'] = {'count': len(field), 'bytes_per_entity': per_bullet, 'total_bytes': per_bullet * field.capacity}
+    return result
+
+def measure_bullets(count):
+    """敵弾を count 発生成したときの、1発あたりの確保量（tracemalloc）"""
+    from game import Game
+    game = Game()
+    game.stage_manager.spawn_active = False
+    bullets = game.enemy_bullets
+    # 画像などのキャッシュを先に作っておく
+    bullets.spawn(100, 100, game.player_group, direction=(1, 1))
+    bullets.empty()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        bullets.spawn(i % GAME_AREA_WIDTH, (i * 7) % screen_height, game.player_group, speed=2, direction=(i % 5 - 2, 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'count': count, 'bytes_per_bullet': (after - before) // count, 'total_bytes': after - before, 'engine': type(bullets).__name__}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report memory cost per live entity type.')
+    parser.add_argument('--bullets', type=int, default=3000, help='enemy bullets to spawn for the allocation measurement')
+    parser.add_argument('--frames', type=int, default=0, help='also play this many headless frames and report the live entities')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    headless.setup_display()
+    result = {'spawn': measure_bullets(args.bullets)}
+    if args.frames:
+        from game import Game
+        from input_source import RandomInput
+        game = Game(input_source=RandomInput(args.seed))
+        headless.run(game, args.frames, invincible=True)
+        result['live'] = report(game)
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        spawn = result['spawn']
+        print(f"{spawn['count']} {spawn['engine']} bullets: {spawn['bytes_per_bullet']} bytes/bullet, {spawn['total_bytes'] / 1024:.1f} KiB total")
+        for name, row in result.get('live', {}).items():
+            print(f"{name:14s} count {row['count']:5d}  {row['bytes_per_entity']:6d} bytes/entity  {row['total_bytes'] / 1024:8.1f} KiB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
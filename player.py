@@ -1,17 +1,23 @@
 import pygame
 from setting import *
+import game_clock
 from bullet import Bullet, HomingBullet
-from boss import BossEnemy
 from bomb import MasterSpark
+from spatial_hash import SpatialGroup
+from input_source import KeyboardInput
+import asset_cache
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, groups, x, y, enemy_group, enemy_bullets_group=None, item_group=None):
+    def __init__(self, groups, x, y, enemy_group, enemy_bullets_group=None, item_group=None, input_source=None):
         super().__init__(groups)
 
         self.screen = pygame.display.get_surface()
 
+        # 入力元（省略時はキーボード。ヘッドレス実行ではスクリプトやランダム入力を渡す）
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+
         #グループ
-        self.bullet_group = pygame.sprite.Group()
+        self.bullet_group = SpatialGroup()
         self.bomb_group = pygame.sprite.GroupSingle()
         self.item_group = item_group
         self.enemy_group = enemy_group
@@ -19,10 +25,8 @@ class Player(pygame.sprite.Sprite):
         self.enemy_bullets = enemy_bullets_group
 
         #画像
-        self.image_list = []
-        for i in range(3):
-            image = pygame.image.load(f'assets/img/player/{i}.png').convert_alpha()
-            self.image_list.append(pygame.transform.scale(image, (50, 50)))
+        # 点滅処理で透明度を書き換えるため、共有画像を複製して使う
+        self.image_list = [asset_cache.load_image(f'assets/img/player/{i}.png', (50, 50)).copy() for i in range(3)]
         self.index = 0
         self.image = self.image_list[self.index]
        # 当たり判定用の円の半径
@@ -68,7 +72,7 @@ class Player(pygame.sprite.Sprite):
         self.original_image = self.image.copy() # 点滅用に元の画像を保持
 
     def input(self):
-        key = pygame.key.get_pressed()
+        key = self.input_source.get_pressed()
         
         # 左シフトまたは右シフトで低速移動
         self.slow = key[pygame.K_LSHIFT] or key[pygame.K_RSHIFT]
@@ -100,27 +104,27 @@ class Player(pygame.sprite.Sprite):
             # パワーレベルに応じて弾を発射
             if self.power_level == 1:
                 # レベル1: 中央に1発
-                Bullet(self.bullet_group, self.rect.centerx, self.rect.top)
+                Bullet.spawn(self.bullet_group, self.rect.centerx, self.rect.top)
             elif self.power_level == 2:
                 # レベル2: 少し開いた2発
-                Bullet(self.bullet_group, self.rect.centerx - 10, self.rect.centery)
-                Bullet(self.bullet_group, self.rect.centerx + 10, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx - 10, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx + 10, self.rect.centery)
             elif self.power_level == 3:
                 # レベル3: 3-way弾
-                Bullet(self.bullet_group, self.rect.centerx, self.rect.top)
-                Bullet(self.bullet_group, self.rect.centerx - 20, self.rect.centery)
-                Bullet(self.bullet_group, self.rect.centerx + 20, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx, self.rect.top)
+                Bullet.spawn(self.bullet_group, self.rect.centerx - 20, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx + 20, self.rect.centery)
             elif self.power_level == 4:
                 # レベル4: 前方2連射 + 広めの2-way弾
-                Bullet(self.bullet_group, self.rect.centerx - 8, self.rect.top)
-                Bullet(self.bullet_group, self.rect.centerx + 8, self.rect.top)
-                Bullet(self.bullet_group, self.rect.centerx - 25, self.rect.centery)
-                Bullet(self.bullet_group, self.rect.centerx + 25, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx - 8, self.rect.top)
+                Bullet.spawn(self.bullet_group, self.rect.centerx + 8, self.rect.top)
+                Bullet.spawn(self.bullet_group, self.rect.centerx - 25, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx + 25, self.rect.centery)
             elif self.power_level >= 5:
                 # レベル5: 前方3-way弾 + 両サイドからホーミング弾
-                Bullet(self.bullet_group, self.rect.centerx, self.rect.top)
-                Bullet(self.bullet_group, self.rect.centerx - 20, self.rect.centery)
-                Bullet(self.bullet_group, self.rect.centerx + 20, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx, self.rect.top)
+                Bullet.spawn(self.bullet_group, self.rect.centerx - 20, self.rect.centery)
+                Bullet.spawn(self.bullet_group, self.rect.centerx + 20, self.rect.centery)
 
             self.fire = True
 
@@ -153,13 +157,13 @@ class Player(pygame.sprite.Sprite):
 
     def fire_homing_bullets(self):
         """ホーミング弾を専用のクールダウンで発射する"""
-        key = pygame.key.get_pressed()
+        key = self.input_source.get_pressed()
         # パワーレベルが5以上で、Zキーが押されている場合
         if self.power_level >= 5 and key[pygame.K_z]:
             # ホーミング弾のクールダウンが終わっていれば発射
             if self.homing_timer == 0:
-                HomingBullet(self.bullet_group, self.rect.left, self.rect.centery, self.enemy_group)
-                HomingBullet(self.bullet_group, self.rect.right, self.rect.centery, self.enemy_group)
+                HomingBullet.spawn(self.bullet_group, self.rect.left, self.rect.centery, self.enemy_group)
+                HomingBullet.spawn(self.bullet_group, self.rect.right, self.rect.centery, self.enemy_group)
                 self.homing_timer = self.homing_cooldown # タイマーをリセット
 
         if self.homing_timer > 0:
@@ -190,42 +194,13 @@ class Player(pygame.sprite.Sprite):
             if self.rect.bottom > screen_height:
                 self.rect.bottom = screen_height
 
-    def collision_enemy(self):
-        # 当たり判定を行う範囲を自機周辺に限定するための矩形を定義
-        check_area_size = 250  # 自機を中心とした250x250の範囲
-        check_rect = pygame.Rect(0, 0, check_area_size, check_area_size)
-        check_rect.center = self.rect.center
-
-        #敵本体との当たり判定
-        if not self.invincible and not self.bomb_active:
-            # check_rectと衝突する可能性のある敵のみをリストアップ
-            nearby_enemies = [e for e in self.enemy_group if e.rect.colliderect(check_rect)]
-            for enemy in nearby_enemies: # 敵本体との当たり判定
-                if self.rect.colliderect(enemy.rect):
-                    # ボス以外の敵と衝突した場合
-                    if not isinstance(enemy, BossEnemy):
-                        self.take_damage()
-                        enemy.kill() # 敵を消滅させる
-                        break # 複数の敵と同時に当たらないようにループを抜ける
-            
-            # 共有の敵弾グループとの円形当たり判定
-            if self.enemy_bullets is not None:
-                # 同様に、check_rectと衝突する可能性のある敵弾のみをリストアップ
-                nearby_bullets = [b for b in self.enemy_bullets if b.rect.colliderect(check_rect)] # 敵弾との当たり判定
-                for bullet in nearby_bullets:
-                    bullet_pos = pygame.math.Vector2(bullet.rect.center)
-                    if self.pos.distance_to(bullet_pos) < self.radius + getattr(bullet, 'radius', 4):
-                        self.take_damage()
-                        bullet.kill()
-                        break # 複数の弾と同時に当たらないようにループを抜ける
-
     def take_damage(self, damage_amount=1):
         """ダメージを受けて無敵状態を開始する"""
         self.health -= damage_amount
         # パワーレベルを1に戻す
         self.power_level = 1
         self.invincible = True
-        self.invincible_timer = pygame.time.get_ticks()
+        self.invincible_timer = game_clock.get_ticks()
         if self.health <= 0:
             self.alive = False
 
@@ -246,7 +221,7 @@ class Player(pygame.sprite.Sprite):
     def update_invincibility(self):
         """無敵状態の更新と点滅処理"""
         if self.invincible:
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             # 無敵時間が終了したら
             if now - self.invincible_timer > self.invincible_duration:
                 self.invincible = False
@@ -264,7 +239,6 @@ class Player(pygame.sprite.Sprite):
         self.cooldown_bullet()
         self.cooldown_bomb()
         self.fire_homing_bullets()
-        self.collision_enemy() # 敵との衝突判定は残す
         self.attract_items()
         self.update_invincibility()
         self.check_death()
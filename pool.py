@@ -0,0 +1,128 @@
+from abc import ABCMeta, abstractmethod
+import pygame
+from setting import *
+
+class SpritePool:
+    """1つのスプライトクラスの使い終わったインスタンスを保持し、再初期化して使い回す
+
+    spawn() は空きがあれば reset() で初期化し直して返し、なければ新しく生成する。
+    kill() されたスプライトは release() で戻され、cap を超えた分は捨てる（GCに任せる）。
+    """
+    def __init__(self, cls, cap=POOL_CAP):
+        self.cls = cls
+        self.cap = cap
+        self.free = []
+        self.stats = {'hits': 0, 'misses': 0, 'released': 0, 'discarded': 0, 'in_use': 0, 'high_water': 0}
+
+    def spawn(self, groups, *args, **kwargs):
+        stats = self.stats
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            sprite.reset(*args, **kwargs)
+            sprite.add(groups)
+            stats['hits'] += 1
+        else:
+            sprite = self.cls(groups, *args, **kwargs)
+            sprite.pool = self
+            stats['misses'] += 1
+        stats['in_use'] += 1
+        if stats['in_use'] > stats['high_water']:
+            stats['high_water'] = stats['in_use']
+        return sprite
+
+    def release(self, sprite):
+        stats = self.stats
+        stats['released'] += 1
+        stats['in_use'] -= 1
+        sprite.pooled = True
+        if len(self.free) < self.cap:
+            self.free.append(sprite)
+        else:
+            stats['discarded'] += 1
+
+# クラス -> SpritePool
+pools = {}
+
+def get_pool(cls):
+    pool = pools.get(cls)
+    if pool is None:
+        pool = pools[cls] = SpritePool(cls, POOL_CAPS.get(cls.__name__, POOL_CAP))
+    return pool
+
+def pool_stats():
+    """クラス名ごとのプールの統計（ヒット数・ミス数・使用中の数・使用中の最大数など）"""
+    return {cls.__name__: dict(pool.stats, free=len(pool.free)) for cls, pool in pools.items()}
+
+def release_all(group):
+    """グループ内の全スプライトを kill() してプールに戻す（group.empty() の代わり）"""
+    for sprite in group.sprites():
+        sprite.kill()
+
+class PooledSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
+    """プールで使い回すスプライトの基底クラス
+
+    サブクラスは __init__ ではなく reset() で状態を初期化する（再利用時も reset() が呼ばれる）。
+    reset() は抽象メソッドなので、定義し忘れたサブクラスは生成した時点で TypeError になる。
+    生成は Class.spawn(groups, ...) で行い、kill() するとプールに戻る。
+
+    pygame の Sprite には __slots__ がないため __dict__ 自体は残るが、属性はすべて __slots__ に宣言して
+    __dict__ を使わない。所属グループも Sprite の set（1体あたり200バイト強）ではなくタプルで持つ。
+    """
+    __slots__ = ('_groups', 'pool', 'pooled')
+
+    def __init__(self, groups, *args, **kwargs):
+        # Sprite.__init__ は所属グループの set を作るので呼ばない
+        self._groups = ()
+        self.pool = None    # 生成元のプール（spawn() で生成したものだけに設定される）
+        self.pooled = False # プールに戻されているか
+        self.add(groups)
+        self.reset(*args, **kwargs)
+
+    @abstractmethod
+    def reset(self, *args, **kwargs):
+        """spawn() の引数で状態を初期化する"""
+
+    @classmethod
+    def spawn(cls, groups, *args, **kwargs):
+        """プールから取り出して（なければ生成して）groups に追加する"""
+        return get_pool(cls).spawn(groups, *args, **kwargs)
+
+    # 所属グループの管理（pygame.sprite.Sprite と同じ振る舞い）
+    def add(self, *groups):
+        for group in groups:
+            if hasattr(group, '_spritegroup'):
+                if group not in self._groups:
+                    group.add_internal(self)
+                    self.add_internal(group)
+            else:
+                self.add(*group)
+
+    def remove(self, *groups):
+        for group in groups:
+            if hasattr(group, '_spritegroup'):
+                if group in self._groups:
+                    group.remove_internal(self)
+                    self.remove_internal(group)
+            else:
+                self.remove(*group)
+
+    def add_internal(self, group):
+        self._groups += (group,)
+
+    def remove_internal(self, group):
+        self._groups = tuple(g for g in self._groups if g is not group)
+
+    def groups(self):
+        return list(self._groups)
+
+    def alive(self):
+        return bool(self._groups)
+
+    def kill(self):
+        for group in self._groups:
+            group.remove_internal(self)
+        self._groups = ()
+        # spawn() で生成されたものだけを戻す（二重に kill() されても一度だけ）
+        if self.pool is not None and not self.pooled:
+            self.pool.release(self)
@@ -0,0 +1,189 @@
+import time
+import pygame
+from setting import *
+import asset_cache
+
+# オーバーレイで各処理に使う色（登録順に割り当てる）
+PHASE_COLORS = [
+    (230, 80, 80), (240, 160, 60), (230, 220, 70), (120, 210, 90), (70, 200, 200),
+    (80, 140, 240), (160, 100, 240), (230, 110, 200), (180, 180, 180), (140, 90, 60),
+    (90, 160, 120), (200, 200, 255), (255, 200, 160), (120, 120, 200), (255, 255, 255),
+    (200, 60, 120), (60, 120, 90), (255, 140, 0),
+]
+
+class _Section:
+    """with 文で処理時間を計測し、プロファイラに加算する"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+class FrameProfiler:
+    """Game の処理ごとの時間を計測し、直近 history フレーム分をリングバッファに保持する
+
+        with profiler.section('collision'):
+            ...
+        profiler.end_frame()
+
+    1回の描画の間に複数ステップ更新した場合は、そのフレームの時間として合算する。
+    """
+    def __init__(self, history=PROFILER_HISTORY, budget_ms=FRAME_BUDGET_MS):
+        self.history = history
+        self.budget_ms = budget_ms
+        self.phases = []      # 計測した処理の名前（登録順）
+        self.samples = {}     # 処理名 -> 長さ history のリスト（ミリ秒）
+        self.totals = [0.0] * history
+        self.frames = 0       # これまでに確定したフレーム数
+        self.current = {}     # 計測中のフレームの処理ごとの合計時間（秒）
+        self._sections = {}
+
+    def section(self, name):
+        """name の処理時間を計測する with 文用のオブジェクトを返す"""
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def add(self, name, seconds):
+        """計測中のフレームに処理時間を加算する"""
+        if name not in self.samples:
+            self.phases.append(name)
+            self.samples[name] = [0.0] * self.history
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        """計測中のフレームを確定してリングバッファに書き込む"""
+        index = self.frames % self.history
+        total = 0.0
+        for name in self.phases:
+            ms = self.current.get(name, 0.0) * 1000
+            self.samples[name][index] = ms
+            total += ms
+        self.totals[index] = total
+        self.current.clear()
+        self.frames += 1
+
+    def count(self):
+        """リングバッファに入っている有効なフレーム数"""
+        return min(self.frames, self.history)
+
+    def last(self, name=None):
+        """直前のフレームの時間（name 省略時は全処理の合計）"""
+        if self.frames == 0:
+            return 0.0
+        index = (self.frames - 1) % self.history
+        values = self.totals if name is None else self.samples.get(name)
+        return values[index] if values else 0.0
+
+    def average(self, name=None):
+        """直近のフレームの平均時間（ミリ秒）"""
+        n = self.count()
+        values = self.totals if name is None else self.samples.get(name)
+        if n == 0 or not values:
+            return 0.0
+        return sum(values[:n]) / n
+
+    def peak(self, name=None):
+        """直近のフレームの最大時間（ミリ秒）"""
+        n = self.count()
+        values = self.totals if name is None else self.samples.get(name)
+        if n == 0 or not values:
+            return 0.0
+        return max(values[:n])
+
+    def over_budget(self):
+        """直前のフレームで予算を超えたか、超えた場合はどの処理が最も時間を使ったか"""
+        if self.last() <= self.budget_ms:
+            return None
+        return max(self.phases, key=self.last)
+
+    def report(self):
+        """処理ごとの平均・最大時間の辞書（headless や benchmark の出力用）"""
+        return {name: {'avg_ms': round(self.average(name), 4), 'max_ms': round(self.peak(name), 4)} for name in self.phases}
+
+    def color(self, name):
+        return PHASE_COLORS[self.phases.index(name) % len(PHASE_COLORS)]
+
+class ProfilerOverlay:
+    """スコアパネルにフレームごとの処理時間の積み上げ棒グラフを表示する
+
+    グラフは Surface に保持して毎フレーム1pxずつスクロールさせ、新しい1列だけを描く。
+    凡例の文字は一定間隔でのみ描き直す。
+    """
+    GRAPH_HEIGHT = 120
+    LEGEND_INTERVAL = 15 # 凡例を描き直す間隔（フレーム）
+
+    def __init__(self, profiler, width=SCORE_PANEL_WIDTH - 20):
+        self.profiler = profiler
+        self.visible = False
+        self.width = width
+        self.graph = pygame.Surface((width, self.GRAPH_HEIGHT))
+        self.graph.fill(BLACK)
+        # 予算（1フレームの時間）がグラフの高さの半分になるようにする
+        self.scale = self.GRAPH_HEIGHT / 2 / profiler.budget_ms
+        self.font = asset_cache.get_font(18)
+        self.legend = None
+        self.drawn_frames = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def update_graph(self):
+        """確定済みで未描画のフレームをグラフに追加する"""
+        profiler = self.profiler
+        new_frames = min(profiler.frames - self.drawn_frames, self.width)
+        for frame in range(profiler.frames - new_frames, profiler.frames):
+            index = frame % profiler.history
+            self.graph.scroll(-1, 0)
+            x = self.width - 1
+            pygame.draw.line(self.graph, BLACK, (x, 0), (x, self.GRAPH_HEIGHT))
+            bottom = self.GRAPH_HEIGHT
+            for name in profiler.phases:
+                height = profiler.samples[name][index] * self.scale
+                if height <= 0:
+                    continue
+                top = bottom - height
+                pygame.draw.line(self.graph, profiler.color(name), (x, max(0, int(top))), (x, int(bottom)))
+                bottom = top
+                if bottom <= 0:
+                    break
+        self.drawn_frames = profiler.frames
+
+    def render_legend(self):
+        """処理名と平均時間の一覧を描く（時間のかかっている順）"""
+        profiler = self.profiler
+        phases = sorted(profiler.phases, key=profiler.average, reverse=True)
+        line_height = self.font.get_linesize()
+        legend = pygame.Surface((self.width, line_height * (len(phases) + 1)))
+        legend.fill(BLACK)
+        total = profiler.average()
+        header = self.font.render(f"frame {total:5.2f}ms  max {profiler.peak():5.2f}", True, WHITE)
+        legend.blit(header, (0, 0))
+        for i, name in enumerate(phases):
+            y = line_height * (i + 1)
+            pygame.draw.rect(legend, profiler.color(name), (0, y + 3, 8, 8))
+            text = self.font.render(f"{name:<12s} {profiler.average(name):5.2f} / {profiler.peak(name):5.2f}", True, WHITE)
+            legend.blit(text, (12, y))
+        return legend
+
+    def draw(self, surface, x, y):
+        if not self.visible:
+            return
+        self.update_graph()
+        surface.blit(self.graph, (x, y))
+        # 予算（16.6ms）の位置に線を引く
+        budget_y = y + self.GRAPH_HEIGHT - int(self.profiler.budget_ms * self.scale)
+        pygame.draw.line(surface, RED, (x, budget_y), (x + self.width - 1, budget_y))
+        if self.legend is None or self.profiler.frames % self.LEGEND_INTERVAL == 0:
+            self.legend = self.render_legend()
+        surface.blit(self.legend, (x, y + self.GRAPH_HEIGHT + 4))
@@ -0,0 +1,114 @@
+"""プレイの記録（リプレイ）ファイルの読み書き
+
+リプレイはゲームの乱数のシードと、1ステップごとの入力（input_source.pack_keys() の1バイト）の列で、
+同じシード・同じ開始位置から同じ入力を与えればプレイがそのまま再現される。
+記録時の状態のハッシュ（state_hash）も一定間隔で保存し、再生時の食い違いを検出できる。
+
+ファイルの形式（リトルエンディアン）:
+  ヘッダ   magic 'SGRP', version(u16), seed(u64), ステップ数(u32), 設定の長さ(u32), 入力の長さ(u32),
+           ハッシュの間隔(u32), ハッシュのチェックポイント数(u32), グループ数(u32)  ※ 最後の3つは version 2 から
+  設定     開始位置（seek の引数）や無敵の指定、ハッシュのグループ名などの JSON（UTF-8）
+  入力     1ステップ1バイトの入力を zlib で圧縮したもの
+  ハッシュ チェックポイントごとに、グループ数個の u64
+"""
+import json
+import zlib
+import struct
+from setting import *
+from state_hash import GROUPS, StateHasher
+
+MAGIC = b'SGRP'
+VERSION = 2
+_HEADERS = {
+    1: struct.Struct('<4sHQIII'),
+    2: struct.Struct('<4sHQIIIIII'),
+}
+_PREFIX = struct.Struct('<4sH')
+
+class ReplayError(ValueError):
+    """リプレイファイルとして読めない"""
+
+class Replay:
+    """シード・開始位置の設定・1ステップごとの入力・状態のハッシュの組"""
+    def __init__(self, seed, frames=b'', options=None, hashes=(), hash_interval=0):
+        self.seed = seed
+        self.frames = bytes(frames)
+        # seek: [stage, wave, time(ms), boss_health] か None, invincible: 自機の体力を保つか,
+        # hash_groups: ハッシュのグループ名（state_hash.GROUPS）
+        self.options = dict(options or {})
+        # hash_interval フレームごとの、グループごとのダイジェストのタプルの列
+        self.hashes = [tuple(h) for h in hashes]
+        self.hash_interval = hash_interval
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def seek(self):
+        return self.options.get('seek')
+
+    @property
+    def hash_groups(self):
+        return tuple(self.options.get('hash_groups', ()))
+
+    def to_bytes(self):
+        options = json.dumps(self.options, separators=(',', ':')).encode('utf-8')
+        inputs = zlib.compress(self.frames, 9)
+        groups = len(self.hashes[0]) if self.hashes else 0
+        values = [value for digests in self.hashes for value in digests]
+        header = _HEADERS[VERSION].pack(MAGIC, VERSION, self.seed, len(self.frames), len(options), len(inputs),
+                                        self.hash_interval, len(self.hashes), groups)
+        return header + options + inputs + struct.pack(f'<{len(values)}Q', *values)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _PREFIX.size:
+            raise ReplayError('replay file is too short')
+        magic, version = _PREFIX.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError('not a replay file')
+        header = _HEADERS.get(version)
+        if header is None:
+            raise ReplayError(f'unsupported replay version {version}')
+        if len(data) < header.size:
+            raise ReplayError('replay file is too short')
+        fields = header.unpack_from(data)
+        seed, count, options_size, inputs_size = fields[2:6]
+        hash_interval, checkpoints, groups = fields[6:] if version >= 2 else (0, 0, 0)
+        offset = header.size
+        options = json.loads(data[offset:offset + options_size].decode('utf-8'))
+        offset += options_size
+        try:
+            frames = zlib.decompress(data[offset:offset + inputs_size])
+            values = struct.unpack_from(f'<{checkpoints * groups}Q', data, offset + inputs_size)
+        except (zlib.error, struct.error) as e:
+            raise ReplayError(f'replay file is corrupt: {e}') from e
+        if len(frames) != count:
+            raise ReplayError(f'replay has {len(frames)} frames, header says {count}')
+        hashes = [values[i:i + groups] for i in range(0, len(values), groups)] if groups else []
+        return cls(seed, frames, options, hashes, hash_interval)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+def add_replay_arguments(parser):
+    """リプレイの記録・再生のコマンドライン引数を追加する"""
+    parser.add_argument('--record', metavar='PATH', help='record the inputs of this run to a replay file')
+    parser.add_argument('--replay', metavar='PATH', help='play back a replay file (overrides --seed and the start position)')
+    parser.add_argument('--hash-interval', type=int, default=STATE_HASH_INTERVAL, help='frames between state hashes saved with --record')
+
+def start_recording(game, interval=STATE_HASH_INTERVAL):
+    """入力元が RecordingInput のゲームで、状態のハッシュの記録を始める"""
+    game.state_hasher = StateHasher(interval)
+
+def save_recording(game, path, options):
+    """start_recording() してから記録した入力と状態のハッシュをリプレイファイルに保存する"""
+    hasher = game.state_hasher
+    options = dict(options, hash_groups=list(GROUPS))
+    Replay(game.seed, game.input_source.frames, options, hasher.digests, hasher.interval).save(path)
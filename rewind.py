@@ -0,0 +1,210 @@
+"""巻き戻し（直近のシミュレーションの状態を毎ステップ記録し、1ステップずつ戻す）
+
+毎ステップ snapshot.capture_state() の状態を区分（clock・rng・player・enemy_bullets など）ごとに
+marshal したバイト列にし、1つ前のステップとの差分だけを zlib で詰めて、最初に確保した固定長の
+バッファ（リングバッファ）に書き込む。区分ごとの差分は次のどれか:
+  変化なし → 何も保存しない、長さが同じ → 1つ前との XOR（変わらない配列は 0 になりよく縮む）、それ以外 → そのまま
+REWIND_KEYFRAME_INTERVAL ステップごとに全区分をそのまま保存するキーフレームを置くので、
+任意のステップの状態はキーフレームから高々その間隔分の差分を適用すれば求まる。
+
+バッファが一杯になるか REWIND_SECONDS 秒を超えると、古い方からキーフレーム単位で捨てる。
+メモリの使用量は REWIND_MAX_BYTES で固定され、記録が長くなっても増えない。
+
+  game.rewind = RewindBuffer()   # update() の最後に push() される
+  game.step_back()               # 1ステップ前の状態に戻す（main.py では BACKSPACE を押している間）
+"""
+import zlib
+import marshal
+from collections import deque
+from itertools import islice
+from setting import *
+import snapshot
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければ XOR は整数演算で行う
+    np = None
+
+# 区分ごとの保存の仕方
+SAME, FULL, XOR = 0, 1, 2
+
+def _xor(a, b):
+    """同じ長さのバイト列の XOR"""
+    if np is not None:
+        return (np.frombuffer(a, np.uint8) ^ np.frombuffer(b, np.uint8)).tobytes()
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+class RewindBuffer:
+    """直近 seconds 秒の状態を max_bytes 以内に保持するリングバッファ"""
+    def __init__(self, seconds=REWIND_SECONDS, max_bytes=REWIND_MAX_BYTES, keyframe_interval=REWIND_KEYFRAME_INTERVAL):
+        self.max_frames = int(seconds * FPS)
+        self.keyframe_interval = keyframe_interval
+        self.memory = bytearray(max_bytes)
+        # 記録したステップ（古い順）: (バッファ上の位置, 長さ, キーフレームかどうか)
+        self.entries = deque()
+        self.names = None        # 区分の名前（capture_state() の辞書のキーの順）
+        self._prev = None        # 最新のステップの区分ごとのバイト列
+        self._since_key = 0      # 最新のステップが直前のキーフレームから何ステップ目か
+        # 巻き戻し中に展開した、最新のステップを含む区間（キーフレームから最新のステップまで）の区分のバイト列
+        self._segment = None
+        self._segment_start = 0
+        self._prefetch = None    # その1つ前の区間の先読み: (キーフレームの番号, 展開済みのリスト, 残りのイテレータ)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def used_bytes(self):
+        return sum(length for _, length, _ in self.entries)
+
+    @property
+    def seconds(self):
+        """巻き戻せる時間（秒）"""
+        return max(len(self.entries) - 1, 0) / FPS
+
+    def clear(self):
+        self.entries.clear()
+        self._prev = None
+        self._segment = None
+        self._prefetch = None
+
+    # 記録 ###########################################################################################
+
+    def push(self, game):
+        """game の現在の状態を最新のステップとして記録する"""
+        state = snapshot.capture_state(game)
+        if self.names is None:
+            self.names = tuple(state)
+        sections = tuple(marshal.dumps(state[name]) for name in self.names)
+        self._segment = None
+        self._prefetch = None
+
+        keyframe = not self.entries or self._since_key + 1 >= self.keyframe_interval
+        blob = self._encode(sections, keyframe)
+        offset = self._allocate(len(blob))
+        if not keyframe and not self.entries:
+            # 領域を空けるために差分の元のキーフレームごと捨てたので、キーフレームとして書き直す
+            keyframe = True
+            blob = self._encode(sections, keyframe)
+            offset = self._allocate(len(blob))
+        if offset is None:
+            # 1ステップ分がバッファに収まらない
+            self.clear()
+            return
+        self.memory[offset:offset + len(blob)] = blob
+        self.entries.append((offset, len(blob), keyframe))
+        self._prev = sections
+        self._since_key = 0 if keyframe else self._since_key + 1
+        while len(self.entries) > self.max_frames:
+            self._drop_oldest_segment()
+
+    def _encode(self, sections, keyframe):
+        if keyframe:
+            record = [(FULL, raw) for raw in sections]
+        else:
+            record = []
+            for raw, prev in zip(sections, self._prev):
+                if raw == prev:
+                    record.append((SAME, b''))
+                elif len(raw) == len(prev):
+                    record.append((XOR, _xor(raw, prev)))
+                else:
+                    record.append((FULL, raw))
+        return zlib.compress(marshal.dumps(record), 1)
+
+    def _allocate(self, size):
+        """size バイトを書き込む位置を決め、重なる古いステップを捨てる（収まらなければ None）"""
+        capacity = len(self.memory)
+        if size > capacity:
+            return None
+        if self.entries:
+            offset, length, _ = self.entries[-1]
+            head = offset + length
+            if head + size > capacity:
+                head = 0
+        else:
+            head = 0
+        # 折り返すときに末尾の隙間を飛ばすので、重なるステップが古い順の先頭に並んでいるとは限らない。
+        # 重なるもののうち最も新しいステップまで、古い方からキーフレーム単位で捨てる
+        last = -1
+        for index, (offset, length, _) in enumerate(self.entries):
+            if offset < head + size and head < offset + length:
+                last = index
+        while last >= 0 and self.entries:
+            count = len(self.entries)
+            self._drop_oldest_segment()
+            last -= count - len(self.entries)
+        return head
+
+    def _drop_oldest_segment(self):
+        """最も古いキーフレームと、それに続く差分を捨てる"""
+        self.entries.popleft()
+        while self.entries and not self.entries[0][2]:
+            self.entries.popleft()
+
+    # 巻き戻し #######################################################################################
+
+    def step_back(self, steps=1):
+        """最新の steps ステップを捨て、その前のステップの状態（restore() に渡す辞書）を返す
+
+        それ以上戻れないときは None を返す（記録は変えない）。
+        """
+        if len(self.entries) <= 1:
+            return None
+        steps = min(steps, len(self.entries) - 1)
+        for _ in range(steps):
+            self.entries.pop()
+        newest = len(self.entries) - 1
+        if self._segment is None or newest < self._segment_start:
+            self._segment_start = self._keyframe_before(newest)
+            self._segment = self._take_prefetch(self._segment_start)
+        del self._segment[newest - self._segment_start + 1:]
+        # 次に必要になる1つ前の区間を戻るたびに少しずつ展開しておき、区間の境目で止まらないようにする
+        self._advance_prefetch(REWIND_PREFETCH_STEPS * steps)
+
+        self._prev = self._segment[-1]
+        self._since_key = newest - self._segment_start
+        return {name: marshal.loads(raw) for name, raw in zip(self.names, self._prev)}
+
+    def _keyframe_before(self, index):
+        while not self.entries[index][2]:
+            index -= 1
+        return index
+
+    def _take_prefetch(self, start):
+        """start から始まる区間を展開したリストを返す（先読みしてあればその続きから）"""
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch is None or prefetch[0] != start:
+            return list(self._decode(start, len(self.entries)))
+        _, decoded, rest = prefetch
+        decoded.extend(rest)
+        return decoded
+
+    def _advance_prefetch(self, count):
+        start = self._segment_start
+        if start == 0:
+            return
+        if self._prefetch is None:
+            previous = self._keyframe_before(start - 1)
+            self._prefetch = (previous, [], self._decode(previous, start))
+        _, decoded, rest = self._prefetch
+        decoded.extend(islice(rest, count))
+
+    def _decode(self, start, stop):
+        """start 番目（キーフレーム）から stop 番目の手前までのステップの区分のバイト列を順に返す"""
+        prev = None
+        for index in range(start, stop):
+            if index >= len(self.entries):
+                return
+            offset, length, _ = self.entries[index]
+            record = marshal.loads(zlib.decompress(self.memory[offset:offset + length]))
+            sections = []
+            for i, (kind, payload) in enumerate(record):
+                if kind == SAME:
+                    sections.append(prev[i])
+                elif kind == XOR:
+                    sections.append(_xor(payload, prev[i]))
+                else:
+                    sections.append(payload)
+            prev = sections
+            yield sections
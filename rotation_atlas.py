@@ -0,0 +1,51 @@
+import pygame
+from collections import OrderedDict
+from setting import *
+
+class RotationAtlas:
+    """元画像ごとに、量子化した角度で回転済みの画像を保持するキャッシュ（LRUで破棄）"""
+    def __init__(self, steps=ROTATION_STEPS, max_images=ROTATION_CACHE_SIZE):
+        self.steps = steps
+        self.step_angle = 360 / steps
+        self.max_images = max_images
+        # 元画像 -> 各角度の回転済み画像のリスト（必要になった角度だけ生成する）
+        self.frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def angle_index(self, angle):
+        """角度（度）を最も近い量子化済みの角度番号に変換する"""
+        return round(angle / self.step_angle) % self.steps
+
+    def get_frame(self, image, index):
+        """角度番号に対応する回転済みの画像を返す"""
+        frames = self.frames.get(image)
+        if frames is None:
+            frames = [None] * self.steps
+            self.frames[image] = frames
+            # 上限を超えたら最も長く使われていない元画像の回転画像を破棄する
+            if len(self.frames) > self.max_images:
+                self.frames.popitem(last=False)
+        else:
+            self.frames.move_to_end(image)
+
+        frame = frames[index]
+        if frame is None:
+            self.misses += 1
+            frame = pygame.transform.rotate(image, index * self.step_angle)
+            frames[index] = frame
+        else:
+            self.hits += 1
+        return frame
+
+    def get(self, image, angle):
+        """角度（度、反時計回り）に最も近い回転済みの画像を返す"""
+        return self.get_frame(image, self.angle_index(angle))
+
+    def stats(self):
+        """ヒット数・ミス数・保持している回転画像の枚数を返す"""
+        count = sum(len(frames) - frames.count(None) for frames in self.frames.values())
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.frames), 'frames': count}
+
+# 全ての弾で共有する回転画像キャッシュ
+atlas = RotationAtlas()
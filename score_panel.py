@@ -0,0 +1,88 @@
+import pygame
+from setting import *
+from support import render_text, draw_number
+
+class ScorePanel:
+    """ゲームエリア右側のスコア表示画面
+
+    パネル全体を専用の Surface に描いておき、表示する値（ステージ・スコア・ライフ・ボム・パワー）が
+    変わったときだけ描き直す。FPS は FPS_REFRESH_MS ごとにだけ更新する。毎フレームの描画は1回の blit で済む。
+    """
+    FPS_REFRESH_MS = 250 # FPS表示の更新間隔（4Hz）
+
+    def __init__(self):
+        # 境界線（ゲームエリアとの境目の2px）もパネルに含める
+        self.rect = pygame.Rect(GAME_AREA_WIDTH - 1, 0, SCORE_PANEL_WIDTH + 1, screen_height)
+        self.surface = pygame.Surface(self.rect.size)
+        self.values = None
+        self.dirty = True
+        self.fps = 0.0
+        self.fps_time = None
+        self.renders = 0 # 描き直した回数
+
+    def bind(self, stage, score, player):
+        """表示する値を渡す。前回と違えば True を返す（次の draw で描き直す）"""
+        if player is not None:
+            values = (stage, score, player.health, player.bombs, player.power_level, player.max_power)
+        else:
+            values = (stage, score)
+        if values == self.values:
+            return False
+        self.values = values
+        self.dirty = True
+        return True
+
+    def update_fps(self, clock):
+        """一定間隔でのみ FPS の表示値を更新する"""
+        now = pygame.time.get_ticks()
+        if self.fps_time is None or now - self.fps_time >= self.FPS_REFRESH_MS:
+            self.fps_time = now
+            fps = round(clock.get_fps(), 2)
+            if fps != self.fps:
+                self.fps = fps
+                self.dirty = True
+
+    def render(self):
+        """パネルの Surface を描き直す"""
+        surface = self.surface
+        width = self.rect.width
+        center = width // 2 + 1
+        surface.fill(BLACK)
+        # ゲームエリアとの境界線
+        pygame.draw.rect(surface, WHITE, (0, 0, 2, self.rect.height))
+
+        # FPS表示（上部に中央揃え）
+        fps_surface = render_text(f"FPS: {self.fps:.2f}", UI_FONT_SIZE, WHITE)
+        surface.blit(fps_surface, (center - fps_surface.get_width() // 2, 20))
+
+        stage, score = self.values[:2]
+        # ステージ表示
+        stage_surface = render_text(f"STAGE: {stage}", UI_FONT_SIZE, WHITE)
+        surface.blit(stage_surface, (center - stage_surface.get_width() // 2, 50))
+
+        # スコア表示（7桁）
+        score_title_surface = render_text("SCORE", UI_FONT_SIZE, WHITE)
+        surface.blit(score_title_surface, (center - score_title_surface.get_width() // 2, 90))
+        draw_number(surface, score, center, 125 + score_title_surface.get_height() // 2, UI_FONT_SIZE, SCORE_TEXT_COLOR, 7)
+
+        # 自機が生きている場合のみ、パワー・ボム・ライフを表示
+        if len(self.values) > 2:
+            health, bombs, power_level, max_power = self.values[2:]
+            power_title_surface = render_text("POWER", UI_FONT_SIZE, SCORE_TEXT_COLOR)
+            surface.blit(power_title_surface, (center - power_title_surface.get_width() // 2, 165))
+            power_level_surface = render_text(f"{power_level} / {max_power}", UI_FONT_SIZE, WHITE)
+            surface.blit(power_level_surface, (center - power_level_surface.get_width() // 2, 200))
+
+            surface.blit(render_text(f"BOMB: {bombs}", UI_FONT_SIZE, WHITE), (21, self.rect.height - 80))
+            surface.blit(render_text(f"LIVES: {health}", UI_FONT_SIZE, WHITE), (21, self.rect.height - 50))
+
+        self.dirty = False
+        self.renders += 1
+
+    def draw(self, screen):
+        """パネルを画面に描く（必要なときだけ描き直す）。描き直した場合は True を返す"""
+        rendered = self.dirty
+        if rendered:
+            self.render()
+        screen.blit(self.surface, self.rect)
+        return rendered
@@ -40,4 +40,68 @@ ITEM_DEFAULT_COLOR = (100, 100, 255)
 
 # ボム（マスタースパーク）のフォールバック色
 BOMB_LASER_OUTER_COLOR = (255, 255, 100, 100)
-BOMB_LASER_INNER_COLOR = (255, 255, 255, 200)
\ No newline at end of file
+BOMB_LASER_INNER_COLOR = (255, 255, 255, 200)
+# ボムのレーザーの描画領域の幅と、発射時・収束時に幅を変化させる段階数（フレーム数）
+BOMB_BEAM_WIDTH = 412
+BOMB_BEAM_STEPS = 20
+
+# 敵弾の処理方式（'sprite': 1発ずつのスプライト, 'numpy': NumPy配列でまとめて処理）
+BULLET_ENGINE = 'sprite'
+
+# 回転済み画像キャッシュの設定
+ROTATION_STEPS = 128      # 1周を何段階の角度に量子化するか
+ROTATION_CACHE_SIZE = 64  # 回転済み画像を保持する元画像の最大数（超えたら古いものから破棄）
+
+# ホーミング弾の索敵と方向転換を NumPy でまとめて計算する（NumPyがなければ1発ずつ処理する）
+VECTORIZED_HOMING = True
+# これより少ない弾数では配列化の手間の方が大きいので1発ずつ処理する（通常のプレイで同時に飛ぶのは15〜20発ほどで、
+# 配列化が速くなるのは50〜60発あたりから。配列化した処理は benchmark.py の homing:swarm で計測する）
+HOMING_BATCH_MIN = 48
+
+# 当たり判定用の空間ハッシュのセルの大きさ（px）
+SPATIAL_CELL_SIZE = 64
+
+# 1回の描画で進めるシミュレーションの最大ステップ数（処理落ち時に追いつこうとして固まるのを防ぐ）
+MAX_FRAME_STEPS = 5
+
+# スコアパネルの文字の大きさと、描画済み文字列のキャッシュに保持する最大数
+UI_FONT_SIZE = 30
+TEXT_CACHE_SIZE = 128
+
+# プロファイラ: 処理時間を保持するフレーム数と、1フレームの時間の予算（ミリ秒）
+PROFILER_HISTORY = 240
+FRAME_BUDGET_MS = 1000 / FPS
+
+# 描き換えた領域だけを画面に反映するモード（ソフトウェア描画のSDLで flip が重い場合に有効）
+DIRTY_RECTS = False
+DIRTY_FLIP_COVERAGE = 0.9 # 描き換えた面積がこの割合以上なら画面全体を flip する
+
+# スプライトのプールに保持する使い終わったインスタンスの最大数（クラス名ごとに指定、なければ POOL_CAP）
+POOL_CAP = 256
+POOL_CAPS = {'EnemyBullet': 2048, 'Bullet': 256, 'HomingBullet': 64, 'Item': 128, 'Explosion': 64}
+
+# ボスの弾幕パターンとボスごとのパターン選択の定義ファイル
+PATTERN_FILE = 'assets/data/patterns.json'
+PATTERN_TABLE_FRAMES = 600 # 発射表を前計算するフレーム数（パターンの最長の持続時間より長くする）
+
+# ステージごとの敵の出現タイムラインの定義ファイル
+STAGE_FILE = 'assets/data/stages.json'
+
+# 状態のハッシュ（リプレイの一致確認）を計算する間隔（フレーム数）と、位置などの実数を丸める細かさ（1/px）
+STATE_HASH_INTERVAL = 60
+STATE_HASH_SCALE = 256
+
+# 巻き戻し: 保持する秒数、記録に使うメモリの上限（バイト）、キーフレーム（差分でない状態）を置く間隔（フレーム数）
+REWIND_SECONDS = 10
+REWIND_MAX_BYTES = 64 * 1024 * 1024
+REWIND_KEYFRAME_INTERVAL = 30
+REWIND_PREFETCH_STEPS = 2 # 巻き戻し中に1ステップ戻るごとに先読みして展開するステップ数
+
+# 学習・プレイテスト用の環境（env.py）: 観測に含める敵・敵弾・アイテムの数（自機に近い順）、
+# 画面を観測にする場合の縮小後の大きさ (幅, 高さ)、被弾1回あたりの報酬の減点、1エピソードの最大ステップ数
+ENV_MAX_ENEMIES = 16
+ENV_MAX_BULLETS = 128
+ENV_MAX_ITEMS = 16
+ENV_FRAME_SIZE = (GAME_AREA_WIDTH // 8, screen_height // 8)
+ENV_HIT_PENALTY = 1000
+ENV_MAX_STEPS = FPS * 60 * 5
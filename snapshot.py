@@ -0,0 +1,314 @@
+"""ゲームの状態のスナップショット（保存と復元）
+
+Game のシミュレーションの状態（時計・乱数列・ステージ進行・自機・敵・弾・アイテム・爆発）を
+画像などの Surface を含まない単純な値（数値・文字列・タプル・辞書）にして marshal と zlib で詰めたバイト列にする。
+復元は同じ Game に対して行い、スプライトはプールやコンストラクタで作り直してから属性を書き戻す
+（画像は共有キャッシュから引き直す）。
+
+  data = capture(game)    # または game.snapshot()
+  restore(game, data)     # または game.restore(data)
+
+スプライトの属性は型を見て自動で保存する:
+  数値・文字列・None・それらのタプル/リスト/辞書 → そのまま、Vector2 → 複素数、Rect → (x, y, w, h)、
+  敵への参照（ホーミング弾のターゲット）→ ('@', 敵の番号)、それ以外（Surface・グループなど）→ 保存しない
+敵弾は弾の処理方式ごとに列（BulletField は配列のバイト列）と見た目の表で保存する。
+"""
+import zlib
+import struct
+import marshal
+import pygame
+from setting import *
+from enemy import Enemy
+from enemy_bullet import EnemyBullet
+from bullet import Bullet, HomingBullet
+from bomb import MasterSpark
+from item import Item
+from explosion import Explosion
+from pool import release_all
+from rotation_atlas import atlas
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければ BulletField は使われない
+    np = None
+
+MAGIC = b'SGSS'
+VERSION = 1
+_HEADER = struct.Struct('<4sH')
+
+# 保存しない属性（プールとグループの管理用）
+_SKIP_ATTRS = frozenset(('pool', 'pooled', '_groups'))
+_PLAIN = (bool, int, float, str, type(None))
+_SKIP = object()
+
+# BulletField の配列（この順で保存する）
+_FIELD_ARRAYS = ('x', 'y', 'dx', 'dy', 'speed', 'radius', 'frozen')
+
+class SnapshotError(ValueError):
+    """スナップショットとして読めない、またはこのゲームに復元できない"""
+
+def _encode(value, refs):
+    """属性の値を marshal できる値にする（保存しない値は _SKIP）"""
+    if isinstance(value, _PLAIN):
+        return value
+    if isinstance(value, pygame.math.Vector2):
+        return complex(value.x, value.y)
+    if isinstance(value, pygame.Rect):
+        return (value.x, value.y, value.w, value.h)
+    if isinstance(value, (tuple, list)):
+        items = [_encode(v, refs) for v in value]
+        if any(v is _SKIP for v in items):
+            return _SKIP
+        return type(value)(items)
+    if isinstance(value, dict):
+        items = {k: _encode(v, refs) for k, v in value.items()}
+        if any(not isinstance(k, str) or v is _SKIP for k, v in items.items()):
+            return _SKIP
+        return items
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    ref = refs.get(id(value))
+    if ref is not None:
+        return ('@', ref)
+    return _SKIP
+
+def _decode(value, current, targets):
+    """_encode() した値を戻す（current: 復元先の現在の値。Rect ならRectに戻す）"""
+    if isinstance(value, complex):
+        return pygame.math.Vector2(value.real, value.imag)
+    if isinstance(value, tuple):
+        if len(value) == 2 and value[0] == '@':
+            return targets[value[1]]
+        if isinstance(current, pygame.Rect):
+            return pygame.Rect(value)
+    return value
+
+_slot_names = {}
+
+def _attribute_names(obj):
+    """obj の全ての属性名（__slots__ と __dict__）"""
+    cls = type(obj)
+    slots = _slot_names.get(cls)
+    if slots is None:
+        slots = _slot_names[cls] = tuple(name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ()))
+    names = list(slots)
+    names.extend(getattr(obj, '__dict__', ()))
+    return names
+
+def capture_attributes(obj, refs=None):
+    """obj の保存できる属性を {属性名: 値} にする"""
+    refs = refs or {}
+    state = {}
+    for name in _attribute_names(obj):
+        if name in _SKIP_ATTRS or name in state:
+            continue
+        value = getattr(obj, name, _SKIP)
+        if value is _SKIP:
+            continue
+        value = _encode(value, refs)
+        if value is not _SKIP:
+            state[name] = value
+    return state
+
+def restore_attributes(obj, state, targets=()):
+    """capture_attributes() の結果を obj に書き戻す"""
+    for name, value in state.items():
+        setattr(obj, name, _decode(value, getattr(obj, name, None), targets))
+
+def _sprite_classes():
+    """クラス名 → 敵のクラス（Enemy とその全てのサブクラス）"""
+    classes = {}
+    pending = [Enemy]
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+# 敵弾 ################################################################################################
+
+def _capture_bullet_field(field):
+    n = field.count
+    type_id = field.type_id[:n]
+    used, remapped = np.unique(type_id, return_inverse=True)
+    return {
+        'engine': 'numpy',
+        'count': n,
+        'styles': [field.image_styles[i] for i in used.tolist()],
+        'style_id': remapped.astype(np.int32).tobytes(),
+        'arrays': {name: getattr(field, name)[:n].tobytes() for name in _FIELD_ARRAYS},
+    }
+
+def _restore_bullet_field(field, state):
+    n = state['count']
+    field.empty()
+    while field.capacity < n:
+        field._grow()
+    for name in _FIELD_ARRAYS:
+        array = getattr(field, name)
+        array[:n] = np.frombuffer(state['arrays'][name], dtype=array.dtype)
+    image_ids = np.array([field._image_id(*style) for style in state['styles']], dtype=np.int32)
+    field.type_id[:n] = image_ids[np.frombuffer(state['style_id'], dtype=np.int32)] if n else 0
+    field.count = n
+
+def _capture_bullet_sprites(group):
+    styles = {}
+    rows = [(b.pos.x, b.pos.y, b.direction.x, b.direction.y, float(b.speed), int(b.frozen_timer), styles.setdefault(b.style, len(styles)))
+            for b in group]
+    return {'engine': 'sprite', 'styles': [_encode(style, {}) for style in styles], 'columns': tuple(map(list, zip(*rows))) if rows else ([],) * 7}
+
+def _restore_bullet_sprites(group, state):
+    group.empty()
+    styles = state['styles']
+    for x, y, dx, dy, speed, frozen, style in zip(*state['columns']):
+        bullet_type, radius, color, length = styles[style]
+        bullet = EnemyBullet.spawn(group, x, y, speed=speed, radius=radius, color=color, length=length,
+                                   bullet_type=bullet_type, frozen_duration=frozen)
+        # 生成時の正規化を経ずに、保存した値をそのまま戻す
+        bullet.pos.update(x, y)
+        bullet.direction = pygame.math.Vector2(dx, dy)
+        if bullet.rotates and not bullet.is_frozen:
+            # 移動中の弾は進行方向に回転した画像にしておく（凍結中の弾はまだ回転していない）
+            angle = -bullet.direction.angle_to(pygame.math.Vector2(0, 1))
+            bullet.image = atlas.get(bullet.original_image, angle)
+            bullet.rect = bullet.image.get_rect(center=(int(x), int(y)))
+            bullet.image_direction = pygame.math.Vector2(bullet.direction)
+
+# ゲーム全体 ##########################################################################################
+
+def capture_state(game):
+    """game のシミュレーションの状態を単純な値の辞書にする（restore() にそのまま渡せる）"""
+    player = game.player
+    enemies = game.enemy_group.sprites()
+    refs = {id(enemy): i for i, enemy in enumerate(enemies)}
+    bullets = game.enemy_bullets
+    bomb = player.bomb_group.sprite
+    return {
+        'engine': 'sprite' if isinstance(bullets, pygame.sprite.AbstractGroup) else 'numpy',
+        'clock': (game.game_clock.frame, game.game_clock.time_ms),
+        'rng': game.rng.getstate(),
+        'game': {
+            'score': game.score,
+            'game_over': game.game_over,
+            'game_clear': game.game_clear,
+            'grand_boss_defeated': game.grand_boss_defeated,
+            'bg': game.bg_images.index(game.bg_img),
+            'bg_y': game.bg_y,
+        },
+        'stage': capture_attributes(game.stage_manager),
+        'player': capture_attributes(player),
+        'player_alive': player in game.player_group,
+        'enemies': [(type(e).__name__, capture_attributes(e)) for e in enemies],
+        'player_bullets': [(type(b).__name__, capture_attributes(b, refs)) for b in player.bullet_group],
+        'bomb': capture_attributes(bomb) if bomb is not None else None,
+        'enemy_bullets': _capture_bullet_sprites(bullets) if isinstance(bullets, pygame.sprite.AbstractGroup) else _capture_bullet_field(bullets),
+        'items': [capture_attributes(item) for item in game.item_group],
+        'explosions': [capture_attributes(e) for e in game.explosion_group],
+    }
+
+def capture(game):
+    """game のシミュレーションの状態をバイト列にする"""
+    return _HEADER.pack(MAGIC, VERSION) + zlib.compress(marshal.dumps(capture_state(game)), 1)
+
+def load(data):
+    """capture() のバイト列を辞書に戻す"""
+    if len(data) < _HEADER.size:
+        raise SnapshotError('snapshot is too short')
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError('not a snapshot')
+    if version != VERSION:
+        raise SnapshotError(f'unsupported snapshot version {version}')
+    try:
+        return marshal.loads(zlib.decompress(data[_HEADER.size:]))
+    except (zlib.error, ValueError, EOFError, TypeError) as e:
+        raise SnapshotError(f'snapshot is corrupt: {e}') from e
+
+def restore(game, data):
+    """capture() したバイト列（または capture_state() の辞書）の状態を game に復元する"""
+    state = load(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    bullets = game.enemy_bullets
+    engine = 'sprite' if isinstance(bullets, pygame.sprite.AbstractGroup) else 'numpy'
+    if state['engine'] != engine:
+        raise SnapshotError(f"snapshot was taken with the {state['engine']} bullet engine, this game uses {engine}")
+
+    # 敵のコンストラクタは爆発・ボスのグループと乱数列をクラス属性・モジュールから引くので、このゲームのものにする
+    game.make_current()
+    player = game.player
+    game.clear_stage()
+    release_all(player.bullet_group)
+    player.bomb_group.empty()
+
+    game.game_clock.frame, game.game_clock.time_ms = state['clock']
+
+    # 自機（オブジェクトはそのまま使い、属性だけを戻す）
+    restore_attributes(player, state['player'])
+    player.image = player.image_list[player.index]
+    if state['player_alive']:
+        game.player_group.add(player)
+    else:
+        game.player_group.empty()
+
+    # 敵（コンストラクタで画像などを用意してから属性を戻す。ボスは boss_group にも登録される）
+    classes = _sprite_classes()
+    enemies = []
+    for name, attributes in state['enemies']:
+        enemy = classes[name](game.enemy_group, 0, 0, player.bullet_group, game.player_group, bullets, game.item_group)
+        restore_attributes(enemy, attributes)
+        enemies.append(enemy)
+
+    # 自機の弾とボム
+    for name, attributes in state['player_bullets']:
+        if name == 'HomingBullet':
+            bullet = HomingBullet.spawn(player.bullet_group, 0, 0, game.enemy_group)
+        else:
+            bullet = Bullet.spawn(player.bullet_group, 0, 0)
+        restore_attributes(bullet, attributes, enemies)
+        bullet.pre_image = bullet.image_list[int(bullet.index)]
+        bullet.image = bullet.pre_image
+        if name == 'HomingBullet':
+            # 次の update() で向きに合わせた画像を引き直させる
+            bullet.image_source = None
+            bullet.rotated_image = bullet.image
+    if state['bomb'] is not None:
+        bomb = MasterSpark(player.bomb_group, player)
+        restore_attributes(bomb, state['bomb'])
+        bomb.image = bomb.beam_frame(bomb.width_step())
+
+    # 敵弾
+    if engine == 'sprite':
+        _restore_bullet_sprites(bullets, state['enemy_bullets'])
+    else:
+        _restore_bullet_field(bullets, state['enemy_bullets'])
+
+    # アイテムと爆発
+    for attributes in state['items']:
+        item = Item.spawn(game.item_group, (0, 0), attributes['item_type'])
+        restore_attributes(item, attributes)
+    for attributes in state['explosions']:
+        explosion = Explosion.spawn(game.explosion_group, 0, 0)
+        restore_attributes(explosion, attributes)
+        if explosion.index < len(explosion.image_list):
+            explosion.pre_image = explosion.image = explosion.image_list[int(explosion.index)]
+
+    # ステージ進行
+    stage_manager = game.stage_manager
+    restore_attributes(stage_manager, state['stage'])
+    stage_manager.timeline = stage_manager.timelines.get(stage_manager.stage, stage_manager.timeline)
+
+    for name, value in state['game'].items():
+        if name == 'bg':
+            game.bg_img = game.bg_images[value]
+        else:
+            setattr(game, name, value)
+
+    # 敵のコンストラクタが乱数を引くので、乱数列は最後に戻す
+    game.rng.setstate(state['rng'])
+
+def save(game, path):
+    with open(path, 'wb') as f:
+        f.write(capture(game))
+
+def restore_file(game, path):
+    with open(path, 'rb') as f:
+        restore(game, f.read())
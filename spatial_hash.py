@@ -0,0 +1,117 @@
+import pygame
+from setting import *
+
+class SpatialHash:
+    """ゲームエリアを一様な格子に分割し、登録した物体の近傍だけを問い合わせる空間ハッシュ"""
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, width=GAME_AREA_WIDTH, height=screen_height):
+        self.cell_size = cell_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self.serial = {} # 物体 → 登録した順番（複数のセルにまたがる問い合わせの結果を登録順に並べる）
+
+    def _cell_range(self, rect):
+        """矩形が重なるセルの範囲（ゲームエリア外は端のセルにまとめる）"""
+        size = self.cell_size
+        x0 = min(max(rect.left // size, 0), self.cols - 1)
+        x1 = min(max((rect.right - 1) // size, 0), self.cols - 1)
+        y0 = min(max(rect.top // size, 0), self.rows - 1)
+        y1 = min(max((rect.bottom - 1) // size, 0), self.rows - 1)
+        return x0, x1, y0, y1
+
+    def clear(self):
+        for cell in self.cells:
+            cell.clear()
+        self.serial.clear()
+
+    def insert(self, item, rect):
+        """物体を矩形が重なる全てのセルに登録する"""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        self.serial.setdefault(item, len(self.serial))
+        cols = self.cols
+        for cy in range(y0, y1 + 1):
+            row = cy * cols
+            for cx in range(x0, x1 + 1):
+                self.cells[row + cx].append(item)
+
+    def rebuild(self, sprites):
+        """全てのスプライトを rect で登録し直す"""
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite, sprite.rect)
+
+    def candidates(self, rect):
+        """矩形と同じセルに登録されている物体を重複なしで返す（登録順を保つ）"""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cols = self.cols
+        if x0 == x1 and y0 == y1:
+            return list(self.cells[y0 * cols + x0])
+        found = {}
+        for cy in range(y0, y1 + 1):
+            row = cy * cols
+            for cx in range(x0, x1 + 1):
+                for item in self.cells[row + cx]:
+                    found[item] = None
+        # セルを走査した順ではなく登録順に並べる（最初に当たったものを選ぶ処理の結果を配列の処理と揃える）
+        return sorted(found, key=self.serial.__getitem__)
+
+    def nearest(self, center, key):
+        """center に最も近い物体を返す（key(item) で物体の中心座標を得る）"""
+        size = self.cell_size
+        px, py = center
+        qx = min(max(int(px // size), 0), self.cols - 1)
+        qy = min(max(int(py // size), 0), self.rows - 1)
+        best = None
+        best_dist = float('inf')
+        # 自分のセルから外側へ1周ずつ探し、残りのセルに近いものがあり得なくなったら終了する
+        for ring in range(max(self.cols, self.rows)):
+            for cy in range(qy - ring, qy + ring + 1):
+                if not 0 <= cy < self.rows:
+                    continue
+                edge = cy == qy - ring or cy == qy + ring
+                step = 1 if edge else 2 * ring
+                for cx in range(qx - ring, qx + ring + 1, max(step, 1)):
+                    if not 0 <= cx < self.cols:
+                        continue
+                    for item in self.cells[cy * self.cols + cx]:
+                        ix, iy = key(item)
+                        dist = (ix - px) ** 2 + (iy - py) ** 2
+                        if dist < best_dist:
+                            best_dist = dist
+                            best = item
+            if best is not None and best_dist <= (ring * size) ** 2:
+                break
+        return best
+
+class SpatialGroup(pygame.sprite.Group):
+    """空間ハッシュによる近傍検索を備えたスプライトグループ
+
+    Game が1フレームに1回 rebuild_index() を呼び、各スプライトの当たり判定はグループ全体を
+    走査する代わりに query_rect() / query_radius() / nearest() で近くのスプライトだけを調べる。
+    """
+    def __init__(self, *sprites):
+        super().__init__(*sprites)
+        self.index = SpatialHash()
+
+    def rebuild_index(self):
+        self.index.rebuild(self.sprites())
+
+    def query_rect(self, rect):
+        """rect と重なるスプライトを返す（索引の作成後に消えたものは除く）"""
+        spritedict = self.spritedict
+        return [s for s in self.index.candidates(rect) if s in spritedict and s.rect.colliderect(rect)]
+
+    def query_radius(self, center, radius):
+        """center から radius 以内に rect が掛かるスプライトを返す"""
+        rect = pygame.Rect(0, 0, radius * 2, radius * 2)
+        rect.center = center
+        return self.query_rect(rect)
+
+    def nearest(self, center):
+        """rect の中心が center に最も近いスプライトを返す"""
+        # 索引の作成後に消えたスプライトは、生きているものだけで探し直す
+        spritedict = self.spritedict
+        sprite = self.index.nearest(center, lambda s: s.rect.center)
+        if sprite is None or sprite in spritedict:
+            return sprite
+        return min(self.sprites(), key=lambda s: pygame.math.Vector2(s.rect.center).distance_squared_to(center), default=None)
@@ -1,75 +1,59 @@
 import pygame
-import random
+import game_random
+import math
 from setting import *
+import game_clock
+from stage_timeline import load_stages
 from enemy import Enemy
 from enemy_subclasses import FastEnemy, TankEnemy, WaveEnemy, HunterEnemy # boss_subclassesはStageManager内で直接インポート
 from boss import BossEnemy
 from boss_subclasses import GrandBossEnemy, Stage1Boss, Stage2MidBoss
 
 class StageManager:
-    """ステージ進行と敵の出現を管理するクラス"""
-    def __init__(self, enemy_group, player_group, item_group):
+    """ステージ進行と敵の出現を管理するクラス
+
+    ステージのタイムラインは STAGE_FILE から読み込む。ボスは boss_group に登録されたものだけを数え、
+    ボスが生きている間はタイムラインを止める（タイムライン自体は書き換えない）。
+    """
+    def __init__(self, enemy_group, player_group, item_group, boss_group=None):
         self.enemy_group = enemy_group
         self.player_group = player_group
         self.item_group = item_group
+        # 生きているボス（BossEnemy は生成時に BossEnemy.boss_group へ自分を登録する）
+        self.boss_group = boss_group if boss_group is not None else BossEnemy.boss_group
 
-        self.stage_schedules = {
-            1: [ # ステージ1
-                {'start': 0,      'type': 'normal', 'count': 8,  'interval': 800},
-                {'start': 5000,   'type': 'fast',   'count': 5, 'interval': 600},
-                {'start': 10000,  'type': 'wave',   'count': 7,  'interval': 900},
-                {'start': 16000,  'type': 'tank',   'count': 6,  'interval': 1000},
-                {'start': 23000,  'type': 'normal', 'count': 12, 'interval': 500},
-                {'start': 30000,  'type': 'stage1_boss', 'count': 1, 'interval': 0}, # ステージ1の最初のボス
-                {'start': 38000,  'type': 'normal', 'count': 15, 'interval': 400}, # ボス間のザコ敵
-                {'start': 45000,  'type': 'boss',   'count': 1,  'interval': 0},   # ステージ1の最終ボス
-            ],
-            2: [ # ステージ2
-                {'start': 0,      'type': 'normal', 'count': 15, 'interval': 400},
-                {'start': 7000,   'type': 'fast',   'count': 8,  'interval': 400},
-                {'start': 13000,  'type': 'hunter', 'count': 6,  'interval': 1200}, # 新しい敵を追加
-                {'start': 20000,  'type': 'stage2_mid_boss', 'count': 1, 'interval': 0},  # ステージ2の中ボス
-                {'start': 26000,  'type': 'hunter', 'count': 4,  'interval': 1000}, # 中ボス後の追撃
-                {'start': 27000,  'type': 'fast',   'count': 6,  'interval': 500},  # hunterと同時に出現
-                {'start': 32000,  'type': 'tank',   'count': 8,  'interval': 800},
-                {'start': 38000,  'type': 'wave',   'count': 10, 'interval': 600},
-                {'start': 44000,  'type': 'grand_boss', 'count': 1, 'interval': 0},
-            ]
-        }
-        self.stage = 1
-        self.spawn_schedule = self.stage_schedules[self.stage]
-        self.spawn_active = True
-        self.spawn_start_time = pygame.time.get_ticks()
-        self.current_wave = 0
-        self.wave_spawned = 0
-        self.next_spawn_time = self.spawn_start_time + self.spawn_schedule[0]['interval']
-
-        self.stage_clear_timer = 0
+        self.timelines = load_stages()
         self.stage_clear_wait_time = 3000 # 3秒待機
+        self.boss_health = None # seek() で指定する、出現するボスのHPの割合
+        self.start_stage(1)
 
     def start_stage(self, stage_number):
         """指定されたステージを開始する"""
         self.stage = stage_number
-        if stage_number > len(self.stage_schedules):
+        if stage_number > len(self.timelines):
             return "game_clear"
 
-        self.spawn_schedule = self.stage_schedules[self.stage]
-        self.spawn_start_time = pygame.time.get_ticks()
-        self.current_wave = 0
-        self.wave_spawned = 0
-        interval = self.spawn_schedule[0]['interval']
-        self.next_spawn_time = self.spawn_start_time + (interval if interval > 0 else 0)
+        self.timeline = self.timelines[self.stage]
+        self.spawn_start_time = game_clock.get_ticks()
+        interval = self.timeline[0].interval
+        self.begin_wave(0, self.spawn_start_time + (interval if interval > 0 else 0))
         self.spawn_active = True
         self.stage_clear_timer = 0
         return self.stage
 
+    def begin_wave(self, index, spawn_time):
+        """タイムラインの index 番目のウェーブを開始する（最初の敵は spawn_time に出現する）"""
+        self.current_wave = index
+        self.wave_spawned = 0
+        self.next_spawn_time = spawn_time
+
     def update(self, game_over, grand_boss_defeated):
         """敵の生成とステージ進行を管理する"""
         # ステージクリア待機中
         if self.stage_clear_timer > 0:
-            if pygame.time.get_ticks() - self.stage_clear_timer > self.stage_clear_wait_time:
+            if game_clock.get_ticks() - self.stage_clear_timer > self.stage_clear_wait_time:
                 # 最終ボスが倒され、かつ現在のステージが最後のステージであればゲームクリアを通知
-                if grand_boss_defeated and self.stage == len(self.stage_schedules):
+                if grand_boss_defeated and self.stage == len(self.timelines):
                     self.spawn_active = False # 敵の出現を停止
                     return "game_clear" # ゲームクリアをGameクラスに通知
                 return self.start_stage(self.stage + 1) # 次のステージへ移行
@@ -78,73 +62,65 @@ class StageManager:
         if not self.spawn_active:
             return None
 
-        now = pygame.time.get_ticks()
-        elapsed = now - self.spawn_start_time
-        is_boss_alive = any(isinstance(enemy, BossEnemy) for enemy in self.enemy_group)
-
-        # ボス戦中は後続ウェーブの開始時間を現在時刻で更新し続け、進行を止める
-        if is_boss_alive:
-            if (self.current_wave + 1) < len(self.spawn_schedule):
-                self.spawn_schedule[self.current_wave + 1]['start'] = elapsed + 100 # 100ms先に設定し続ける
-
-        # 時間経過によるウェーブ進行の判定（ボスがいない場合のみ）
-        if not is_boss_alive:
-            # 次のウェーブが存在し、かつ開始時刻を過ぎていたら
-            if (self.current_wave + 1) < len(self.spawn_schedule) and \
-               elapsed >= self.spawn_schedule[self.current_wave + 1]['start']:
-                self.current_wave += 1
-                self.wave_spawned = 0
-                self.next_spawn_time = now
-
-        wave = self.spawn_schedule[self.current_wave]
-        
-        # 現在のウェーブの敵をすべて生成し終えたか
-        if self.wave_spawned >= wave['count']:
-            # 現在のウェーブがボスウェーブで、そのボスが倒された場合
-            if 'boss' in wave['type'] and not is_boss_alive:
-                # これがステージの最終ウェーブの場合
-                if self.current_wave == len(self.spawn_schedule) - 1:
-                    self.spawn_active = False
-                    # ステージクリアタイマーを開始
-                    self.stage_clear_timer = pygame.time.get_ticks()
-                    return None # 待機状態に入る
-                # まだ次のウェーブがある場合
-                else:
-                    # 即座に次のウェーブへ移行
-                    self.current_wave += 1
-                    self.wave_spawned = 0
-                    next_wave = self.spawn_schedule[self.current_wave]
-                    self.spawn_start_time = pygame.time.get_ticks() - next_wave['start'] # 経過時間をリセット
-                    self.next_spawn_time = now
-            return None # 通常のウェーブ完了後、またはボス生存中は次のウェーブ開始時刻まで待機
+        now = game_clock.get_ticks()
+        wave = self.timeline[self.current_wave]
+        wave_done = self.wave_spawned >= wave.count
+
+        # ボス戦中はタイムラインを進めない
+        if len(self.boss_group) == 0:
+            if wave.gate:
+                # ボスゲート: ボスを出し終えて倒したら、即座に次のウェーブへ移行する
+                if wave_done:
+                    next_wave = self.timeline.peek(wave.index)
+                    # これがステージの最終ウェーブの場合
+                    if next_wave is None:
+                        self.spawn_active = False
+                        # ステージクリアタイマーを開始
+                        self.stage_clear_timer = game_clock.get_ticks()
+                        return None # 待機状態に入る
+                    # 経過時間を次のウェーブの開始時刻に合わせ、後続のウェーブは元の間隔で続ける
+                    self.spawn_start_time = now - next_wave.start
+                    self.begin_wave(next_wave.index, now)
+                    return None
+            else:
+                # 次のウェーブの開始時刻を過ぎていたら進める
+                next_wave = self.timeline.peek(wave.index)
+                if next_wave is not None and now - self.spawn_start_time >= next_wave.start:
+                    self.begin_wave(next_wave.index, now)
+                    wave = next_wave
+                    wave_done = False
+
+        # 現在のウェーブの敵をすべて生成し終えたら、次のウェーブ開始時刻まで待機
+        if wave_done:
+            return None
 
         # 敵の生成
         if now >= self.next_spawn_time:
             if game_over or len(self.player_group) == 0:
-                self.next_spawn_time = now + wave['interval']
+                self.next_spawn_time = now + wave.interval
                 return None
 
             if len(self.enemy_group) < 20:
                 self.create_enemy(wave)
                 self.wave_spawned += 1
 
-            if wave['interval'] > 0:
-                self.next_spawn_time = now + wave['interval']
+            if wave.interval > 0:
+                self.next_spawn_time = now + wave.interval
             else:
                 self.next_spawn_time = now
         return None
 
     def create_enemy(self, wave):
         """指定されたウェーブの敵を1体生成する"""
-        spawn_type = wave['type']
+        spawn_type = wave.type
         player = self.player_group.sprite
         enemy_bullets = player.enemy_bullets # Playerが持つ共有グループ
 
         if spawn_type == 'wave':
-            x = random.choice([-30, GAME_AREA_WIDTH + 30])
-            y = random.randint(80, 150)
+            x = game_random.choice([-30, GAME_AREA_WIDTH + 30])
+            y = game_random.randint(80, 150)
         else:
-            x = random.randint(50, GAME_AREA_WIDTH - 50)
+            x = game_random.randint(50, GAME_AREA_WIDTH - 50)
             y = 10
 
         enemy_map = {
@@ -165,8 +141,69 @@ class StageManager:
             y = -80 if spawn_type != 'grand_boss' else -120
             x = GAME_AREA_WIDTH // 2
 
-        enemy_class(self.enemy_group, x, y, player.bullet_group, self.player_group, enemy_bullets, self.item_group)
+        enemy = enemy_class(self.enemy_group, x, y, player.bullet_group, self.player_group, enemy_bullets, self.item_group)
+        # seek() で指定された割合のHPでボスを出現させる（発狂モードの検証用）
+        if self.boss_health is not None and isinstance(enemy, BossEnemy):
+            enemy.health = max(1, int(enemy.max_health * self.boss_health))
+
+    def seek(self, stage, wave=None, time=None, boss_health=None):
+        """ステージの途中の状態を直接作る（後半の敵やボスをすぐに検証・計測するため）
+
+        wave: タイムラインの何番目のウェーブから始めるか
+        time: wave の開始（省略時はステージの開始）からの経過時間（ms）
+        boss_health: 以降に出現するボスのHPの割合（半分以下なら発狂モードから始まる）
+        経過時間より前のボスゲートは通過済みとして扱い、現在のウェーブで既に出現したはずの敵は数だけ進める。
+        """
+        if stage not in self.timelines:
+            raise ValueError(f'stage {stage} does not exist (stages: {sorted(self.timelines)})')
+        timeline = self.timelines[stage]
+        if wave is not None and not 0 <= wave < len(timeline):
+            raise ValueError(f'stage {stage} has no wave {wave} (waves: 0-{len(timeline) - 1})')
+
+        self.start_stage(stage)
+        self.boss_health = boss_health
+        target = (timeline[wave].start if wave is not None else 0) + (time or 0)
+        index = wave if wave is not None else 0
+        while timeline.peek(index) is not None and timeline.peek(index).start <= target:
+            index += 1
+        if index == 0 and target == 0:
+            return
+
+        now = game_clock.get_ticks()
+        self.spawn_start_time = now - target
+        current = timeline[index]
+        into = target - current.start
+        spawned = 0
+        # ボスのウェーブは最初から（ボスを出現させる）、それ以外は経過時間までの出現を済んだものとする
+        if not current.gate and into > 0:
+            spawned = min(current.count, math.ceil(into / current.interval)) if current.interval > 0 else current.count
+        self.begin_wave(index, now + max(0, spawned * current.interval - into))
+        self.wave_spawned = spawned
 
     def reset(self):
         """ステージマネージャーの状態をリセットする"""
-        self.start_stage(1)
\ No newline at end of file
+        self.boss_health = None
+        self.start_stage(1)
+
+def add_seek_arguments(parser):
+    """ステージの途中から始めるためのコマンドライン引数を追加する"""
+    parser.add_argument('--stage', type=int, help='start at this stage')
+    parser.add_argument('--wave', type=int, help='start at this wave of the stage timeline (0-based)')
+    parser.add_argument('--time', type=float, help='seconds into the wave (or into the stage when --wave is omitted)')
+    parser.add_argument('--boss-health', type=float, help='spawn bosses with this fraction of their max health (0.5 or less starts enraged)')
+
+def seek_position(args):
+    """add_seek_arguments() の引数を Game.seek() の引数 (stage, wave, time(ms), boss_health) にする（指定がなければ None）"""
+    if args.stage is None and args.wave is None and args.time is None and args.boss_health is None:
+        return None
+    return (args.stage or 1, args.wave, None if args.time is None else args.time * 1000, args.boss_health)
+
+def seek_from_args(game, args, parser):
+    """add_seek_arguments() の引数が指定されていれば、その位置からゲームを始める"""
+    position = seek_position(args)
+    if position is None:
+        return
+    try:
+        game.seek(*position)
+    except ValueError as e:
+        parser.error(str(e))
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""ステージの敵の出現タイムラインをデータ（assets/data/stages.json）から読み込む
+
+各ステージはウェーブ（start: ステージ開始からの時刻ms, type: 敵の種類, count: 数, interval: 出現間隔ms）の列で、
+読み込み時に開始時刻順に並べた変更できないタイムラインにする。
+ボスのウェーブ（type に 'boss' を含むか gate が true）はボスゲートになり、
+ボスを倒すまで後続のウェーブに進まない。
+"""
+import json
+from collections import namedtuple
+from setting import *
+
+# index: タイムライン内の位置, gate: ボスゲートかどうか
+Wave = namedtuple('Wave', 'index start type count interval gate')
+
+class Timeline:
+    """開始時刻順に並んだウェーブの列（実行中に書き換えない）"""
+    __slots__ = ('waves',)
+
+    def __init__(self, specs):
+        ordered = sorted(enumerate(specs), key=lambda item: (item[1]['start'], item[0]))
+        self.waves = tuple(
+            Wave(index, spec['start'], spec['type'], spec['count'], spec['interval'], spec.get('gate', 'boss' in spec['type']))
+            for index, (_, spec) in enumerate(ordered))
+
+    def __len__(self):
+        return len(self.waves)
+
+    def __getitem__(self, index):
+        return self.waves[index]
+
+    def __iter__(self):
+        return iter(self.waves)
+
+    def peek(self, index):
+        """index の次のウェーブ（最後のウェーブなら None）"""
+        index += 1
+        return self.waves[index] if index < len(self.waves) else None
+
+_stages = {}
+
+def load_stages(path=STAGE_FILE):
+    """タイムラインの定義ファイルを読み込み、ステージ番号 → Timeline の辞書を返す（ファイルごとに一度だけ）"""
+    stages = _stages.get(path)
+    if stages is None:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        stages = _stages[path] = {int(number): Timeline(waves) for number, waves in data['stages'].items()}
+    return stages
@@ -0,0 +1,118 @@
+"""ゲームの状態のハッシュ（リプレイの一致確認・非同期の検出用）
+
+状態を自機・自機弾・敵・敵弾・アイテム・ステージ進行・乱数列のグループに分け、
+グループごとに 64bit のダイジェストを計算する。同じリプレイを別のコードで再生したときに
+どのフレームのどのグループから食い違ったかが分かる。
+
+位置や速度などの実数は 1/STATE_HASH_SCALE px 単位に丸め、敵弾は位置順に並べ替えてから
+ハッシュするので、弾の処理方式（EnemyBulletGroup / BulletField）によらず同じ状態なら同じ値になる。
+"""
+import hashlib
+from setting import *
+
+try:
+    import numpy as np
+except ImportError: # NumPyがなければ BulletField は使われない
+    np = None
+
+# ダイジェストを計算するグループ（リプレイにはこの順で保存する）
+GROUPS = ('player', 'player_bullets', 'enemies', 'enemy_bullets', 'items', 'stage', 'rng')
+
+def _q(value):
+    """実数を丸めた整数にする"""
+    return round(value * STATE_HASH_SCALE)
+
+def _digest(rows):
+    return int.from_bytes(hashlib.blake2b(repr(rows).encode(), digest_size=8).digest(), 'little')
+
+def player_rows(game):
+    player = game.player
+    if player is None or not player.alive:
+        return ()
+    return (_q(player.pos.x), _q(player.pos.y), player.health, player.power_level, player.bombs,
+            player.bomb_active, player.bomb_timer, player.invincible, player.invincible_timer,
+            player.fire, player.timer, player.homing_timer)
+
+def player_bullet_rows(game):
+    if game.player is None:
+        return ()
+    rows = [(type(b).__name__, _q(b.pos.x), _q(b.pos.y)) for b in game.player.bullet_group]
+    bomb = game.player.bomb_group.sprite
+    if bomb is not None:
+        rows.append(('bomb', bomb.timer))
+    return rows
+
+def enemy_rows(game):
+    rows = []
+    for enemy in game.enemy_group:
+        row = (type(enemy).__name__, _q(enemy.pos.x), _q(enemy.pos.y), enemy.health, enemy.alive,
+               enemy.timer, enemy.fire_timer)
+        if hasattr(enemy, 'pattern'):
+            row += (enemy.pattern, enemy.pattern_timer, enemy.enrage_mode,
+                    tuple(sorted((k, _q(v)) for k, v in enemy.pattern_vars.items())))
+        rows.append(row)
+    return rows
+
+def enemy_bullet_rows(game):
+    """敵弾の (x, y, dx, dy, 速さ, 凍結の残りフレーム) を位置順に並べたリスト"""
+    bullets = game.enemy_bullets
+    n = len(bullets)
+    if n == 0:
+        return []
+    if np is not None and hasattr(bullets, 'x'):
+        # BulletField: 配列のまま丸めて並べ替える
+        scale = STATE_HASH_SCALE
+        columns = np.stack([np.rint(getattr(bullets, name)[:n] * scale) for name in ('x', 'y', 'dx', 'dy', 'speed')]
+                           + [np.maximum(bullets.frozen[:n], 0)]).astype(np.int64)
+        order = np.lexsort(columns[::-1])
+        return [tuple(row) for row in columns[:, order].T.tolist()]
+    return sorted((_q(b.pos.x), _q(b.pos.y), _q(b.direction.x), _q(b.direction.y), _q(b.speed), max(int(b.frozen_timer), 0))
+                  for b in bullets)
+
+def item_rows(game):
+    return [(item.item_type, _q(item.pos.x), _q(item.pos.y), item.is_attracted) for item in game.item_group]
+
+def stage_rows(game):
+    stage = game.stage_manager
+    return (game.game_clock.frame, game.score, stage.stage, stage.current_wave, stage.wave_spawned,
+            stage.next_spawn_time, stage.spawn_active, stage.stage_clear_timer,
+            game.game_over, game.game_clear, game.grand_boss_defeated)
+
+def rng_rows(game):
+    return game.rng.getstate()
+
+_ROWS = {
+    'player': player_rows,
+    'player_bullets': player_bullet_rows,
+    'enemies': enemy_rows,
+    'enemy_bullets': enemy_bullet_rows,
+    'items': item_rows,
+    'stage': stage_rows,
+    'rng': rng_rows,
+}
+
+def state_digests(game):
+    """グループごとのダイジェストを GROUPS の順のタプルで返す"""
+    return tuple(_digest(_ROWS[name](game)) for name in GROUPS)
+
+class StateHasher:
+    """interval フレームごとに状態のダイジェストを記録する（Game.state_hasher に設定すると update() の最後に呼ばれる）"""
+    def __init__(self, interval=STATE_HASH_INTERVAL):
+        self.interval = interval
+        self.digests = [] # interval, 2 * interval, ... フレーム目のダイジェスト
+
+    def step(self, game):
+        if game.game_clock.frame % self.interval == 0:
+            self.digests.append(state_digests(game))
+
+def first_divergence(expected, actual, interval):
+    """2つのダイジェストの列を比べ、最初に食い違った (フレーム, グループ名のリスト) を返す（一致すれば None）
+
+    片方が先に終わっている場合は、その次のチェックポイントを食い違いとして返す（グループは空）。
+    """
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return (index + 1) * interval, [name for name, x, y in zip(GROUPS, a, b) if x != y]
+    if len(expected) != len(actual):
+        return (min(len(expected), len(actual)) + 1) * interval, []
+    return None
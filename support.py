@@ -1,7 +1,70 @@
 import pygame
+from collections import OrderedDict
+from setting import TEXT_CACHE_SIZE
+import asset_cache
+
+# 描画済みの文字列のキャッシュ: (文字列, サイズ, 色) -> Surface
+# 上限を超えたら最も長く使われていないものから捨てる
+_text_cache = OrderedDict()
+# 数字1文字ごとの描画済みSurface: (文字, サイズ, 色) -> Surface
+_glyphs = {}
+_text_stats = {'hits': 0, 'misses': 0}
+
+def get_font(size):
+    """サイズごとに一度だけ生成したデフォルトフォントを返す"""
+    return asset_cache.get_font(size)
+
+def render_text(txt, size, color):
+    """文字列を描画したSurfaceを返す（同じ文字列・サイズ・色なら使い回す）
+
+    返したSurfaceは共有されるため、呼び出し側で書き換えないこと。
+    """
+    key = (txt, size, tuple(color))
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        _text_stats['hits'] += 1
+        return surface
+    _text_stats['misses'] += 1
+    surface = get_font(size).render(txt, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
 def draw_text(screen, txt, x, y, size, color):
-    font =pygame.font.Font(None, size)
-    surface = font.render(txt , True , color)
+    surface = render_text(txt, size, color)
     x =  x - surface.get_width() / 2
     y = y - surface.get_height() /2
-    screen.blit(surface, (x, y))
\ No newline at end of file
+    screen.blit(surface, (x, y))
+
+def glyph(char, size, color):
+    """1文字分の描画済みSurfaceを返す（数字のように種類の少ない文字用）"""
+    key = (char, size, tuple(color))
+    surface = _glyphs.get(key)
+    if surface is None:
+        surface = _glyphs[key] = get_font(size).render(char, True, color)
+    return surface
+
+def draw_number(screen, value, x, y, size, color, digits=0):
+    """数値を1文字ずつの描画済みSurfaceを並べて描く（(x, y) が中央）
+
+    スコアのように毎フレーム変わる数値でも新しいSurfaceを作らない。
+    digits を指定すると 0 埋めでその桁数にする。
+    """
+    chars = f"{value:0{digits}d}"
+    surfaces = [glyph(c, size, color) for c in chars]
+    width = sum(s.get_width() for s in surfaces)
+    left = x - width // 2
+    top = y - surfaces[0].get_height() // 2
+    for surface in surfaces:
+        screen.blit(surface, (left, top))
+        left += surface.get_width()
+
+def text_cache_stats():
+    """文字列キャッシュの状態（ヒット数・ミス数・保持数）"""
+    return {'hits': _text_stats['hits'], 'misses': _text_stats['misses'], 'entries': len(_text_cache), 'glyphs': len(_glyphs)}
+
+def clear_text_cache():
+    _text_cache.clear()
+    _glyphs.clear()
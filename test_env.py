@@ -0,0 +1,51 @@
+"""env.GameEnv を1プロセスで複数交互に進めても、ゲーム同士の状態が混ざらないことを確かめる
+
+    python -m pytest -q test_env.py
+"""
+import os
+
+import pytest
+
+import headless
+from env import GameEnv
+from state_hash import state_digests
+
+# ステージ1のボス（Stage1Boss）のウェーブの直前から始める
+BOSS_WAVE = {'stage': 1, 'wave': 4}
+STEPS = 600
+
+@pytest.fixture(autouse=True)
+def display(monkeypatch):
+    # 画像などは相対パスで読み込む
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    headless.setup_display()
+
+def run_alone(seed):
+    env = GameEnv(invincible=True)
+    env.reset(seed=seed, options=BOSS_WAVE)
+    trace = []
+    for _ in range(STEPS):
+        env.step(0)
+        trace.append(state_digests(env.game))
+    return env, trace
+
+def test_alternating_envs_keep_their_own_bosses():
+    a, b = GameEnv(invincible=True), GameEnv(invincible=True)
+    a.reset(seed=1, options=BOSS_WAVE)
+    b.reset(seed=2, options=BOSS_WAVE)
+    trace_a, trace_b = [], []
+    for _ in range(STEPS):
+        a.step(0)
+        trace_a.append(state_digests(a.game))
+        b.step(0)
+        trace_b.append(state_digests(b.game))
+
+    for env in (a, b):
+        # ボスはそれぞれのゲームに1体ずつ登録され、倒すまでボスのウェーブから進まない
+        assert len(env.game.boss_group) == 1
+        assert all(boss in env.game.enemy_group for boss in env.game.boss_group)
+        assert env.game.stage_manager.current_wave == 5
+
+    # 1つだけで進めた場合と同じ状態になる
+    assert trace_a == run_alone(1)[1]
+    assert trace_b == run_alone(2)[1]
@@ -0,0 +1,50 @@
+"""rewind.RewindBuffer が、バッファが一杯で古いステップを捨てながら記録しても、記録した状態どおりに戻ることを確かめる
+
+    python -m pytest -q test_rewind.py
+"""
+import random
+
+import pytest
+
+import rewind
+
+@pytest.fixture(autouse=True)
+def plain_state(monkeypatch):
+    # push() に渡した辞書をそのまま記録する状態として使う
+    monkeypatch.setattr(rewind.snapshot, 'capture_state', dict)
+
+def assert_no_overlap(buffer):
+    """記録中のステップがバッファ上で重なっていない"""
+    spans = sorted((offset, offset + length) for offset, length, _ in buffer.entries)
+    assert all(end <= start for (_, end), (start, _) in zip(spans, spans[1:]))
+
+def make_state(rng, frame):
+    return {'clock': frame, 'blob': rng.randbytes(rng.randint(20, 300))}
+
+@pytest.mark.parametrize('seed', range(5))
+def test_step_back_matches_pushed_states_under_tight_max_bytes(seed):
+    rng = random.Random(seed)
+    buffer = rewind.RewindBuffer(seconds=100000, max_bytes=3000, keyframe_interval=3)
+    history = [] # 記録した状態（古い順）
+    for frame in range(400):
+        state = make_state(rng, frame)
+        buffer.push(state)
+        history.append(state)
+        assert buffer.used_bytes <= 3000
+        assert_no_overlap(buffer)
+        if frame % 37 == 36:
+            # 途中でも何ステップか戻し、そこから記録を続ける
+            for _ in range(rng.randint(1, 4)):
+                restored = buffer.step_back()
+                if restored is None:
+                    break
+                history.pop()
+                assert restored == history[-1]
+
+    assert len(buffer) > 1
+    while True:
+        restored = buffer.step_back()
+        if restored is None:
+            break
+        history.pop()
+        assert restored == history[-1]
@@ -0,0 +1,71 @@
+"""リプレイを再生し直して、記録時の状態のハッシュと一致するか確認する
+
+    python headless.py --seed 7 --frames 6000 --invincible --record run.replay
+    python verify_replay.py run.replay
+    python verify_replay.py run.replay --render --json
+
+記録に保存された間隔ごとに状態のハッシュ（state_hash）を計算し直し、最初に食い違ったフレームと
+食い違ったグループ（player / enemies / enemy_bullets など）を報告する。一致しなければ終了コード 1 を返す。
+弾の処理方式の変更などのリファクタリングの前後で、同じプレイが再現されることを確かめるために使う。
+"""
+import sys
+import json
+import argparse
+
+import headless
+import pygame
+from input_source import ReplayInput
+from replay import Replay, ReplayError
+from state_hash import GROUPS, StateHasher, first_divergence
+
+def verify(replay, render=False):
+    """replay を再生し、結果をまとめた辞書を返す"""
+    from game import Game
+    game = Game(input_source=ReplayInput(replay.frames), seed=replay.seed)
+    if replay.seek:
+        game.seek(*replay.seek)
+    game.state_hasher = StateHasher(replay.hash_interval)
+    result = headless.run(game, len(replay), render=render, invincible=replay.options.get('invincible', False))
+    actual = game.state_hasher.digests
+    divergence = first_divergence(replay.hashes, actual, replay.hash_interval)
+    return {
+        'frames': result['frames'],
+        'checkpoints': len(replay.hashes),
+        'hash_interval': replay.hash_interval,
+        'match': divergence is None,
+        'diverged_frame': divergence[0] if divergence else None,
+        'diverged_groups': divergence[1] if divergence else [],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-run a replay and check it against the recorded state hashes.')
+    parser.add_argument('replay', help='replay file recorded with --record')
+    parser.add_argument('--render', action='store_true', help='also draw every frame (to the dummy display)')
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ReplayError) as e:
+        parser.error(f'cannot read replay: {e}')
+    if not replay.hashes:
+        parser.error('replay has no state hashes to verify against')
+    if replay.hash_groups != GROUPS:
+        parser.error(f'replay hashes groups {list(replay.hash_groups)}, this build hashes {list(GROUPS)}')
+
+    headless.setup_display()
+    result = verify(replay, render=args.render)
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(result))
+    elif result['match']:
+        print(f"ok: {result['checkpoints']} checkpoints over {result['frames']} frames match")
+    elif result['diverged_groups']:
+        print(f"diverged at frame {result['diverged_frame']}: {', '.join(result['diverged_groups'])}")
+    else:
+        print(f"diverged at frame {result['diverged_frame']}: run ended after {result['frames']} frames")
+    return 0 if result['match'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())